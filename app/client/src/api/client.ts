@@ -35,9 +35,23 @@ async function apiRequest<T>(
 // API methods
 export const api = {
   // Upload file
-  async uploadFile(file: File): Promise<FileUploadResponse> {
+  async uploadFile(
+    file: File,
+    mode: UploadMode = 'replace',
+    keyColumns: string[] = [],
+    arrayStrategy: ArrayStrategy = 'flatten',
+    arrayMaxItems?: number
+  ): Promise<FileUploadResponse> {
     const formData = new FormData();
     formData.append('file', file);
+    formData.append('mode', mode);
+    if (keyColumns.length > 0) {
+      formData.append('key_columns', keyColumns.join(','));
+    }
+    formData.append('array_strategy', arrayStrategy);
+    if (arrayMaxItems !== undefined) {
+      formData.append('array_max_items', String(arrayMaxItems));
+    }
     
     return apiRequest<FileUploadResponse>('/upload', {
       method: 'POST',
@@ -45,6 +59,36 @@ export const api = {
     });
   },
   
+  // Start a background upload job
+  async createUploadJob(
+    file: File,
+    mode: UploadMode = 'replace',
+    keyColumns: string[] = [],
+    arrayStrategy: ArrayStrategy = 'flatten',
+    arrayMaxItems?: number
+  ): Promise<IngestJobResponse> {
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('mode', mode);
+    if (keyColumns.length > 0) {
+      formData.append('key_columns', keyColumns.join(','));
+    }
+    formData.append('array_strategy', arrayStrategy);
+    if (arrayMaxItems !== undefined) {
+      formData.append('array_max_items', String(arrayMaxItems));
+    }
+    
+    return apiRequest<IngestJobResponse>('/upload/jobs', {
+      method: 'POST',
+      body: formData
+    });
+  },
+  
+  // Poll a background upload job
+  async getUploadJob(jobId: string): Promise<IngestJobResponse> {
+    return apiRequest<IngestJobResponse>(`/upload/${encodeURIComponent(jobId)}`);
+  },
+  
   // Process query
   async processQuery(request: QueryRequest): Promise<QueryResponse> {
     return apiRequest<QueryResponse>('/query', {
@@ -56,6 +100,58 @@ export const api = {
     });
   },
   
+  // Fetch the next page of a query result
+  async fetchQueryPage(request: QueryPageRequest): Promise<QueryResponse> {
+    return apiRequest<QueryResponse>('/query/page', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify(request)
+    });
+  },
+  
+  // Stream a whole query result as NDJSON, handing rows over as they arrive.
+  // Resolves to the generated SQL once the stream ends.
+  async streamQuery(
+    request: QueryRequest,
+    onRows: (rows: Record<string, any>[]) => void
+  ): Promise<string> {
+    const response = await fetch(`${API_BASE_URL}/query`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ ...request, stream: 'ndjson' })
+    });
+    
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    if (!response.headers.get('Content-Type')?.startsWith('application/x-ndjson')) {
+      // Errors before the first row come back as a regular QueryResponse
+      const result: QueryResponse = await response.json();
+      throw new Error(result.error || 'Query failed');
+    }
+    
+    const reader = response.body!.pipeThrough(new TextDecoderStream()).getReader();
+    let pending = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      const lines = (pending + (value ?? '')).split('\n');
+      pending = done ? '' : lines.pop()!;
+      const rows = lines.filter(line => line).map(line => JSON.parse(line));
+      if (rows.length > 0) {
+        onRows(rows);
+      }
+      if (done) {
+        break;
+      }
+    }
+    
+    return decodeURIComponent(response.headers.get('X-Query-SQL') || '');
+  },
+  
   // Get database schema
   async getSchema(): Promise<DatabaseSchemaResponse> {
     return apiRequest<DatabaseSchemaResponse>('/schema');
@@ -113,14 +209,14 @@ export const api = {
     window.URL.revokeObjectURL(url);
   },
   
-  // Export query results as CSV
-  async exportQueryResults(data: any[], columns: string[]): Promise<void> {
+  // Export the whole result of a query as CSV; the server runs the query again
+  async exportQueryResults(queryId: string): Promise<void> {
     const response = await fetch(`${API_BASE_URL}/export/query`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json'
       },
-      body: JSON.stringify({ data, columns })
+      body: JSON.stringify({ token: queryId })
     });
 
     if (!response.ok) {
@@ -179,14 +275,14 @@ export const api = {
     window.URL.revokeObjectURL(url);
   },
 
-  // Export query results as JSON
-  async exportQueryResultsJson(data: any[], columns: string[]): Promise<void> {
+  // Export the whole result of a query as JSON; the server runs the query again
+  async exportQueryResultsJson(queryId: string): Promise<void> {
     const response = await fetch(`${API_BASE_URL}/export/query-json`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json'
       },
-      body: JSON.stringify({ data, columns })
+      body: JSON.stringify({ token: queryId })
     });
 
     if (!response.ok) {
@@ -218,6 +218,7 @@ function displayResults(response: QueryResponse, query: string) {
     const table = createResultsTable(response.results, response.columns);
     resultsContainer.innerHTML = '';
     resultsContainer.appendChild(table);
+    resultsContainer.appendChild(createResultsFooter(response, table));
   }
   
   // Initialize toggle button
@@ -228,7 +229,8 @@ function displayResults(response: QueryResponse, query: string) {
   });
   
   // Add export button if results exist
-  if (!response.error && response.results.length > 0) {
+  const queryId = response.query_id;
+  if (!response.error && response.results.length > 0 && queryId) {
     const resultsHeader = document.querySelector('.results-header') as HTMLElement;
 
     // Remove existing button container if any
@@ -248,7 +250,7 @@ function displayResults(response: QueryResponse, query: string) {
     exportButton.title = 'Export results as CSV';
     exportButton.onclick = async () => {
       try {
-        await api.exportQueryResults(response.results, response.columns);
+        await api.exportQueryResults(queryId);
       } catch (error) {
         displayError('Failed to export results');
       }
@@ -261,7 +263,7 @@ function displayResults(response: QueryResponse, query: string) {
     exportJsonButton.title = 'Export results as JSON';
     exportJsonButton.onclick = async () => {
       try {
-        await api.exportQueryResultsJson(response.results, response.columns);
+        await api.exportQueryResultsJson(queryId);
       } catch (error) {
         displayError('Failed to export results as JSON');
       }
@@ -280,6 +282,55 @@ function displayResults(response: QueryResponse, query: string) {
   }
 }
 
+// Row count below the results, with a button fetching the next page while more rows follow
+function createResultsFooter(response: QueryResponse, table: HTMLTableElement): HTMLDivElement {
+  const footer = document.createElement('div');
+  footer.className = 'results-footer';
+  const summary = document.createElement('span');
+  footer.appendChild(summary);
+  
+  let shown = response.results.length;
+  let nextToken = response.has_more ? response.next_token : undefined;
+  let truncated = response.truncated;
+  
+  const loadMoreButton = document.createElement('button');
+  loadMoreButton.className = 'secondary-button load-more-button';
+  loadMoreButton.textContent = 'Load more';
+  
+  const update = () => {
+    summary.textContent = `Showing ${shown} rows` + (
+      nextToken ? ' (more available)' : truncated ? ' (result truncated; export it to get every row)' : ''
+    );
+    loadMoreButton.style.display = nextToken ? '' : 'none';
+  };
+  
+  loadMoreButton.onclick = async () => {
+    if (!nextToken) return;
+    loadMoreButton.disabled = true;
+    loadMoreButton.innerHTML = '<span class="loading-secondary"></span>';
+    try {
+      const page = await api.fetchQueryPage({ token: nextToken });
+      if (page.error) {
+        throw new Error(page.error);
+      }
+      appendResultRows(table.tBodies[0], page.results, response.columns);
+      shown += page.results.length;
+      nextToken = page.has_more ? page.next_token : undefined;
+      truncated = page.truncated;
+      update();
+    } catch (error) {
+      displayError(error instanceof Error ? error.message : 'Failed to load more rows');
+    } finally {
+      loadMoreButton.disabled = false;
+      loadMoreButton.textContent = 'Load more';
+    }
+  };
+  
+  footer.appendChild(loadMoreButton);
+  update();
+  return footer;
+}
+
 // Create results table
 function createResultsTable(results: Record<string, any>[], columns: string[]): HTMLTableElement {
   const table = document.createElement('table');
@@ -298,6 +349,14 @@ function createResultsTable(results: Record<string, any>[], columns: string[]):
   
   // Body
   const tbody = document.createElement('tbody');
+  appendResultRows(tbody, results, columns);
+  table.appendChild(tbody);
+  
+  return table;
+}
+
+// Add result rows to a results table body
+function appendResultRows(tbody: HTMLTableSectionElement, results: Record<string, any>[], columns: string[]) {
   results.forEach(row => {
     const tr = document.createElement('tr');
     columns.forEach(col => {
@@ -307,9 +366,6 @@ function createResultsTable(results: Record<string, any>[], columns: string[]):
     });
     tbody.appendChild(tr);
   });
-  table.appendChild(tbody);
-  
-  return table;
 }
 
 // Display tables
@@ -1,27 +1,68 @@
 // These must match the Pydantic models exactly
 
 // File Upload Types
+type UploadMode = "replace" | "append" | "upsert";
+
+// How JSONL arrays are stored
+type ArrayStrategy = "flatten" | "json" | "first_k" | "child_table";
+
 interface FileUploadResponse {
   table_name: string;
   table_schema: Record<string, string>;
   row_count: number;
   sample_data: Record<string, any>[];
+  rows_written?: number;
+  ingest_time_ms?: number;
+  rows_per_second?: number;
+  cached?: boolean;
+  error?: string;
+}
+
+interface IngestJobResponse {
+  job_id: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  filename: string;
+  bytes_total: number;
+  bytes_processed: number;
+  rows_written: number;
+  elapsed_seconds: number;
+  eta_seconds?: number;
+  result?: FileUploadResponse;
   error?: string;
 }
 
 // Query Types
+
+// Layout of result rows: objects per row, arrays per row, or arrays per column
+type ResultFormat = "records" | "rows" | "columns";
+
 interface QueryRequest {
   query: string;
   llm_provider: "openai" | "anthropic";
   table_name?: string;
+  page_size?: number;
+  result_format?: ResultFormat;
+  stream?: "ndjson" | "arrow";
+}
+
+interface QueryPageRequest {
+  token: string;
 }
 
 interface QueryResponse {
   sql: string;
   results: Record<string, any>[];
   columns: string[];
+  result_format: ResultFormat;
+  rows?: any[][];
+  column_data?: any[][];
   row_count: number;
   execution_time_ms: number;
+  offset: number;
+  has_more: boolean;
+  next_token?: string;
+  truncated: boolean;
+  query_id?: string;
   error?: string;
 }
 
@@ -0,0 +1,82 @@
+"""
+Microbenchmark for flattening nested JSON log records.
+
+Compares flatten_json_object against the previous recursive implementation
+on synthetic nested logs of configurable depth and width and prints
+records/sec for each.
+
+Usage:
+    cd app/server
+    uv run python benchmarks/flatten_json.py --records 20000 --depth 3 --width 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.constants import LIST_INDEX_DELIMITER, NESTED_DELIMITER  # noqa: E402
+from core.file_processor import flatten_json_object  # noqa: E402
+
+
+def flatten_recursive(obj: Any, prefix: str = "") -> Dict[str, Any]:
+    """The recursive flattener this benchmark measures against."""
+    result = {}
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            new_key = f"{prefix}{NESTED_DELIMITER}{key}" if prefix else key
+            result.update(flatten_recursive(value, new_key))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            new_key = f"{prefix}{LIST_INDEX_DELIMITER}{i}"
+            result.update(flatten_recursive(value, new_key))
+    else:
+        result[prefix] = obj
+    return result
+
+
+def make_node(rng: random.Random, depth: int, width: int) -> Any:
+    if depth == 0:
+        return rng.choice([rng.randint(0, 1000), rng.random(), "value", None, True])
+    node = {f"field_{i}": make_node(rng, depth - 1, width) for i in range(width)}
+    node["items"] = [make_node(rng, depth - 1, max(1, width // 2)) for _ in range(2)]
+    return node
+
+
+def make_logs(records: int, depth: int, width: int) -> list:
+    rng = random.Random(42)
+    # Logs repeat a small set of shapes; vary the leaves, not the keys
+    templates = [make_node(rng, depth, width) for _ in range(8)]
+    return [
+        {"event_id": f"evt_{i}", "ts": "2024-01-01T00:00:00Z", "payload": templates[i % len(templates)]}
+        for i in range(records)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=5)
+    args = parser.parse_args()
+
+    logs = make_logs(args.records, args.depth, args.width)
+    leaves = len(flatten_json_object(logs[0]))
+    assert flatten_json_object(logs[0]) == flatten_recursive(logs[0])
+    print(f"{args.records} records, depth {args.depth}, width {args.width}, ~{leaves} leaves per record")
+    print(f"{'flattener':>10} {'seconds':>9} {'records/sec':>13}")
+
+    for name, flatten in (("recursive", flatten_recursive), ("iterative", flatten_json_object)):
+        started = time.perf_counter()
+        for record in logs:
+            flatten(record)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>10} {elapsed:>9.2f} {args.records / elapsed:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
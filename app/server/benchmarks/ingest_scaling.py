@@ -0,0 +1,90 @@
+"""
+Benchmark upload ingest throughput as the number of parse workers grows.
+
+Generates a synthetic event dump, loads it with 1..N worker processes and
+prints rows/sec and speedup relative to a single worker.
+
+Usage:
+    cd app/server
+    uv run python benchmarks/ingest_scaling.py --format jsonl --rows 500000 --max-workers 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.file_processor import convert_csv_stream_to_sqlite, convert_jsonl_stream_to_sqlite  # noqa: E402
+
+
+def write_jsonl(path: str, rows: int) -> None:
+    rng = random.Random(42)
+    with open(path, "w") as f:
+        for i in range(rows):
+            event = {
+                "event_id": f"evt_{i}",
+                "timestamp": f"2024-01-{i % 28 + 1:02d}T12:{i % 60:02d}:00Z",
+                "user": {
+                    "id": rng.randint(1, 100_000),
+                    "profile": {"country": rng.choice(["US", "DE", "IN", "BR"]), "tier": rng.randint(1, 3)}
+                },
+                "actions": [{"type": "click", "amount": rng.random()} for _ in range(rng.randint(0, 3))],
+                "metadata": {"source": rng.choice(["web", "ios", "android"]), "version": "1.2.3"}
+            }
+            f.write(json.dumps(event) + "\n")
+
+
+def write_csv(path: str, rows: int) -> None:
+    rng = random.Random(42)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["event_id", "timestamp", "user_id", "country", "amount", "note"])
+        for i in range(rows):
+            writer.writerow([
+                f"evt_{i}",
+                f"2024-01-{i % 28 + 1:02d}T12:{i % 60:02d}:00Z",
+                rng.randint(1, 100_000),
+                rng.choice(["US", "DE", "IN", "BR"]),
+                round(rng.random() * 100, 2),
+                rng.choice(["plain", "with, comma", "multi\nline"])
+            ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    convert = convert_jsonl_stream_to_sqlite if args.format == "jsonl" else convert_csv_stream_to_sqlite
+    write = write_jsonl if args.format == "jsonl" else write_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, f"events.{args.format}")
+        write(data_path, args.rows)
+        size_mb = os.path.getsize(data_path) / 1e6
+        print(f"{args.format}: {args.rows} rows, {size_mb:.1f} MB, cpu_count={os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'rows/sec':>12} {'speedup':>8}")
+
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            db_path = os.path.join(tmp, f"bench_{workers}.db")
+            with open(data_path, "rb") as f:
+                started = time.perf_counter()
+                result = convert(f, "events", db_path, workers=workers)
+                elapsed = time.perf_counter() - started
+            os.remove(db_path)
+
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {result['row_count'] / elapsed:>12,.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Transparent decompression of compressed uploads.
+
+Compressed files are decoded incrementally while the parsers read from them,
+so a compressed upload never exists in memory in decompressed form. gzip and
+bz2 come from the standard library; zstd needs the optional zstandard
+package.
+
+Parquet and Arrow IPC files are read by seeking, which a decompressing stream
+cannot do efficiently (zstd not at all), so for those formats the decoded bytes
+are spooled to a temporary file first.
+"""
+
+import bz2
+import gzip
+import io
+import shutil
+import tempfile
+from typing import BinaryIO, Optional, Tuple
+
+from .constants import COMPRESSION_SUFFIXES, DECOMPRESS_SPOOL_CHUNK_BYTES
+
+
+def split_compression(filename: str) -> Tuple[str, Optional[str]]:
+    """
+    Strip a compression suffix from a file name.
+
+    Args:
+        filename: Uploaded file name, e.g. "events.jsonl.gz"
+
+    Returns:
+        (name without the compression suffix, compression codec or None)
+    """
+    lowered = filename.lower()
+    for suffix, codec in COMPRESSION_SUFFIXES.items():
+        if lowered.endswith(suffix):
+            return filename[:-len(suffix)], codec
+    return filename, None
+
+
+def open_decompressed(stream: BinaryIO, codec: Optional[str], seekable: bool = False) -> BinaryIO:
+    """
+    Wrap a binary stream so reads return decompressed bytes.
+
+    Args:
+        stream: Binary file-like object holding the compressed data
+        codec: "gzip", "bz2", "zstd" or None for uncompressed data
+        seekable: Decompress into a temporary file so the result supports
+            random access; needed by the Parquet and Arrow IPC file readers
+
+    Returns:
+        A buffered binary stream supporting read, readline and iteration; the
+        caller closes it, which leaves `stream` open. Uncompressed data is
+        returned as `stream` itself.
+    """
+    if codec is None:
+        return stream
+    if seekable:
+        with open_decompressed(stream, codec) as decoded:
+            return spool_to_tempfile(decoded)
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if codec == "bz2":
+        return bz2.BZ2File(stream, mode="rb")
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(
+                "Zstandard uploads require the 'zstandard' package. "
+                "Install it with: uv sync --extra compression"
+            )
+        reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True, closefd=False)
+        # The raw reader has no readline; buffering adds it along with line iteration
+        return io.BufferedReader(reader)
+    raise ValueError(f"Unsupported compression: {codec}")
+
+
+def spool_to_tempfile(stream: BinaryIO) -> BinaryIO:
+    """
+    Copy a stream into an anonymous temporary file and rewind it.
+
+    Args:
+        stream: Binary file-like object read to the end
+
+    Returns:
+        Seekable temporary file removed when it is closed
+    """
+    spool = tempfile.TemporaryFile()
+    try:
+        shutil.copyfileobj(stream, spool, DECOMPRESS_SPOOL_CHUNK_BYTES)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
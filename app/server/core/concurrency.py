@@ -0,0 +1,112 @@
+"""
+Bounded worker threads for the blocking work of request handlers.
+
+The endpoints are async, but SQLite, pandas and the LLM SDK clients block.
+Called directly from a handler they would stall the event loop and with it
+every other request. run_blocking moves such calls to a worker thread and
+caps how many threads each group of work (ENDPOINT_CONCURRENCY) may hold, so
+a burst of slow queries queues behind its own limit instead of delaying
+health checks or schema reads.
+
+stream_blocking does the same for blocking iterators, such as a cursor being
+encoded into a streamed response. The stream holds one of the group's slots
+from its first item until it is closed, not only while an item is produced:
+the iterator keeps its pooled read connection for that long, so slow
+clients reading streams must count against the group's budget.
+"""
+
+import functools
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, TypeVar
+
+import anyio
+from anyio import to_thread
+
+from .constants import ENDPOINT_CONCURRENCY
+
+T = TypeVar("T")
+
+_limiters: Dict[str, anyio.CapacityLimiter] = {}
+
+# Returned by next() when a streamed iterator is exhausted
+_DONE = object()
+
+
+def get_limiter(group: str) -> anyio.CapacityLimiter:
+    """
+    Return the capacity limiter of a work group.
+    
+    Limiters are created on first use because they need a running event loop.
+    
+    Raises:
+        KeyError: If the group has no entry in ENDPOINT_CONCURRENCY
+    """
+    limiter = _limiters.get(group)
+    if limiter is None:
+        limiter = _limiters[group] = anyio.CapacityLimiter(ENDPOINT_CONCURRENCY[group])
+    return limiter
+
+
+async def run_blocking(group: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking function in a worker thread within its group's limit.
+    
+    Args:
+        group: Work group from ENDPOINT_CONCURRENCY
+        func: Blocking callable
+        *args, **kwargs: Passed to func
+        
+    Returns:
+        func's return value; exceptions raised by func propagate
+    """
+    return await to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=get_limiter(group))
+
+
+async def stream_blocking(group: str, items: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Iterate a blocking iterator on worker threads, holding a slot of its group throughout.
+    
+    The first item is produced before this returns, so errors raised while
+    the iterator sets up (invalid SQL, a missing table) reach the caller
+    before a streamed response has started. The iterator is closed and the
+    slot given back when the returned async iterator finishes or is closed,
+    also on cancellation, so generators holding a pooled connection give it
+    back.
+    
+    Args:
+        group: Work group from ENDPOINT_CONCURRENCY
+        items: Blocking iterator, typically a generator
+        
+    Returns:
+        Async iterator over the remaining items
+    """
+    limiter = get_limiter(group)
+    # The slot belongs to the stream rather than to a thread
+    owner = object()
+    await limiter.acquire_on_behalf_of(owner)
+    close = getattr(items, "close", None)
+    
+    async def finish() -> None:
+        try:
+            if close is not None:
+                await to_thread.run_sync(close)
+        finally:
+            limiter.release_on_behalf_of(owner)
+    
+    try:
+        first = await to_thread.run_sync(next, items, _DONE)
+    except BaseException:
+        with anyio.CancelScope(shield=True):
+            await finish()
+        raise
+    
+    async def drain() -> AsyncIterator[T]:
+        try:
+            item = first
+            while item is not _DONE:
+                yield item
+                item = await to_thread.run_sync(next, items, _DONE)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await finish()
+    
+    return drain()
@@ -1,8 +1,9 @@
 """
-Constants for JSONL file processing and field flattening.
+Constants for upload processing and JSONL field flattening.
 
 This module defines the delimiter constants used for flattening nested JSON objects
-and arrays into flat column names suitable for SQLite tables.
+and arrays into flat column names suitable for SQLite tables, plus the batch sizes
+used by the streaming ingest path.
 
 Delimiter System:
 - NESTED_DELIMITER: Used to separate nested object keys (e.g., "user__profile__name")
@@ -14,8 +15,190 @@ Examples:
 - Complex structure {"tags": [{"name": "tag1"}, {"name": "tag2"}]} becomes "tags_0__name", "tags_1__name"
 """
 
+import os
+
 # Delimiter for nested object fields
 NESTED_DELIMITER = "__"
 
 # Delimiter for list/array indices
-LIST_INDEX_DELIMITER = "_"
\ No newline at end of file
+LIST_INDEX_DELIMITER = "_"
+
+# Number of CSV rows parsed and inserted per batch during streaming ingest.
+# Bounds peak memory of an upload independently of the file size.
+CSV_CHUNK_ROWS = 50_000
+
+# Number of JSONL rows buffered per executemany batch during streaming ingest.
+JSONL_BATCH_ROWS = 10_000
+
+# Number of JSON array objects buffered per executemany batch during streaming ingest.
+JSON_BATCH_ROWS = 10_000
+
+# Number of characters decoded per read by the incremental JSON array parser.
+JSON_READ_CHUNK_CHARS = 1 << 20
+
+# Target size of the line-aligned blocks handed to parse workers when an upload
+# is parsed on more than one core (see INGEST_WORKERS).
+INGEST_SHARD_BYTES = 8 << 20
+
+# Connection settings used while an upload is being written (see TableWriter).
+# NORMAL only skips fsyncs that WAL mode does not need for consistency.
+BULK_LOAD_SYNCHRONOUS = "NORMAL"
+BULK_LOAD_CACHE_SIZE_KIB = 256 * 1024
+
+# How an upload is combined with an existing table of the same name
+UPLOAD_MODES = ("replace", "append", "upsert")
+
+# Prefix of the application's own bookkeeping tables. They live in the same
+# database as uploaded data but are hidden from schema listings and prompts.
+INTERNAL_TABLE_PREFIX = "_nlsql_"
+
+# Block size used when hashing uploads for content-addressed deduplication
+UPLOAD_HASH_CHUNK_BYTES = 1 << 20
+
+# Block size used when spooling decompressed columnar uploads to a temporary file
+DECOMPRESS_SPOOL_CHUNK_BYTES = 1 << 20
+
+# Compressed upload suffixes and the codec used to decode them as a stream
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+# Rows per record batch read from Parquet uploads
+ARROW_BATCH_ROWS = 50_000
+
+# Background ingest jobs run one at a time: SQLite allows a single writer, so
+# parallel jobs would only wait on each other's locks
+INGEST_JOB_WORKERS = 1
+
+# Finished ingest jobs kept for status polling before the oldest are dropped
+INGEST_JOB_HISTORY = 100
+
+# Rows sampled per column to infer declared column types of uploads
+SCHEMA_SAMPLE_ROWS = 1000
+
+# Key paths remembered by the JSON flattener before its cache is reset
+KEY_PATH_CACHE_SIZE = 10_000
+
+# How arrays inside JSONL records are stored:
+#   flatten      one column per element (items_0, items_1, ...)
+#   json         one JSON text column per array, queryable with SQLite's JSON functions
+#   first_k      like flatten, but only the first ARRAY_MAX_ITEMS elements
+#   child_table  one row per element in a {table}__{array} table with parent_rowid
+ARRAY_STRATEGIES = ("flatten", "json", "first_k", "child_table")
+
+# Elements kept per array by the first_k strategy unless an upload sets its own
+ARRAY_MAX_ITEMS = 5
+
+# Seconds a request waits for a free pooled read connection before failing;
+# writes wait for the writer as long as the write before them takes
+DB_POOL_TIMEOUT_SECONDS = 5.0
+
+# Settings applied to every pooled connection. Reads go through the memory
+# map instead of read() calls, and each connection keeps its own page cache.
+DB_MMAP_BYTES = 256 << 20
+DB_CACHE_SIZE_KIB = 16 * 1024
+
+# Worker threads each kind of blocking request work may occupy at once (see
+# core.concurrency). Every group waits only for its own slots, so slow LLM
+# calls or table scans cannot starve health checks and schema reads. The
+# schema lookups /api/query makes before running its SQL (catalog, stored
+# translation, prompt tables) take the query_schema group, so a burst of
+# questions cannot hold up /api/schema. Translations are stored after the
+# response is sent, in a group of their own so they never queue in front of,
+# or behind, table deletions in the write group.
+ENDPOINT_CONCURRENCY = {
+    "llm": 4,
+    "query": 3,
+    "insights": 2,
+    "export": 1,
+    "schema": 1,
+    "query_schema": 2,
+    "health": 1,
+    "upload": 2,
+    "write": 1,
+    "translation": 1,
+}
+
+# Groups whose work may hold a pooled read connection, including open
+# streamed responses and upload cache lookups
+READER_GROUPS = ("query", "insights", "export", "schema", "query_schema", "health", "upload", "translation")
+
+# Shared connections per database file (see core.db_pool): readers kept open
+# for queries, schema reads and exports next to the single writer connection.
+# One more than all reader group slots and ingest jobs together can hold, so
+# no request waits on the pool, or times out, while another group is busy.
+DB_POOL_READERS = sum(ENDPOINT_CONCURRENCY[group] for group in READER_GROUPS) + INGEST_JOB_WORKERS + 1
+
+# Timeouts of LLM API calls, in seconds: for opening a connection, and for
+# each request as a whole. Set LLM_CONNECT_TIMEOUT_SECONDS or
+# LLM_TIMEOUT_SECONDS in the environment to change them.
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", "60"))
+
+# Connections each LLM provider client keeps open, one per concurrent LLM
+# call, and seconds an idle one is kept before it is closed
+LLM_POOL_CONNECTIONS = ENDPOINT_CONCURRENCY["llm"]
+LLM_KEEPALIVE_SECONDS = 120.0
+
+# Rows returned per page of query results unless the request asks for another size
+QUERY_PAGE_ROWS = 1000
+
+# Hard cap on the rows of one query result that can be fetched, across all of
+# its pages. Set QUERY_MAX_ROWS in the environment to change it.
+QUERY_MAX_ROWS = int(os.environ.get("QUERY_MAX_ROWS", "100000"))
+
+# Continuation tokens for further result pages expire after this many seconds;
+# at most QUERY_TOKEN_HISTORY of them are kept
+QUERY_TOKEN_TTL_SECONDS = 600
+QUERY_TOKEN_HISTORY = 1000
+
+# Layouts of query results in responses:
+#   records  one {column: value} object per row (default)
+#   rows     one array per row, ordered like the columns list
+#   columns  one array of values per column, ordered like the columns list
+QUERY_RESULT_FORMATS = ("records", "rows", "columns")
+
+# Memory budget of the query result cache (see core.result_cache), in bytes of
+# estimated object size. Set QUERY_CACHE_BYTES=0 in the environment to disable it.
+QUERY_CACHE_BYTES = int(os.environ.get("QUERY_CACHE_BYTES", str(64 << 20)))
+
+# Results estimated larger than this are not cached, so one big page cannot
+# evict everything else
+QUERY_CACHE_ENTRY_BYTES = 8 << 20
+
+# Streamed response formats of /api/query:
+#   ndjson  one JSON object per row and line
+#   arrow   Arrow IPC stream of record batches (needs the 'arrow' extra)
+QUERY_STREAM_FORMATS = ("ndjson", "arrow")
+
+# Rows fetched from the cursor and encoded per chunk of a streamed response
+STREAM_BATCH_ROWS = 5000
+
+# Arrow streams of /api/query take their column types from this many leading
+# rows of the result, scanned inside SQLite before the first batch is sent
+ARROW_TYPE_SAMPLE_ROWS = 10_000
+
+# Key of the notice that ends a query stream cut short: the last NDJSON line,
+# or the custom metadata of a last, empty Arrow record batch
+TRUNCATION_MARKER = "__truncated__"
+
+# Stored natural language to SQL translations (see core.translation_cache);
+# the oldest are pruned beyond this many
+TRANSLATION_CACHE_ENTRIES = 10_000
+
+# Similarity index over past questions (see core.question_index): character
+# n-gram size, and the cosine similarity from which a stored translation is
+# reused for a differently worded question
+QUESTION_NGRAM_SIZE = 3
+QUESTION_SIMILARITY_THRESHOLD = 0.7
+
+# Schema pruning of LLM prompts (see core.schema_selector): at most this many
+# tables, and columns per table, are described to the LLM; rows read per
+# table for the sample values the tables are matched on
+SCHEMA_PROMPT_TABLES = 8
+SCHEMA_PROMPT_COLUMNS = 60
+SCHEMA_PROMPT_SAMPLE_ROWS = 50
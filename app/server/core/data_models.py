@@ -12,6 +12,22 @@ class FileUploadResponse(BaseModel):
     table_schema: Dict[str, str]  # column_name: data_type
     row_count: int
     sample_data: List[Dict[str, Any]]
+    rows_written: Optional[int] = None  # Rows ingested by this upload; row_count is the table total
+    ingest_time_ms: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    cached: bool = False  # True when an identical earlier upload was reused
+    error: Optional[str] = None
+
+class IngestJobResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    filename: str
+    bytes_total: int = 0  # Size of the uploaded (possibly compressed) file
+    bytes_processed: int = 0
+    rows_written: int = 0
+    elapsed_seconds: float = 0
+    eta_seconds: Optional[float] = None  # Extrapolated from bytes processed while running
+    result: Optional[FileUploadResponse] = None
     error: Optional[str] = None
 
 # Query Models  
@@ -19,13 +35,27 @@ class QueryRequest(BaseModel):
     query: str = Field(..., description="Natural language query")
     llm_provider: Literal["openai", "anthropic"] = "openai"
     table_name: Optional[str] = None  # If querying specific table
+    page_size: Optional[int] = Field(None, ge=1, description="Rows per result page")
+    result_format: Literal["records", "rows", "columns"] = "records"
+    stream: Optional[Literal["ndjson", "arrow"]] = None  # Stream the whole result instead of a page
+
+class QueryPageRequest(BaseModel):
+    token: str = Field(..., description="next_token of the previous page")
 
 class QueryResponse(BaseModel):
     sql: str
-    results: List[Dict[str, Any]]
+    results: List[Dict[str, Any]]  # Filled for result_format "records"
     columns: List[str]
-    row_count: int
+    result_format: Literal["records", "rows", "columns"] = "records"
+    rows: Optional[List[List[Any]]] = None  # result_format "rows": one array per row, ordered like columns
+    column_data: Optional[List[List[Any]]] = None  # result_format "columns": one array per column
+    row_count: int  # Rows in this page
     execution_time_ms: float
+    offset: int = 0  # Position of this page's first row in the full result
+    has_more: bool = False
+    next_token: Optional[str] = None  # Fetch the next page with /api/query/page
+    truncated: bool = False  # Result cut off at the server's row cap
+    query_id: Optional[str] = None  # Export the whole result with /api/export/query
     error: Optional[str] = None
 
 # Database Schema Models
@@ -91,5 +121,6 @@ class ExportRequest(BaseModel):
     table_name: str = Field(..., description="Name of the table to export")
 
 class QueryExportRequest(BaseModel):
-    data: List[Dict[str, Any]] = Field(..., description="Query result data to export")
-    columns: List[str] = Field(..., description="Column names for the export")
\ No newline at end of file
+    data: List[Dict[str, Any]] = Field(default_factory=list, description="Query result data to export when no sql is given")
+    columns: List[str] = Field(default_factory=list, description="Column names for the export")
+    token: Optional[str] = Field(None, description="query_id or page token of a query result; the query runs again on the server and its whole result, without the QUERY_MAX_ROWS cap, is exported instead of data")
\ No newline at end of file
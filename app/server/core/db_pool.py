@@ -0,0 +1,227 @@
+"""
+Shared SQLite connections for the application database.
+
+Opening a connection for every request costs a connect, a fresh parse of the
+schema on first use and an empty page cache. Instead each database file gets
+one pool that keeps a bounded number of read connections and a single writer
+connection open for the life of the process.
+
+SQLite in WAL mode lets readers proceed while one writer commits, so reads
+never wait on uploads, and funnelling every write through one connection
+turns "database is locked" errors into an orderly wait: writes queue for
+the writer for as long as the write before them takes, which for an ingest
+can be minutes. Connections are
+created with check_same_thread=False because request handlers run on
+different threads over time; a connection is only ever used by the thread
+that checked it out.
+
+Read connections are opened with PRAGMA query_only, so nothing run on a
+reader can change the database, whatever SQL a request gets through.
+
+An in-memory database (':memory:') is private to its connection, so it is
+not pooled: every checkout gets a new connection that is closed afterwards.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from .constants import DB_CACHE_SIZE_KIB, DB_MMAP_BYTES, DB_POOL_READERS, DB_POOL_TIMEOUT_SECONDS
+
+DEFAULT_DB_PATH = "db/database.db"
+MEMORY_DB_PATH = ":memory:"
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free in time"""
+    pass
+
+
+def open_connection(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Open a connection configured for the application's access pattern.
+    
+    Args:
+        db_path: Path of the SQLite database
+        read_only: Refuse every change to the database on this connection
+        
+    Returns:
+        Connection in WAL mode with the pool's mmap and page cache settings
+    """
+    conn = sqlite3.connect(db_path, timeout=DB_POOL_TIMEOUT_SECONDS, check_same_thread=False)
+    if db_path != MEMORY_DB_PATH:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_BYTES}")
+    conn.execute(f"PRAGMA cache_size={-DB_CACHE_SIZE_KIB}")
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class ConnectionPool:
+    """
+    Bounded read connections plus one writer connection for a database file.
+    
+    Connections are opened lazily, so an idle pool holds none. Checkouts wait
+    up to DB_POOL_TIMEOUT_SECONDS for a free connection.
+    """
+    
+    def __init__(self, db_path: str, max_readers: int = DB_POOL_READERS):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self._reader_slots = threading.BoundedSemaphore(max_readers)
+        self._idle_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._writer = None
+        self._closed = False
+    
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a read connection for the duration of the with block.
+        
+        Raises:
+            PoolTimeoutError: If all read connections stay busy
+        """
+        if not self._reader_slots.acquire(timeout=DB_POOL_TIMEOUT_SECONDS):
+            raise PoolTimeoutError("Timed out waiting for a database connection")
+        try:
+            with self._readers_lock:
+                conn = self._idle_readers.pop() if self._idle_readers else None
+            if conn is None:
+                conn = open_connection(self.db_path, read_only=True)
+            try:
+                yield conn
+            finally:
+                if self._reset(conn):
+                    with self._readers_lock:
+                        if self._closed:
+                            conn.close()
+                        else:
+                            self._idle_readers.append(conn)
+        finally:
+            self._reader_slots.release()
+    
+    @contextmanager
+    def writer(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Check out the writer connection for the duration of the with block.
+        
+        The caller commits its own changes; anything left uncommitted when the
+        block ends, normally or through an exception, is rolled back.
+        
+        Args:
+            timeout: Seconds to wait for the write in progress to finish;
+                None waits however long it takes
+        
+        Raises:
+            PoolTimeoutError: If a timeout is given and another write does not finish in time
+        """
+        if not self._writer_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise PoolTimeoutError("Timed out waiting for the database writer")
+        try:
+            if self._writer is None:
+                self._writer = open_connection(self.db_path)
+            try:
+                yield self._writer
+            finally:
+                if not self._reset(self._writer):
+                    self._writer = None
+        finally:
+            self._writer_lock.release()
+    
+    @staticmethod
+    def _reset(conn: sqlite3.Connection) -> bool:
+        """Undo per-use state; a connection that cannot be reset is closed."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn.set_authorizer(None)
+            return True
+        except sqlite3.Error:
+            conn.close()
+            return False
+    
+    def close(self) -> None:
+        """Close idle connections; readers in use close when they are returned."""
+        with self._readers_lock:
+            self._closed = True
+            readers, self._idle_readers = self._idle_readers, []
+        for conn in readers:
+            conn.close()
+        if self._writer_lock.acquire(timeout=DB_POOL_TIMEOUT_SECONDS):
+            try:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            finally:
+                self._writer_lock.release()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str = DEFAULT_DB_PATH) -> ConnectionPool:
+    """Return the pool for a database file, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+@contextmanager
+def read_connection(db_path: str = DEFAULT_DB_PATH) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled read connection.
+    
+    Usage:
+        with read_connection() as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+    """
+    if db_path == MEMORY_DB_PATH:
+        conn = open_connection(db_path, read_only=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    with get_pool(db_path).reader() as conn:
+        yield conn
+
+
+@contextmanager
+def write_connection(db_path: str = DEFAULT_DB_PATH, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow the pooled writer connection; the caller commits its changes.
+    
+    Waits for the write in progress, an ingest included, to finish unless a
+    timeout is given (see ConnectionPool.writer).
+    
+    Usage:
+        with write_connection() as conn:
+            conn.execute("DROP TABLE ...")
+            conn.commit()
+    """
+    if db_path == MEMORY_DB_PATH:
+        conn = open_connection(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    with get_pool(db_path).writer(timeout) as conn:
+        yield conn
+
+
+def close_pools() -> None:
+    """Close every pool, e.g. on application shutdown."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,11 +1,18 @@
+import csv
+import json
 import sqlite3
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence
 import pandas as pd
 import io
 import logging
 
+from .constants import STREAM_BATCH_ROWS, TRUNCATION_MARKER
+
 logger = logging.getLogger(__name__)
 
+# Turns column names and batches of row tuples into response chunks
+Encoder = Callable[[List[str], Iterable[Sequence[tuple]]], Iterator[bytes]]
+
 
 def generate_csv_from_data(data: List[Dict[str, Any]], columns: List[str]) -> bytes:
     """
@@ -77,25 +84,7 @@ def generate_csv_from_table(conn: sqlite3.Connection, table_name: str) -> bytes:
     Raises:
         ValueError: If table doesn't exist or export fails
     """
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT name FROM sqlite_master
-        WHERE type='table' AND name=?
-    """, (table_name,))
-
-    if not cursor.fetchone():
-        raise ValueError(f"Table '{table_name}' does not exist")
-
-    query = f'SELECT * FROM "{table_name}"'
-    df = pd.read_sql_query(query, conn)
-
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    csv_content = csv_buffer.getvalue()
-    csv_buffer.close()
-
-    return csv_content.encode('utf-8')
+    return b"".join(stream_table(conn, table_name, encode_csv))
 
 
 def generate_json_from_data(data: List[Dict], columns: List[str]) -> bytes:
@@ -135,6 +124,79 @@ def generate_json_from_table(conn: sqlite3.Connection, table_name: str) -> bytes
     Returns:
         bytes: JSON file content as bytes
 
+    Raises:
+        ValueError: If table doesn't exist
+    """
+    return b"".join(stream_table(conn, table_name, encode_json_array))
+
+
+def fetch_batches(
+    cursor: sqlite3.Cursor,
+    max_rows: Optional[int] = None,
+    batch_rows: int = STREAM_BATCH_ROWS
+) -> Iterator[List[tuple]]:
+    """
+    Read an executed cursor in batches of row tuples.
+
+    Args:
+        cursor: Cursor of an executed SELECT
+        max_rows: Stop after this many rows (None reads the whole result)
+        batch_rows: Rows per batch
+
+    Yields:
+        Non-empty lists of row tuples
+    """
+    remaining = max_rows
+    while remaining is None or remaining > 0:
+        size = batch_rows if remaining is None else min(batch_rows, remaining)
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+        yield rows
+
+
+class CursorBatches:
+    """
+    Batches of row tuples of an executed cursor, as read by fetch_batches.
+
+    Once iterated to the end, `truncated` tells whether max_rows cut the
+    result short; one row past the limit is read to find out. Encoders of
+    query streams use it to end the stream with a notice.
+    """
+
+    def __init__(
+        self,
+        cursor: sqlite3.Cursor,
+        max_rows: Optional[int] = None,
+        batch_rows: int = STREAM_BATCH_ROWS
+    ):
+        self._cursor = cursor
+        self._max_rows = max_rows
+        self._batch_rows = batch_rows
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[List[tuple]]:
+        yield from fetch_batches(self._cursor, self._max_rows, self._batch_rows)
+        self.truncated = self._max_rows is not None and self._cursor.fetchone() is not None
+
+
+def stream_cursor(cursor: sqlite3.Cursor, encode: Encoder, max_rows: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Encode the result of an executed cursor chunk by chunk.
+
+    Only one batch of rows is held in memory at a time, whatever the size of
+    the result.
+    """
+    columns = [description[0] for description in cursor.description or ()]
+    return encode(columns, CursorBatches(cursor, max_rows))
+
+
+def stream_table(conn: sqlite3.Connection, table_name: str, encode: Encoder) -> Iterator[bytes]:
+    """
+    Encode all rows of a database table chunk by chunk.
+
     Raises:
         ValueError: If table doesn't exist
     """
@@ -148,10 +210,241 @@ def generate_json_from_table(conn: sqlite3.Connection, table_name: str) -> bytes
     if not cursor.fetchone():
         raise ValueError(f"Table '{table_name}' does not exist")
 
-    query = f'SELECT * FROM "{table_name}"'
-    df = pd.read_sql_query(query, conn)
+    cursor.execute(f'SELECT * FROM "{table_name}"')
+    return stream_cursor(cursor, encode)
 
-    # Use pandas to_json which properly handles NaN as null
-    json_str = df.to_json(orient='records', indent=2, force_ascii=False)
 
-    return json_str.encode('utf-8')
+def encode_csv(columns: List[str], batches: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """Encode rows as CSV: a header line, then one chunk per batch; NULL becomes an empty field."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield _drain(buffer)
+    for rows in batches:
+        writer.writerows(rows)
+        yield _drain(buffer)
+
+
+def encode_ndjson(columns: List[str], batches: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON, one object per row.
+
+    When the batches were cut at their row limit (see CursorBatches), a last
+    line {"__truncated__": "max_rows"} says so.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+    for rows in batches:
+        yield "".join(
+            encoder.encode(dict(zip(columns, row))) + "\n" for row in rows
+        ).encode('utf-8')
+    if getattr(batches, "truncated", False):
+        yield (encoder.encode({TRUNCATION_MARKER: "max_rows"}) + "\n").encode('utf-8')
+
+
+def encode_json_array(columns: List[str], batches: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """Encode rows as a JSON array of objects, one object per line."""
+    encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+    separator = "\n"
+    yield b"["
+    for rows in batches:
+        chunk = []
+        for row in rows:
+            chunk.append(separator + "  " + encoder.encode(dict(zip(columns, row))))
+            separator = ",\n"
+        yield "".join(chunk).encode('utf-8')
+    yield b"\n]" if separator == ",\n" else b"]"
+
+
+def scan_column_types(
+    conn: sqlite3.Connection,
+    sql: str,
+    column_count: int,
+    max_rows: Optional[int] = None
+) -> List[str]:
+    """
+    Find the Arrow-compatible type of each column over a query's result, or
+    over its first max_rows rows.
+
+    SQLite values carry no column type, and one column can hold integers,
+    reals, text and blobs side by side. One aggregate pass over the result,
+    evaluated inside SQLite, collects the storage classes each column holds;
+    a column mixing integers and reals is checked for integers a double
+    cannot hold exactly in a second pass.
+
+    Args:
+        conn: Connection to run the scan on
+        sql: The query, a single SELECT
+        column_count: Number of result columns
+        max_rows: Only scan this many rows, e.g. a sample of a long result
+
+    Returns:
+        One of "int64", "double", "binary" or "string" per column
+    """
+    names = [f"c{i}" for i in range(column_count)]
+    if not names:
+        return []
+    # The newline ends a trailing line comment of the query
+    result = (
+        f"WITH result({', '.join(names)}) AS ({sql.strip().rstrip(';')}\n) "
+        "SELECT {} FROM (SELECT * FROM result LIMIT ?)"
+    )
+    limit = (-1 if max_rows is None else max_rows,)
+    classes = conn.execute(
+        result.format(", ".join(f"group_concat(DISTINCT typeof({name}))" for name in names)), limit
+    ).fetchone()
+    classes = [set(found.split(",")) - {"null"} if found else set() for found in classes]
+
+    types = []
+    for name, found in zip(names, classes):
+        if found == {"integer", "real"}:
+            # Doubles hold integers exactly only up to 2**53
+            integers = f"CASE WHEN typeof({name}) = 'integer' THEN {name} END"
+            low, high = conn.execute(result.format(f"min({integers}), max({integers})"), limit).fetchone()
+            types.append("double" if -(2 ** 53) <= low and high <= 2 ** 53 else "string")
+        elif found in ({"integer"}, {"real"}, {"blob"}):
+            types.append({"integer": "int64", "real": "double", "blob": "binary"}[found.pop()])
+        else:
+            # Text, mixed text or blobs, or only NULLs
+            types.append("string")
+    return types
+
+
+def encode_arrow_ipc(
+    columns: List[str],
+    batches: Iterable[Sequence[tuple]],
+    column_types: Optional[Sequence[str]] = None
+) -> Iterator[bytes]:
+    """
+    Encode rows as an Arrow IPC stream, one record batch per batch of rows.
+
+    An IPC stream has one schema, written before the first batch. Pass the
+    column types from scan_column_types; without them each column's type is
+    taken from the values of the first batch, and columns without a value
+    there, or with values of mixed types, become strings. Since the schema
+    cannot widen once sent, a later batch with a value that does not fit its
+    column's type ends the stream rather than being truncated or rounded.
+
+    A stream that ends early, at that batch or because the batches were cut
+    at their row limit (see CursorBatches), closes with an empty record batch
+    whose custom metadata maps "__truncated__" to "type_conflict" or
+    "max_rows".
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError(
+            "Arrow responses require the 'pyarrow' package. "
+            "Install it with: uv sync --extra arrow"
+        )
+
+    arrow_types = {
+        "int64": pa.int64(), "double": pa.float64(), "binary": pa.binary(), "string": pa.string(),
+    }
+    sink = _ChunkSink()
+    schema = None
+    if column_types is not None:
+        schema = pa.schema([pa.field(name, arrow_types[kind]) for name, kind in zip(columns, column_types)])
+    writer = None
+    cut = None
+    for rows in batches:
+        values = list(zip(*rows))
+        if schema is None:
+            arrays = [_infer_arrow_array(pa, column) for column in values]
+            schema = pa.schema([pa.field(name, array.type) for name, array in zip(columns, arrays)])
+        else:
+            try:
+                arrays = [
+                    _arrow_array(pa, column, field) for column, field in zip(values, schema)
+                ]
+            except ValueError as e:
+                logger.warning(f"Arrow stream ended early: {e}")
+                cut = "type_conflict"
+                break
+        if writer is None:
+            writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+        yield sink.drain()
+
+    if cut is None and getattr(batches, "truncated", False):
+        cut = "max_rows"
+    if writer is None:
+        # Empty result: only the schema, with string columns unless typed
+        if schema is None:
+            schema = pa.schema([pa.field(name, pa.string()) for name in columns])
+        writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+    if cut is not None:
+        empty = pa.record_batch([pa.array([], type=field.type) for field in schema], schema=schema)
+        writer.write_batch(empty, custom_metadata={TRUNCATION_MARKER: cut})
+    writer.close()
+    yield sink.drain()
+
+
+# Python types whose values an Arrow type holds exactly
+_ARROW_VALUE_TYPES = {"int64": (int,), "double": (float, int), "binary": (bytes,)}
+
+
+def _infer_arrow_array(pa: Any, values: Sequence[Any]) -> Any:
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array(_as_strings(values), type=pa.string())
+    if pa.types.is_null(array.type):
+        return pa.array(values, type=pa.string())
+    return array
+
+
+def _arrow_array(pa: Any, values: Sequence[Any], field: Any) -> Any:
+    if pa.types.is_string(field.type):
+        return pa.array(_as_strings(values), type=field.type)
+    accepted = _ARROW_VALUE_TYPES[str(field.type)]
+    for value in values:
+        if value is not None and not isinstance(value, accepted):
+            raise ValueError(f"Value {value!r} of column '{field.name}' does not fit its Arrow type {field.type}")
+    # Integers beyond 2**53 make pyarrow refuse a double column instead of
+    # rounding; ArrowInvalid is a ValueError
+    return pa.array(values, type=field.type)
+
+
+def _as_strings(values: Sequence[Any]) -> List[Optional[str]]:
+    return [value if value is None or isinstance(value, str) else str(value) for value in values]
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    """Return and clear the text written to a buffer"""
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text.encode('utf-8')
+
+
+class _ChunkSink:
+    """Write-only file that collects what pyarrow writes until it is drained"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -1,15 +1,39 @@
+import csv
 import json
 import pandas as pd
 import sqlite3
 import io
+import itertools
 import re
-from typing import Dict, Any, Set
+import time
+from typing import Dict, Any, Set, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
 from .sql_security import (
     execute_query_safely,
     validate_identifier,
     SQLSecurityError
 )
-from .constants import NESTED_DELIMITER, LIST_INDEX_DELIMITER
+from .constants import (
+    NESTED_DELIMITER,
+    LIST_INDEX_DELIMITER,
+    CSV_CHUNK_ROWS,
+    JSONL_BATCH_ROWS,
+    JSON_BATCH_ROWS,
+    JSON_READ_CHUNK_CHARS,
+    INTERNAL_TABLE_PREFIX,
+    ARROW_BATCH_ROWS,
+    SCHEMA_SAMPLE_ROWS,
+    KEY_PATH_CACHE_SIZE,
+    ARRAY_STRATEGIES,
+    ARRAY_MAX_ITEMS
+)
+from .table_writer import TableWriter
+from .parallel_ingest import default_worker_count, map_shards_ordered
+from .upload_cache import invalidate_table, record_upload
+from .db_pool import write_connection
+from .schema_catalog import invalidate_schema
+from .result_cache import bump_table_versions
+from .table_stats import read_row_count
+from .schema_inference import infer_column_type, infer_record_types, coerce_boolean, coerce_boolean_columns
 
 def sanitize_table_name(table_name: str) -> str:
     """
@@ -31,6 +55,10 @@ def sanitize_table_name(table_name: str) -> str:
     if not sanitized:
         sanitized = 'table'
     
+    # Keep uploads out of the namespace reserved for internal tables
+    if sanitized.startswith(INTERNAL_TABLE_PREFIX):
+        sanitized = 't' + sanitized
+    
     # Validate the sanitized name
     try:
         validate_identifier(sanitized, "table")
@@ -40,147 +68,901 @@ def sanitize_table_name(table_name: str) -> str:
     
     return sanitized
 
-def convert_csv_to_sqlite(csv_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+def clean_column_name(column_name: str) -> str:
     """
-    Convert CSV file content to SQLite table
+    Normalize a source column name the same way for every upload format
     """
-    try:
-        # Sanitize table name
-        table_name = sanitize_table_name(table_name)
+    return str(column_name).lower().replace(' ', '_').replace('-', '_')
+
+def summarize_table(conn: sqlite3.Connection, table_name: str) -> Dict[str, Any]:
+    """
+    Collect schema, sample rows and row count for a freshly loaded table
+    """
+    # Get schema information using safe query execution
+    cursor_info = execute_query_safely(
+        conn,
+        "PRAGMA table_info({table})",
+        identifier_params={'table': table_name}
+    )
+    columns_info = cursor_info.fetchall()
+    
+    schema = {}
+    for col in columns_info:
+        schema[col[1]] = col[2]  # column_name: data_type
+    
+    # Get sample data using safe query execution
+    cursor_sample = execute_query_safely(
+        conn,
+        "SELECT * FROM {table} LIMIT 5",
+        identifier_params={'table': table_name}
+    )
+    sample_rows = cursor_sample.fetchall()
+    column_names = [col[1] for col in columns_info]
+    sample_data = [dict(zip(column_names, row)) for row in sample_rows]
+    
+    # Row count maintained by the ingest, without scanning the table
+    row_count = read_row_count(conn, table_name)
+    
+    return {
+        'table_name': table_name,
+        'schema': schema,
+        'row_count': row_count,
+        'sample_data': sample_data
+    }
+
+def ingest_rate(rows_written: int, started_at: float) -> Dict[str, float]:
+    """
+    Build the timing fields reported with every upload result
+    """
+    elapsed = time.perf_counter() - started_at
+    return {
+        'ingest_time_ms': elapsed * 1000,
+        'rows_per_second': rows_written / elapsed if elapsed > 0 else 0.0
+    }
+
+def run_ingest(
+    table_name: str,
+    db_path: str,
+    load: Callable[[TableWriter], None],
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Run one upload inside a single bulk-load transaction and summarize the result.
+    
+    Args:
+        table_name: Requested table name (sanitized here)
+        db_path: Path of the SQLite database
+        load: Callback that writes the upload's rows through the given TableWriter
+        mode: How the upload is combined with an existing table (see UPLOAD_MODES)
+        key_columns: Columns identifying a row for upsert mode
+        progress_callback: Called with the number of rows written so far after each batch
+        cache_key: Called once the rows are loaded; the upload is recorded in
+            the upload cache under the key it returns, in the ingest transaction
+        
+    Returns:
+        Dict containing table info, schema, row count, sample data and ingest rate
+    """
+    started_at = time.perf_counter()
+    
+    # Sanitize table name
+    table_name = sanitize_table_name(table_name)
+    key_columns = [clean_column_name(col) for col in key_columns or []]
+    
+    result: Dict[str, Any] = {}
+    
+    def summarize(conn: sqlite3.Connection) -> None:
+        result.update(summarize_table(conn, table_name))
+        # Recorded before the commit, so no other ingest can slip in between
+        key = cache_key() if cache_key else None
+        if key:
+            record_upload(conn, key, result)
+    
+    with write_connection(db_path) as conn:
+        writer = TableWriter(conn, table_name, mode, key_columns, progress_callback)
+        writer.begin()
+        try:
+            # Any cached upload for this table is stale once it is rewritten
+            invalidate_table(conn, table_name)
+            load(writer)
+            writer.commit(before_commit=summarize)
+        except Exception:
+            writer.rollback()
+            raise
+        invalidate_schema(db_path)
+        bump_table_versions(writer.table_names, db_path)
+    
+    result['rows_written'] = writer.rows_written
+    result.update(ingest_rate(writer.rows_written, started_at))
+    return result
+
+def sqlite_type_for_value(value: Any) -> str:
+    """
+    Pick the SQLite type for a column first seen after the inference sample
+    """
+    return infer_column_type([value]) or 'TEXT'
+
+class RecordLoader:
+    """
+    Stream flat records with varying keys into a TableWriter's table.
+    
+    Rows are buffered in batches ordered by column position. When a record
+    introduces a new key the pending batch is flushed and the table is widened
+    with ALTER TABLE ADD COLUMN, so memory stays proportional to batch_rows
+    times the fields actually present.
+    Column types are inferred from the first sample_rows records (see
+    core.schema_inference); keys first seen later are typed from their first
+    value. Columns are only created once a non-null value shows up, so their
+    declared type reflects real data; keys that never carry a value become
+    TEXT columns.
+    
+    With the child_table array strategy, list values are not stored in the
+    table. Each element becomes a row of a {table}__{column} child table
+    holding parent_rowid and item_index, and the parent keeps the element
+    count in {column}__count.
+    
+    Usage:
+        loader = RecordLoader(writer, batch_rows=10_000)
+        for record in records:
+            loader.add(record)
+        loader.finish()
+    """
+    
+    def __init__(
+        self,
+        writer: TableWriter,
+        batch_rows: int,
+        sample_rows: int = SCHEMA_SAMPLE_ROWS,
+        array_strategy: str = "flatten"
+    ):
+        self.writer = writer
+        self.batch_rows = batch_rows
+        self.sample_rows = sample_rows
+        self.array_strategy = array_strategy
+        self.records_added = 0
+        # Records held back until the sample for type inference is complete
+        self._sample: Optional[List[Dict[str, Any]]] = []
+        self._sampled_types: Dict[str, str] = {}
+        self._column_index: Dict[str, int] = {}
+        self._boolean_positions: List[int] = []
+        self._null_only_fields: Dict[str, None] = {}
+        # Flattened key -> cleaned column name; records repeat the same keys
+        self._column_names: Dict[str, str] = {}
+        self._batch: List[List[Any]] = []
+        self._children: Dict[str, "RecordLoader"] = {}
         
-        # Read CSV into pandas DataFrame
-        df = pd.read_csv(io.BytesIO(csv_content))
+        if array_strategy == "child_table":
+            # Child rows reference their parent's rowid before it is written
+            writer.assign_rowids()
+    
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Add one flat record; it is written once its batch fills up.
+        """
+        if self.array_strategy == "child_table":
+            record = self._move_arrays_to_children(record)
+        self.records_added += 1
         
-        # Clean column names
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
+        if self._sample is None:
+            self._add_row(record)
+            return
+        self._sample.append(record)
+        if len(self._sample) >= self.sample_rows:
+            self._end_sample()
+    
+    def finish(self) -> None:
+        """
+        Write the remaining rows and create columns for keys that were always null.
+        """
+        if self._sample is not None:
+            self._end_sample()
         
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
+        writer = self.writer
+        if not writer.columns and self._null_only_fields:
+            # Every value seen so far was null
+            writer.add_columns({column: 'TEXT' for column in self._null_only_fields})
+            self._batch = [[None] * len(self._null_only_fields) for _ in self._batch]
+            self._null_only_fields = {}
         
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
+        if writer.columns:
+            writer.write_rows(self._batch)
+        self._batch = []
+        writer.add_columns({column: 'TEXT' for column in self._null_only_fields})
         
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
-        )
-        columns_info = cursor_info.fetchall()
+        for child in self._children.values():
+            child.finish()
+    
+    def _end_sample(self) -> None:
+        sample, self._sample = self._sample, None
+        self._sampled_types = infer_record_types([
+            {clean_column_name(field): value for field, value in record.items()}
+            for record in sample
+        ])
+        for record in sample:
+            self._add_row(record)
+    
+    def _add_row(self, record: Dict[str, Any]) -> None:
+        writer = self.writer
+        column_index = self._column_index
+        column_names = self._column_names
         
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
+        fields = []
+        for field, value in record.items():
+            column = column_names.get(field)
+            if column is None:
+                column = column_names[field] = clean_column_name(field)
+            fields.append((column, value))
         
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
-            conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
-        )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
-        
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
-        )
-        row_count = cursor_count.fetchone()[0]
+        new_columns = {}
+        for column, value in fields:
+            if column in column_index or column in new_columns:
+                continue
+            if value is None:
+                self._null_only_fields[column] = None
+                continue
+            new_columns[column] = self._sampled_types.get(column) or sqlite_type_for_value(value)
         
-        conn.close()
+        if new_columns:
+            if writer.columns:
+                # Flush rows built for the narrower layout; the table fills the
+                # new columns of already inserted rows with NULL
+                writer.write_rows(self._batch)
+                self._batch = []
+            for column, column_type in new_columns.items():
+                if column_type == 'BOOLEAN':
+                    self._boolean_positions.append(len(column_index))
+                column_index[column] = len(column_index)
+                self._null_only_fields.pop(column, None)
+            writer.add_columns(new_columns)
+            # Rows buffered before the table existed carry no values
+            self._batch = [[None] * len(column_index) for _ in self._batch]
         
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
-        }
+        row = [None] * len(column_index)
+        for column, value in fields:
+            position = column_index.get(column)
+            if position is not None:
+                row[position] = value
+        for position in self._boolean_positions:
+            row[position] = coerce_boolean(row[position])
+        self._batch.append(row)
+        
+        if len(self._batch) >= self.batch_rows:
+            writer.write_rows(self._batch)
+            self._batch = []
+    
+    def _move_arrays_to_children(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send list values to child tables and replace them with element counts
+        """
+        if not any(isinstance(value, list) for value in record.values()):
+            return record
         
+        parent_rowid = self.writer.first_rowid + self.records_added
+        parent = {}
+        for field, value in record.items():
+            if not isinstance(value, list):
+                parent[field] = value
+                continue
+            
+            child = self._child_loader(field)
+            for index, item in enumerate(value):
+                child_record = {'parent_rowid': parent_rowid, 'item_index': index}
+                if isinstance(item, dict):
+                    child_record.update(flatten_json_object(item, array_strategy="json"))
+                elif isinstance(item, list):
+                    child_record['value'] = json.dumps(item)
+                else:
+                    child_record['value'] = item
+                child.add(child_record)
+            parent[f"{field}{NESTED_DELIMITER}count"] = len(value)
+        return parent
+    
+    def _child_loader(self, field: str) -> "RecordLoader":
+        child = self._children.get(field)
+        if child is None:
+            table_name = sanitize_table_name(f"{self.writer.table_name}{NESTED_DELIMITER}{clean_column_name(field)}")
+            invalidate_table(self.writer.conn, table_name)
+            child = self._children[field] = RecordLoader(
+                self.writer.child_writer(table_name), self.batch_rows, self.sample_rows
+            )
+        return child
+
+def load_records(
+    writer: TableWriter,
+    records: Iterable[Dict[str, Any]],
+    batch_rows: int,
+    sample_rows: int = SCHEMA_SAMPLE_ROWS,
+    array_strategy: str = "flatten"
+) -> None:
+    """
+    Stream flat records with varying keys into the writer's table (see RecordLoader).
+    
+    Args:
+        writer: TableWriter with an open ingest transaction
+        records: Iterable of flat column -> primitive value mappings; with the
+            child_table array strategy values may also be lists
+        batch_rows: Number of rows buffered per executemany batch
+        sample_rows: Number of leading records used to infer column types
+        array_strategy: How list values were flattened (see ARRAY_STRATEGIES)
+    """
+    loader = RecordLoader(writer, batch_rows, sample_rows, array_strategy)
+    for record in records:
+        loader.add(record)
+    loader.finish()
+
+def csv_column_type(series: pd.Series, sample_rows: int = SCHEMA_SAMPLE_ROWS) -> str:
+    """
+    Infer the SQLite type of a parsed CSV column from its first sample_rows values
+    """
+    sample = series.iloc[:sample_rows]
+    if pd.api.types.is_float_dtype(series.dtype):
+        # pandas reads integer columns with gaps as float
+        values = sample.dropna()
+        return 'INTEGER' if len(values) and (values % 1 == 0).all() else 'REAL'
+    # Text columns (dates, booleans mixed with gaps, ...) and native ints/bools
+    return infer_column_type(sample.tolist()) or 'TEXT'
+
+def frame_to_batch(frame: pd.DataFrame) -> Tuple[Dict[str, str], List[tuple]]:
+    """
+    Turn a parsed CSV chunk into (column types, row tuples) ready for the writer
+    """
+    column_types = {col: csv_column_type(frame[col]) for col in frame.columns}
+    # tolist() yields native Python scalars; missing values come back as NaN,
+    # which sqlite3 binds as NULL
+    columns = [frame[col].tolist() for col in frame.columns]
+    return column_types, list(zip(*columns))
+
+def iter_csv_batches(csv_stream: BinaryIO, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[Tuple[Dict[str, str], List[tuple]]]:
+    """
+    Parse CSV content in chunks of chunk_rows rows in this process
+    """
+    with pd.read_csv(csv_stream, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            # Clean column names
+            chunk.columns = [clean_column_name(col) for col in chunk.columns]
+            yield frame_to_batch(chunk)
+
+def parse_csv_shard(shard: bytes, first_line_num: int, column_names: List[str]) -> Tuple[Dict[str, str], List[tuple]]:
+    """
+    Parse one headerless CSV shard in a worker process
+    """
+    try:
+        frame = pd.read_csv(io.BytesIO(shard), header=None, names=column_names)
     except Exception as e:
-        raise Exception(f"Error converting CSV to SQLite: {str(e)}")
+        raise ValueError(f"{str(e)} (in the block starting at line {first_line_num})")
+    return frame_to_batch(frame)
 
-def convert_json_to_sqlite(json_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+def iter_csv_batches_parallel(csv_stream: BinaryIO, workers: int) -> Iterator[Tuple[Dict[str, str], List[tuple]]]:
     """
-    Convert JSON file content to SQLite table
+    Parse CSV content on a pool of worker processes, yielding batches in file order
+    """
+    # Read the header record, which may itself contain quoted line breaks
+    header = csv_stream.readline()
+    while header.count(b'"') % 2 == 1:
+        line = csv_stream.readline()
+        if not line:
+            break
+        header += line
+    if not header.strip():
+        raise ValueError("No columns to parse from file")
+    
+    column_names = [
+        clean_column_name(col)
+        for col in next(csv.reader(io.StringIO(header.decode('utf-8-sig'))))
+    ]
+    
+    empty = True
+    for batch in map_shards_ordered(csv_stream, parse_csv_shard, workers, column_names, quote_aware=True):
+        empty = False
+        yield batch
+    
+    if empty:
+        # Header-only file: create the table with untyped columns
+        yield {col: 'TEXT' for col in column_names}, []
+
+def convert_csv_stream_to_sqlite(
+    csv_stream: BinaryIO,
+    table_name: str,
+    db_path: str = "db/database.db",
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    workers: Optional[int] = None,
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Stream CSV content from a file-like object into a SQLite table.
+    
+    The input is parsed in chunks and each chunk is written inside a single
+    transaction, so peak memory depends on the chunk size rather than on the
+    size of the file. With more than one worker, chunks are cut on record
+    boundaries and parsed on a process pool while this process writes.
+    
+    Args:
+        csv_stream: Binary file-like object positioned at the start of the CSV
+        table_name: Name for the SQLite table
+        db_path: Path of the SQLite database
+        chunk_rows: Number of rows parsed and inserted per batch (single worker)
+        workers: Number of parse processes (defaults to INGEST_WORKERS)
+        mode: replace, append or upsert into an existing table
+        key_columns: Columns identifying a row for upsert mode
+        progress_callback: Called with the number of rows written so far after each batch
+        cache_key: Called once the rows are loaded to get the upload cache key (see run_ingest)
+        
+    Returns:
+        Dict containing table info, schema, row count, sample data and ingest rate
     """
     try:
-        # Sanitize table name
-        table_name = sanitize_table_name(table_name)
+        workers = workers or default_worker_count()
         
-        # Parse JSON
-        data = json.loads(json_content.decode('utf-8'))
+        def load(writer: TableWriter) -> None:
+            if workers > 1:
+                batches = iter_csv_batches_parallel(csv_stream, workers)
+            else:
+                batches = iter_csv_batches(csv_stream, chunk_rows)
+            
+            boolean_positions = []
+            for column_types, rows in batches:
+                # The first chunk decides the declared column types
+                if not writer.columns:
+                    writer.add_columns(column_types)
+                    boolean_positions = [
+                        position for position, column_type in enumerate(column_types.values())
+                        if column_type == 'BOOLEAN'
+                    ]
+                writer.write_rows(coerce_boolean_columns(rows, boolean_positions))
         
-        # Ensure it's a list of objects
-        if not isinstance(data, list):
-            raise ValueError("JSON must be an array of objects")
+        return run_ingest(table_name, db_path, load, mode, key_columns, progress_callback, cache_key)
         
-        if not data:
-            raise ValueError("JSON array is empty")
+    except Exception as e:
+        raise Exception(f"Error converting CSV to SQLite: {str(e)}")
+
+def convert_csv_to_sqlite(
+    csv_content: bytes,
+    table_name: str,
+    db_path: str = "db/database.db",
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Convert CSV file content to SQLite table
+    """
+    return convert_csv_stream_to_sqlite(
+        io.BytesIO(csv_content), table_name, db_path, mode=mode, key_columns=key_columns
+    )
+
+def require_pyarrow() -> Any:
+    """
+    Import pyarrow, which is only needed for Parquet and Arrow IPC uploads
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError(
+            "Parquet and Arrow uploads require the 'pyarrow' package. "
+            "Install it with: uv sync --extra arrow"
+        )
+    return pyarrow
+
+def sqlite_type_for_arrow(arrow_type: Any) -> str:
+    """
+    Map an Arrow data type to a SQLite column type
+    """
+    pa = require_pyarrow()
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    
+    if pa.types.is_boolean(arrow_type) or pa.types.is_integer(arrow_type):
+        return 'INTEGER'
+    elif pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return 'REAL'
+    elif pa.types.is_timestamp(arrow_type):
+        return 'TIMESTAMP'
+    elif pa.types.is_date(arrow_type):
+        return 'DATE'
+    elif pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type) or pa.types.is_fixed_size_binary(arrow_type):
+        return 'BLOB'
+    else:
+        return 'TEXT'
+
+def flatten_arrow_columns(names: List[str], arrays: List[Any], prefix: str = "") -> List[Tuple[str, Any]]:
+    """
+    Expand struct columns into one column per leaf field, named like flattened JSON keys
+    """
+    pa = require_pyarrow()
+    columns = []
+    for name, array in zip(names, arrays):
+        if pa.types.is_struct(array.type):
+            # StructArray.flatten applies the parent's nulls to each child
+            field_names = [array.type.field(i).name for i in range(array.type.num_fields)]
+            columns.extend(flatten_arrow_columns(field_names, array.flatten(), f"{prefix}{name}{NESTED_DELIMITER}"))
+        else:
+            columns.append((clean_column_name(f"{prefix}{name}"), array))
+    return columns
+
+def arrow_column_values(array: Any) -> List[Any]:
+    """
+    Convert an Arrow array to Python values that sqlite3 can bind
+    """
+    pa = require_pyarrow()
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    
+    values = array.to_pylist()
+    arrow_type = array.type
+    if pa.types.is_nested(arrow_type):
+        # Lists, maps and unions are stored as JSON text, like nested JSON values
+        return [None if value is None else json.dumps(value, default=str) for value in values]
+    elif pa.types.is_decimal(arrow_type):
+        return [None if value is None else float(value) for value in values]
+    elif pa.types.is_temporal(arrow_type):
+        return [None if value is None else str(value) for value in values]
+    return values
+
+def iter_arrow_batches(record_batches: Iterable[Any]) -> Iterator[Tuple[Dict[str, str], List[tuple]]]:
+    """
+    Convert Arrow record batches into (column_types, rows) batches for the table writer
+    """
+    for batch in record_batches:
+        columns = flatten_arrow_columns(batch.schema.names, batch.columns)
+        column_types = {name: sqlite_type_for_arrow(array.type) for name, array in columns}
+        rows = list(zip(*(arrow_column_values(array) for _, array in columns)))
+        yield column_types, rows
+
+def arrow_schema_types(schema: Any) -> Dict[str, str]:
+    """
+    SQLite column types for an Arrow schema, known before any rows are read
+    """
+    pa = require_pyarrow()
+    empty_batch = pa.RecordBatch.from_pylist([], schema=schema)
+    column_types, _ = next(iter_arrow_batches([empty_batch]))
+    return column_types
+
+def convert_arrow_batches_to_sqlite(
+    schema: Any,
+    record_batches: Iterable[Any],
+    table_name: str,
+    db_path: str,
+    mode: str,
+    key_columns: Optional[List[str]],
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Write Arrow record batches into a SQLite table with types taken from the schema
+    """
+    def load(writer: TableWriter) -> None:
+        writer.add_columns(arrow_schema_types(schema))
+        for _, rows in iter_arrow_batches(record_batches):
+            writer.write_rows(rows)
+    
+    return run_ingest(table_name, db_path, load, mode, key_columns, progress_callback, cache_key)
+
+def convert_parquet_stream_to_sqlite(
+    parquet_stream: BinaryIO,
+    table_name: str,
+    db_path: str = "db/database.db",
+    batch_rows: int = ARROW_BATCH_ROWS,
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Load a Parquet file into a SQLite table one record batch at a time.
+    
+    Column types come from the Parquet schema instead of being inferred, and
+    only one batch of rows is decoded at a time. The stream must be seekable
+    because the Parquet footer is read first.
+    
+    Args:
+        parquet_stream: Seekable binary file-like object holding the Parquet file
+        table_name: Name for the SQLite table
+        db_path: Path of the SQLite database
+        batch_rows: Number of rows decoded and inserted per batch
+        mode: replace, append or upsert into an existing table
+        key_columns: Columns identifying a row for upsert mode
+        progress_callback: Called with the number of rows written so far after each batch
+        cache_key: Called once the rows are loaded to get the upload cache key (see run_ingest)
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(data)
+    Returns:
+        Dict containing table info, schema, row count, sample data and ingest rate
+    """
+    try:
+        require_pyarrow()
+        import pyarrow.parquet as pq
         
-        # Clean column names
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
+        with pq.ParquetFile(parquet_stream) as parquet_file:
+            return convert_arrow_batches_to_sqlite(
+                parquet_file.schema_arrow,
+                parquet_file.iter_batches(batch_size=batch_rows),
+                table_name, db_path, mode, key_columns, progress_callback, cache_key
+            )
         
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
+    except Exception as e:
+        raise Exception(f"Error converting Parquet to SQLite: {str(e)}")
+
+def convert_arrow_stream_to_sqlite(
+    arrow_stream: BinaryIO,
+    table_name: str,
+    db_path: str = "db/database.db",
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Load Arrow IPC data (file/Feather v2 or streaming format) into a SQLite table.
+    
+    Args:
+        arrow_stream: Binary file-like object holding the Arrow IPC data; the
+            file format needs a seekable stream
+        table_name: Name for the SQLite table
+        db_path: Path of the SQLite database
+        mode: replace, append or upsert into an existing table
+        key_columns: Columns identifying a row for upsert mode
+        progress_callback: Called with the number of rows written so far after each batch
+        cache_key: Called once the rows are loaded to get the upload cache key (see run_ingest)
+        
+    Returns:
+        Dict containing table info, schema, row count, sample data and ingest rate
+    """
+    try:
+        pa = require_pyarrow()
         
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
+        # The file format starts with a magic string; the streaming format does not
+        if hasattr(arrow_stream, "peek"):
+            is_file_format = arrow_stream.peek(6)[:6] == b"ARROW1"
+        else:
+            start = arrow_stream.tell()
+            is_file_format = arrow_stream.read(6) == b"ARROW1"
+            arrow_stream.seek(start)
         
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
-        )
-        columns_info = cursor_info.fetchall()
+        if is_file_format:
+            reader = pa.ipc.open_file(arrow_stream)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        else:
+            reader = pa.ipc.open_stream(arrow_stream)
+            batches = reader
         
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
+        # Closing the reader leaves arrow_stream open for its owner
+        with reader:
+            return convert_arrow_batches_to_sqlite(
+                reader.schema, batches, table_name, db_path, mode, key_columns, progress_callback, cache_key
+            )
         
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
-            conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
-        )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
-        
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
-        )
-        row_count = cursor_count.fetchone()[0]
+    except Exception as e:
+        raise Exception(f"Error converting Arrow to SQLite: {str(e)}")
+
+def iter_json_array(json_stream: BinaryIO, chunk_size: int = JSON_READ_CHUNK_CHARS) -> Iterator[Any]:
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time.
+    
+    Text is decoded in chunks of chunk_size characters and each element is
+    decoded with JSONDecoder.raw_decode as soon as it is complete, so memory is
+    bounded by the largest single element rather than by the document size.
+    
+    Args:
+        json_stream: Binary file-like object positioned at the start of the JSON
+        chunk_size: Number of characters read from the stream at a time
+        
+    Yields:
+        Each element of the top-level array
+    """
+    decoder = json.JSONDecoder()
+    reader = io.TextIOWrapper(json_stream, encoding='utf-8')
+    buffer = ""
+    pos = 0
+    eof = False
+    
+    def fill() -> bool:
+        # Drop consumed text and append the next chunk; False once exhausted
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+    
+    def next_token() -> str:
+        # Skip whitespace and return the next significant character ("" at EOF)
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+    
+    try:
+        if next_token() != '[':
+            raise ValueError("JSON must be an array of objects")
+        pos += 1
         
-        conn.close()
+        if next_token() == ']':
+            pos += 1
+        else:
+            while True:
+                if not next_token():
+                    raise ValueError("Invalid JSON: unexpected end of document")
+                
+                # Retry with more text until the element is complete; a value
+                # ending exactly at the buffer edge may still be truncated
+                while True:
+                    try:
+                        element, end = decoder.raw_decode(buffer, pos)
+                        if end < len(buffer) or eof:
+                            break
+                    except json.JSONDecodeError as e:
+                        if eof:
+                            raise ValueError(f"Invalid JSON: {str(e)}")
+                    fill()
+                
+                pos = end
+                yield element
+                
+                separator = next_token()
+                pos += 1
+                if separator == ']':
+                    break
+                if separator != ',':
+                    raise ValueError("Invalid JSON: expected ',' or ']' after array element")
         
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
+        if next_token():
+            raise ValueError("Invalid JSON: unexpected data after top-level array")
+    except UnicodeDecodeError:
+        raise ValueError("File is not valid UTF-8 encoded text")
+    finally:
+        # Leave the caller's stream open
+        reader.detach()
+
+def iter_json_array_records(json_stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of a top-level JSON array as flat records.
+    
+    Nested objects and arrays are stored as JSON text so they can still be
+    queried with SQLite's JSON1 functions.
+    """
+    empty = True
+    for element in iter_json_array(json_stream):
+        if not isinstance(element, dict):
+            raise ValueError("JSON must be an array of objects")
+        empty = False
+        yield {
+            key: json.dumps(value) if isinstance(value, (dict, list)) else value
+            for key, value in element.items()
         }
+    
+    if empty:
+        raise ValueError("JSON array is empty")
+
+def convert_json_stream_to_sqlite(
+    json_stream: BinaryIO,
+    table_name: str,
+    db_path: str = "db/database.db",
+    batch_rows: int = JSON_BATCH_ROWS,
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Stream a JSON array of objects into a SQLite table.
+    
+    Objects are parsed one at a time and written in batches inside a single
+    transaction, so the document is never held in memory as a whole.
+    
+    Args:
+        json_stream: Binary file-like object positioned at the start of the JSON
+        table_name: Name for the SQLite table
+        db_path: Path of the SQLite database
+        batch_rows: Number of rows buffered per executemany batch
+        mode: replace, append or upsert into an existing table
+        key_columns: Columns identifying a row for upsert mode
+        progress_callback: Called with the number of rows written so far after each batch
+        cache_key: Called once the rows are loaded to get the upload cache key (see run_ingest)
+        
+    Returns:
+        Dict containing table info, schema, row count, sample data and ingest rate
+    """
+    try:
+        def load(writer: TableWriter) -> None:
+            load_records(writer, iter_json_array_records(json_stream), batch_rows)
+            
+            if not writer.columns:
+                raise ValueError("JSON objects have no fields")
+        
+        return run_ingest(table_name, db_path, load, mode, key_columns, progress_callback, cache_key)
         
     except Exception as e:
         raise Exception(f"Error converting JSON to SQLite: {str(e)}")
 
-def flatten_json_object(obj: Any, prefix: str = "") -> Dict[str, Any]:
+def convert_json_to_sqlite(
+    json_content: bytes,
+    table_name: str,
+    db_path: str = "db/database.db",
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Convert JSON file content to SQLite table
+    """
+    return convert_json_stream_to_sqlite(
+        io.BytesIO(json_content), table_name, db_path, mode=mode, key_columns=key_columns
+    )
+
+class _KeyPathCache:
+    """
+    Joined key paths, keyed by parent path and then by dict key / list index.
+    
+    Logs repeat the same paths on every line, so this avoids re-concatenating
+    them. Records with ever-new keys would grow it without end, so it is
+    dropped wholesale once it holds KEY_PATH_CACHE_SIZE paths in total.
+    """
+    
+    def __init__(self):
+        self._children: Dict[str, Dict[Any, str]] = {}
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def children(self, path: str) -> Dict[Any, str]:
+        """
+        Return the cached child key paths of one container path
+        """
+        children = self._children.get(path)
+        if children is None:
+            children = self._children[path] = {}
+            self._count()
+        return children
+    
+    def add(self, children: Dict[Any, str], key: Any, path: str) -> None:
+        """
+        Remember the joined path of a child in the dict returned by children()
+        """
+        children[key] = path
+        self._count()
+    
+    def _count(self) -> None:
+        self._size += 1
+        if self._size >= KEY_PATH_CACHE_SIZE:
+            # Dicts still held by a running flatten fill up unseen and are dropped with it
+            self._children = {}
+            self._size = 0
+
+_dict_key_paths = _KeyPathCache()
+_list_index_paths = _KeyPathCache()
+
+def flatten_json_object(
+    obj: Any,
+    prefix: str = "",
+    array_strategy: str = "flatten",
+    max_items: int = ARRAY_MAX_ITEMS
+) -> Dict[str, Any]:
     """
     Flatten a nested JSON object using delimiter constants.
     
+    Walks the document with an explicit stack of iterators and writes every
+    leaf straight into one output dict, so nesting depth costs neither
+    recursion nor intermediate dicts. Keys come out in document order.
+    
+    Lists nested in the object are handled according to array_strategy (see
+    ARRAY_STRATEGIES); a top-level list is always flattened by index.
+    
     Args:
         obj: The object to flatten (can be dict, list, or primitive)
         prefix: The current prefix for nested keys
+        array_strategy: How nested lists become columns
+        max_items: Number of leading elements kept by the first_k strategy
         
     Returns:
         Dict with flattened key-value pairs
@@ -188,16 +970,46 @@ def flatten_json_object(obj: Any, prefix: str = "") -> Dict[str, Any]:
     result = {}
     
     if isinstance(obj, dict):
-        for key, value in obj.items():
-            new_key = f"{prefix}{NESTED_DELIMITER}{key}" if prefix else key
-            result.update(flatten_json_object(value, new_key))
+        stack = [(prefix, _dict_key_paths.children(prefix), iter(obj.items()), True)]
     elif isinstance(obj, list):
-        for i, value in enumerate(obj):
-            new_key = f"{prefix}{LIST_INDEX_DELIMITER}{i}"
-            result.update(flatten_json_object(value, new_key))
+        stack = [(prefix, _list_index_paths.children(prefix), enumerate(obj), False)]
     else:
         # Primitive value (string, number, boolean, null)
         result[prefix] = obj
+        return result
+    
+    while stack:
+        path, children, items, is_dict = stack[-1]
+        for key, value in items:
+            child = children.get(key)
+            if child is None:
+                if is_dict:
+                    child = f"{path}{NESTED_DELIMITER}{key}" if path else key
+                    _dict_key_paths.add(children, key, child)
+                else:
+                    child = f"{path}{LIST_INDEX_DELIMITER}{key}"
+                    _list_index_paths.add(children, key, child)
+            
+            if isinstance(value, dict):
+                if value:
+                    stack.append((child, _dict_key_paths.children(child), iter(value.items()), True))
+                    break
+            elif isinstance(value, list):
+                if array_strategy == "json":
+                    result[child] = json.dumps(value)
+                elif array_strategy == "child_table":
+                    # Kept whole; RecordLoader moves it to a child table
+                    result[child] = value
+                elif value:
+                    if array_strategy == "first_k":
+                        value = itertools.islice(value, max_items)
+                    stack.append((child, _list_index_paths.children(child), enumerate(value), False))
+                    break
+            else:
+                result[child] = value
+        else:
+            # This container is exhausted; resume its parent
+            stack.pop()
     
     return result
 
@@ -233,103 +1045,156 @@ def discover_jsonl_fields(jsonl_content: bytes) -> Set[str]:
     
     return all_fields
 
-def convert_jsonl_to_sqlite(jsonl_content: bytes, table_name: str, db_path: str = "db/database.db") -> Dict[str, Any]:
+def iter_jsonl_records(
+    jsonl_stream: BinaryIO,
+    first_line_num: int = 1,
+    array_strategy: str = "flatten",
+    array_max_items: int = ARRAY_MAX_ITEMS
+) -> Iterator[Dict[str, Any]]:
     """
-    Convert JSONL file content to SQLite table with flattened structure.
+    Yield each JSONL line as a flattened record, decoding and parsing it once.
+    """
+    for line_num, raw_line in enumerate(jsonl_stream, first_line_num):
+        try:
+            line = raw_line.decode('utf-8').strip()
+        except UnicodeDecodeError:
+            raise ValueError("File is not valid UTF-8 encoded text")
+        if not line:
+            continue
+        
+        try:
+            json_obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
+        
+        yield flatten_json_object(json_obj, array_strategy=array_strategy, max_items=array_max_items)
+
+def parse_jsonl_shard(
+    shard: bytes,
+    first_line_num: int,
+    array_strategy: str = "flatten",
+    array_max_items: int = ARRAY_MAX_ITEMS
+) -> List[Dict[str, Any]]:
+    """
+    Parse and flatten one block of JSONL lines in a worker process
+    """
+    return list(iter_jsonl_records(io.BytesIO(shard), first_line_num, array_strategy, array_max_items))
+
+def iter_jsonl_records_parallel(
+    jsonl_stream: BinaryIO,
+    workers: int,
+    array_strategy: str = "flatten",
+    array_max_items: int = ARRAY_MAX_ITEMS
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse and flatten JSONL on a pool of worker processes, yielding records in file order
+    """
+    for records in map_shards_ordered(jsonl_stream, parse_jsonl_shard, workers, array_strategy, array_max_items):
+        yield from records
+
+def validate_array_strategy(array_strategy: str, array_max_items: int, mode: str) -> None:
+    """
+    Reject array handling options that cannot be applied.
+    
+    Raises:
+        ValueError: If the strategy is unknown, first_k keeps no elements, or
+            child tables are combined with upsert mode
+    """
+    if array_strategy not in ARRAY_STRATEGIES:
+        raise ValueError(
+            f"Unsupported array strategy '{array_strategy}'. Use one of: {', '.join(ARRAY_STRATEGIES)}"
+        )
+    if array_strategy == "first_k" and array_max_items < 1:
+        raise ValueError("array_max_items must be at least 1")
+    if array_strategy == "child_table" and mode == "upsert":
+        # Merged rows keep their rowid, so child rows could not be matched to them
+        raise ValueError("Child-table arrays are not supported with upsert mode")
+
+def convert_jsonl_stream_to_sqlite(
+    jsonl_stream: BinaryIO,
+    table_name: str,
+    db_path: str = "db/database.db",
+    batch_rows: int = JSONL_BATCH_ROWS,
+    workers: Optional[int] = None,
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    array_strategy: str = "flatten",
+    array_max_items: int = ARRAY_MAX_ITEMS,
+    cache_key: Optional[Callable[[], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Stream JSONL content into a SQLite table with flattened structure in one pass.
+    
+    Each line is decoded, parsed and flattened exactly once and written in
+    batches; new flattened keys widen the table as they appear. With more than
+    one worker, parsing and flattening run on a process pool while this
+    process writes the records in file order.
+    
+    Arrays are flattened into one column per element by default. Long or
+    variable-length arrays are better kept as JSON text (queryable with
+    json_extract/json_each), truncated to their first elements, or exploded
+    into a child table; see ARRAY_STRATEGIES.
     
     Args:
-        jsonl_content: The raw JSONL file content
+        jsonl_stream: Binary file-like object positioned at the start of the JSONL
         table_name: Name for the SQLite table
+        db_path: Path of the SQLite database
+        batch_rows: Number of rows buffered per executemany batch
+        workers: Number of parse processes (defaults to INGEST_WORKERS)
+        mode: replace, append or upsert into an existing table
+        key_columns: Columns identifying a row for upsert mode
+        progress_callback: Called with the number of rows written so far after each batch
+        array_strategy: How arrays become columns (flatten, json, first_k, child_table)
+        array_max_items: Number of array elements kept by the first_k strategy
+        cache_key: Called once the rows are loaded to get the upload cache key (see run_ingest)
         
     Returns:
-        Dict containing table info, schema, row count, and sample data
+        Dict containing table info, schema, row count, sample data and ingest rate
     """
     try:
-        # Sanitize table name
-        table_name = sanitize_table_name(table_name)
+        validate_array_strategy(array_strategy, array_max_items, mode)
+        workers = workers or default_worker_count()
         
-        # First pass: discover all possible fields
-        all_fields = discover_jsonl_fields(jsonl_content)
+        def load(writer: TableWriter) -> None:
+            if workers > 1:
+                records = iter_jsonl_records_parallel(jsonl_stream, workers, array_strategy, array_max_items)
+            else:
+                records = iter_jsonl_records(jsonl_stream, array_strategy=array_strategy, array_max_items=array_max_items)
+            load_records(writer, records, batch_rows, array_strategy=array_strategy)
+            
+            if not writer.columns:
+                raise ValueError("No valid JSON objects found in JSONL file")
         
-        if not all_fields:
-            raise ValueError("No valid JSON objects found in JSONL file")
-        
-        # Second pass: process each line and create consistent records
-        content = jsonl_content.decode('utf-8')
-        lines = content.strip().split('\n')
-        
-        records = []
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line:
-                continue
-                
-            try:
-                json_obj = json.loads(line)
-                flattened = flatten_json_object(json_obj)
-                
-                # Create record with all fields, filling missing ones with None
-                record = {}
-                for field in all_fields:
-                    record[field] = flattened.get(field, None)
-                
-                records.append(record)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
-        
-        if not records:
-            raise ValueError("No valid records found in JSONL file")
-        
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(records)
-        
-        # Clean column names for SQLite compatibility
-        df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
-        
-        # Connect to SQLite database
-        conn = sqlite3.connect(db_path)
-        
-        # Write DataFrame to SQLite
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        
-        # Get schema information using safe query execution
-        cursor_info = execute_query_safely(
-            conn,
-            "PRAGMA table_info({table})",
-            identifier_params={'table': table_name}
-        )
-        columns_info = cursor_info.fetchall()
-        
-        schema = {}
-        for col in columns_info:
-            schema[col[1]] = col[2]  # column_name: data_type
-        
-        # Get sample data using safe query execution
-        cursor_sample = execute_query_safely(
-            conn,
-            "SELECT * FROM {table} LIMIT 5",
-            identifier_params={'table': table_name}
-        )
-        sample_rows = cursor_sample.fetchall()
-        column_names = [col[1] for col in columns_info]
-        sample_data = [dict(zip(column_names, row)) for row in sample_rows]
-        
-        # Get row count using safe query execution
-        cursor_count = execute_query_safely(
-            conn,
-            "SELECT COUNT(*) FROM {table}",
-            identifier_params={'table': table_name}
-        )
-        row_count = cursor_count.fetchone()[0]
-        
-        conn.close()
-        
-        return {
-            'table_name': table_name,
-            'schema': schema,
-            'row_count': row_count,
-            'sample_data': sample_data
-        }
+        return run_ingest(table_name, db_path, load, mode, key_columns, progress_callback, cache_key)
         
     except Exception as e:
-        raise Exception(f"Error converting JSONL to SQLite: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Error converting JSONL to SQLite: {str(e)}")
+
+def convert_jsonl_to_sqlite(
+    jsonl_content: bytes,
+    table_name: str,
+    db_path: str = "db/database.db",
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    array_strategy: str = "flatten",
+    array_max_items: int = ARRAY_MAX_ITEMS
+) -> Dict[str, Any]:
+    """
+    Convert JSONL file content to SQLite table with flattened structure.
+    
+    Args:
+        jsonl_content: The raw JSONL file content
+        table_name: Name for the SQLite table
+        mode: replace, append or upsert into an existing table
+        key_columns: Columns identifying a row for upsert mode
+        array_strategy: How arrays become columns (flatten, json, first_k, child_table)
+        array_max_items: Number of array elements kept by the first_k strategy
+        
+    Returns:
+        Dict containing table info, schema, row count, and sample data
+    """
+    return convert_jsonl_stream_to_sqlite(
+        io.BytesIO(jsonl_content), table_name, db_path, mode=mode, key_columns=key_columns,
+        array_strategy=array_strategy, array_max_items=array_max_items
+    )
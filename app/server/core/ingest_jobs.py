@@ -0,0 +1,193 @@
+"""
+Background ingest jobs.
+
+A job owns a spooled copy of an uploaded file and runs its conversion on a
+small thread pool, so the request that created it returns immediately and
+the event loop stays free while large files load. Progress (compressed bytes
+consumed and rows written) is updated by the worker thread and read by status
+requests; plain attribute updates are enough for that under the GIL.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, BinaryIO, Callable, Optional, Tuple
+
+from .constants import INGEST_JOB_HISTORY, INGEST_JOB_WORKERS
+from .upload_cache import hash_stream
+
+_executor = ThreadPoolExecutor(max_workers=INGEST_JOB_WORKERS, thread_name_prefix="ingest-job")
+_jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+_jobs_lock = Lock()
+
+
+class ProgressReader(io.RawIOBase):
+    """
+    Raw binary reader over a file that counts the bytes read through it.
+
+    Wrapped in io.BufferedReader it behaves like a regular binary file for the
+    parsers (readline, iteration, seek), while the count drives job progress.
+    """
+
+    def __init__(self, raw: BinaryIO, on_read: Callable[[int], None]):
+        self.raw = raw
+        self.on_read = on_read
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.raw.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self.on_read(size)
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+
+class IngestJob:
+    """
+    State of one background upload.
+
+    status moves from queued to running and then to succeeded or failed.
+    result holds the converter's return value on success, error the message
+    on failure.
+    """
+
+    def __init__(self, filename: str, path: str, bytes_total: int, content_hash: Optional[str]):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.path = path
+        self.content_hash = content_hash
+        self.status = "queued"
+        self.bytes_total = bytes_total
+        self.bytes_processed = 0
+        self.rows_written = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+
+    def _add_bytes(self, size: int) -> None:
+        # Parquet re-reads its footer, so the count can overshoot slightly
+        self.bytes_processed = min(self.bytes_total, self.bytes_processed + size)
+
+    def _set_rows(self, rows_written: int) -> None:
+        self.rows_written = rows_written
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time extrapolated from the share of bytes consumed so far."""
+        if self.status != "running" or not self.bytes_processed:
+            return None
+        remaining = self.bytes_total - self.bytes_processed
+        return self.elapsed_seconds * remaining / self.bytes_processed
+
+
+def spool_upload(stream: BinaryIO, suffix: str = "", hashed: bool = True) -> Tuple[str, int, Optional[str]]:
+    """
+    Copy an upload to a temporary file that outlives the request, hashing it on the way.
+
+    Args:
+        stream: Seekable binary file-like object holding the upload
+        suffix: File name suffix for the temporary file
+        hashed: Whether to hash the upload; not needed when it cannot be cached
+
+    Returns:
+        (temporary file path, size in bytes, SHA-256 hex digest or None)
+    """
+    spool = tempfile.NamedTemporaryFile(prefix="ingest-", suffix=suffix, delete=False)
+    try:
+        with spool:
+            if hashed:
+                content_hash = hash_stream(stream, sink=spool)
+            else:
+                content_hash = None
+                shutil.copyfileobj(stream, spool)
+        return spool.name, os.path.getsize(spool.name), content_hash
+    except Exception:
+        os.remove(spool.name)
+        raise
+
+
+def submit_ingest_job(
+    filename: str,
+    path: str,
+    bytes_total: int,
+    content_hash: Optional[str],
+    ingest: Callable[[BinaryIO, Optional[str], Callable[[int], None]], Any]
+) -> IngestJob:
+    """
+    Queue the ingest of a spooled upload and return its job right away.
+
+    Args:
+        filename: Original name of the uploaded file
+        path: Spooled copy of the upload; removed when the job finishes
+        bytes_total: Size of the spooled file
+        content_hash: SHA-256 of the upload, or None if it was not hashed
+        ingest: Called in a worker thread as ingest(stream, content_hash,
+            progress_callback); its return value becomes the job result
+
+    Returns:
+        The queued job
+    """
+    job = IngestJob(filename, path, bytes_total, content_hash)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+        _prune_finished_jobs()
+    _executor.submit(_run_job, job, ingest)
+    return job
+
+
+def get_ingest_job(job_id: str) -> Optional[IngestJob]:
+    """Return the job with the given id, or None if it is unknown or expired."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def _run_job(job: IngestJob, ingest: Callable[[BinaryIO, Optional[str], Callable[[int], None]], Any]) -> None:
+    job.status = "running"
+    job.started_at = time.time()
+    try:
+        with open(job.path, "rb") as raw:
+            stream = io.BufferedReader(ProgressReader(raw, job._add_bytes))
+            job.result = ingest(stream, job.content_hash, job._set_rows)
+        job.bytes_processed = job.bytes_total
+        job.status = "succeeded"
+    except Exception as e:
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        job.finished_at = time.time()
+        try:
+            os.remove(job.path)
+        except OSError:
+            pass
+
+
+def _prune_finished_jobs() -> None:
+    """Drop the oldest finished jobs beyond INGEST_JOB_HISTORY. Caller holds _jobs_lock."""
+    finished = [job_id for job_id, job in _jobs.items() if job.finished_at is not None]
+    for job_id in finished[:max(0, len(finished) - INGEST_JOB_HISTORY)]:
+        del _jobs[job_id]
@@ -1,8 +1,88 @@
 import os
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, List, Tuple
+import httpx
+import anthropic
+import openai
 from openai import OpenAI
 from anthropic import Anthropic
 from core.data_models import QueryRequest
+from core.constants import (
+    LLM_CONNECT_TIMEOUT_SECONDS,
+    LLM_KEEPALIVE_SECONDS,
+    LLM_POOL_CONNECTIONS,
+    LLM_TIMEOUT_SECONDS
+)
+
+# Provider clients by (provider, API key), created once and shared by all
+# requests so their HTTP connections, and TLS sessions, are reused
+_clients: Dict[Tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+def _create_client(provider: str, api_key: str) -> Any:
+    """
+    Create a provider client with a keep-alive connection pool and the configured timeouts
+    """
+    limits = httpx.Limits(
+        max_connections=LLM_POOL_CONNECTIONS,
+        max_keepalive_connections=LLM_POOL_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_SECONDS
+    )
+    # Each SDK checks that the timeout comes from the HTTP library it was built on
+    if provider == "openai":
+        timeout = openai.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+        http_client = openai.DefaultHttpxClient(limits=limits, timeout=timeout)
+        return OpenAI(api_key=api_key, timeout=timeout, http_client=http_client)
+    if provider == "anthropic":
+        timeout = anthropic.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+        http_client = anthropic.DefaultHttpxClient(limits=limits, timeout=timeout)
+        return Anthropic(api_key=api_key, timeout=timeout, http_client=http_client)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+def get_llm_client(provider: str, api_key: str) -> Any:
+    """
+    Return the shared client of a provider, creating it on first use
+    
+    A client created for another API key of the same provider, e.g. before
+    the key was rotated, is replaced. It is not closed, since a request may
+    still be using it; its connections go when it is garbage collected.
+    
+    Args:
+        provider: "openai" or "anthropic"
+        api_key: API key the client authenticates with
+    """
+    with _clients_lock:
+        client = _clients.get((provider, api_key))
+        if client is None:
+            for key in [key for key in _clients if key[0] == provider]:
+                del _clients[key]
+            client = _clients[(provider, api_key)] = _create_client(provider, api_key)
+        return client
+
+def warm_llm_clients() -> List[str]:
+    """
+    Create the clients of every provider with an API key in the environment,
+    so the first request does not pay for it
+    
+    Returns:
+        The providers whose clients are ready
+    """
+    providers = []
+    for provider, variable in (("openai", "OPENAI_API_KEY"), ("anthropic", "ANTHROPIC_API_KEY")):
+        api_key = os.environ.get(variable)
+        if api_key:
+            get_llm_client(provider, api_key)
+            providers.append(provider)
+    return providers
+
+def close_llm_clients() -> None:
+    """
+    Close all shared provider clients and their connections, e.g. at shutdown or between tests
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
 
 def generate_sql_with_openai(query_text: str, schema_info: Dict[str, Any]) -> str:
     """
@@ -14,7 +94,7 @@ def generate_sql_with_openai(query_text: str, schema_info: Dict[str, Any]) -> st
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         
-        client = OpenAI(api_key=api_key)
+        client = get_llm_client("openai", api_key)
         
         # Format schema for prompt
         schema_description = format_schema_for_prompt(schema_info)
@@ -75,7 +155,7 @@ def generate_sql_with_anthropic(query_text: str, schema_info: Dict[str, Any]) ->
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        client = Anthropic(api_key=api_key)
+        client = get_llm_client("anthropic", api_key)
         
         # Format schema for prompt
         schema_description = format_schema_for_prompt(schema_info)
@@ -132,17 +212,25 @@ def format_schema_for_prompt(schema_info: Dict[str, Any]) -> str:
     lines = []
     
     for table_name, table_info in schema_info.get('tables', {}).items():
-        lines.append(f"Table: {table_name}")
-        lines.append("Columns:")
-        
-        for col_name, col_type in table_info['columns'].items():
-            lines.append(f"  - {col_name} ({col_type})")
-        
-        lines.append(f"Row count: {table_info['row_count']}")
-        lines.append("")
+        lines.extend(format_table_for_prompt(table_name, table_info))
     
     return "\n".join(lines)
 
+def format_table_for_prompt(table_name: str, table_info: Dict[str, Any]) -> List[str]:
+    """
+    Format one table of the schema for LLM prompt; the row count is left out if table_info has none
+    """
+    lines = [f"Table: {table_name}", "Columns:"]
+    
+    for col_name, col_type in table_info['columns'].items():
+        lines.append(f"  - {col_name} ({col_type})")
+    
+    if 'row_count' in table_info:
+        lines.append(f"Row count: {table_info['row_count']}")
+    lines.append("")
+    
+    return lines
+
 def generate_random_query_with_openai(schema_info: Dict[str, Any]) -> str:
     """
     Generate a random natural language query using OpenAI API
@@ -153,7 +241,7 @@ def generate_random_query_with_openai(schema_info: Dict[str, Any]) -> str:
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         
-        client = OpenAI(api_key=api_key)
+        client = get_llm_client("openai", api_key)
         
         # Format schema for prompt
         schema_description = format_schema_for_prompt(schema_info)
@@ -206,7 +294,7 @@ def generate_random_query_with_anthropic(schema_info: Dict[str, Any]) -> str:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        client = Anthropic(api_key=api_key)
+        client = get_llm_client("anthropic", api_key)
         
         # Format schema for prompt
         schema_description = format_schema_for_prompt(schema_info)
@@ -0,0 +1,168 @@
+"""
+Process-pool pipeline for parsing large uploads on several cores.
+
+The parent process cuts the input stream into shards that end on line
+boundaries, worker processes parse each shard, and results are handed back in
+input order so a single writer can append them to SQLite. Only a bounded
+number of shards is in flight at any time, which keeps memory flat for
+arbitrarily large files.
+
+Workers are started with the spawn method: the server has live threads (the
+event loop's worker pool, ingest jobs) and forking a threaded process can
+copy locks held by other threads into the child.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from threading import Lock
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Tuple
+
+from .constants import INGEST_SHARD_BYTES
+
+_executors: Dict[int, Executor] = {}
+_executors_lock = Lock()
+
+
+def default_worker_count() -> int:
+    """
+    Number of parse workers used when a caller does not pass one explicitly.
+
+    Configured with the INGEST_WORKERS environment variable; defaults to 1,
+    which keeps parsing in-process.
+    """
+    try:
+        return max(1, int(os.environ.get("INGEST_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def get_executor(workers: int) -> Executor:
+    """
+    Return a process pool with the given number of workers, created on first use.
+
+    Pools are kept until close_executors() so uploads do not pay worker
+    start-up cost each time.
+    """
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _executors[workers] = executor
+        return executor
+
+
+def close_executors() -> None:
+    """Shut down the worker pools; the next parallel parse starts new ones."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+def _find_cut(block: bytes, quote_aware: bool) -> int:
+    """
+    Return the offset just past the last line break in block that is a safe
+    shard boundary, or -1 if there is none.
+
+    With quote_aware set (CSV), a line break inside a quoted field is not a
+    boundary. Every shard starts outside quotes, so a break is safe exactly
+    when the number of quote characters before it is even; escaped quotes
+    ("") do not change the parity.
+    """
+    cut = block.rfind(b"\n")
+    if not quote_aware:
+        return cut + 1 if cut >= 0 else -1
+
+    quotes = block.count(b'"', 0, cut) if cut >= 0 else 0
+    while cut >= 0:
+        if quotes % 2 == 0:
+            return cut + 1
+        previous = block.rfind(b"\n", 0, cut)
+        quotes -= block.count(b'"', previous + 1, cut)
+        cut = previous
+    return -1
+
+
+def iter_line_shards(
+    stream: BinaryIO,
+    shard_bytes: int = INGEST_SHARD_BYTES,
+    quote_aware: bool = False
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    Split a binary stream into shards of roughly shard_bytes ending on line boundaries.
+
+    Args:
+        stream: Binary file-like object to split
+        shard_bytes: Target shard size in bytes
+        quote_aware: Do not cut inside double-quoted fields (CSV)
+
+    Yields:
+        (shard, first_line_num) tuples, with 1-based line numbers relative to
+        the stream's current position
+    """
+    pending = b""
+    line_num = 1
+
+    while True:
+        data = stream.read(shard_bytes)
+        if not data:
+            break
+
+        block = pending + data
+        cut = _find_cut(block, quote_aware)
+        if cut <= 0:
+            # A single record spans the whole block; keep reading
+            pending = block
+            continue
+
+        shard, pending = block[:cut], block[cut:]
+        yield shard, line_num
+        line_num += shard.count(b"\n")
+
+    if pending:
+        yield pending, line_num
+
+
+def map_shards_ordered(
+    stream: BinaryIO,
+    parse_shard: Callable[..., Any],
+    workers: int,
+    *args: Any,
+    shard_bytes: int = INGEST_SHARD_BYTES,
+    quote_aware: bool = False
+) -> Iterator[Any]:
+    """
+    Parse shards of a stream in worker processes, yielding results in input order.
+
+    parse_shard must be a module-level (picklable) function called as
+    parse_shard(shard, first_line_num, *args). At most two shards per worker are
+    in flight, so a slow consumer applies back-pressure to reading.
+
+    Args:
+        stream: Binary file-like object to parse
+        parse_shard: Function run in the workers for each shard
+        workers: Number of worker processes
+        *args: Extra arguments passed to parse_shard
+        shard_bytes: Target shard size in bytes
+        quote_aware: Do not cut inside double-quoted fields (CSV)
+
+    Yields:
+        parse_shard results in the order the shards appear in the stream
+    """
+    executor = get_executor(workers)
+    in_flight = deque()
+
+    try:
+        for shard, first_line_num in iter_line_shards(stream, shard_bytes, quote_aware):
+            in_flight.append(executor.submit(parse_shard, shard, first_line_num, *args))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+
+        while in_flight:
+            yield in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
@@ -0,0 +1,68 @@
+"""
+Continuation tokens for paged query results.
+
+The first page of a query comes back with a token that stands for the SQL
+and the position of the next page. Fetching a page runs the SQL again and
+skips the rows already delivered, so nothing is held in memory between
+requests. Generated SQL has no reliable unique sort key, which rules out
+keyset pagination; the rows a query can be paged through are bounded by
+QUERY_MAX_ROWS instead.
+
+Tokens are kept in process memory for QUERY_TOKEN_TTL_SECONDS, and only the
+newest QUERY_TOKEN_HISTORY are remembered.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from .constants import QUERY_TOKEN_HISTORY, QUERY_TOKEN_TTL_SECONDS
+
+_tokens: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_tokens_lock = Lock()
+
+
+def create_page_token(sql: str, offset: int, page_size: int, result_format: str = "records") -> str:
+    """
+    Remember where the next page of a query result starts.
+    
+    Args:
+        sql: Validated SQL of the query
+        offset: Number of result rows already delivered
+        page_size: Rows per page
+        result_format: Layout of the result rows (see QUERY_RESULT_FORMATS)
+        
+    Returns:
+        Opaque token for resolve_page_token
+    """
+    token = uuid.uuid4().hex
+    with _tokens_lock:
+        _tokens[token] = {
+            'sql': sql,
+            'offset': offset,
+            'page_size': page_size,
+            'result_format': result_format,
+            'expires_at': time.monotonic() + QUERY_TOKEN_TTL_SECONDS
+        }
+        while len(_tokens) > QUERY_TOKEN_HISTORY:
+            _tokens.popitem(last=False)
+    return token
+
+
+def resolve_page_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the sql, offset, page_size and result_format a token stands for.
+    
+    Tokens can be resolved repeatedly until they expire, so a page can be
+    fetched again. Returns None for unknown or expired tokens.
+    """
+    with _tokens_lock:
+        page = _tokens.get(token)
+        if page is None:
+            return None
+        if page['expires_at'] < time.monotonic():
+            del _tokens[token]
+            return None
+        return {key: page[key] for key in ('sql', 'offset', 'page_size', 'result_format')}
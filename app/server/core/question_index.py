@@ -0,0 +1,253 @@
+"""
+Offline similarity index over past natural language questions.
+
+Users ask the same thing in different words ("top 5 products by revenue",
+"5 best products by revenue"). The index finds the most similar question
+asked before with TF-IDF weighted character trigrams and cosine similarity,
+in process and without any model or network call.
+
+Character n-grams tolerate reordering, inflection and typos, but also score
+questions that differ in one decisive word highly. A match is therefore only
+accepted when both questions agree on what changes the SQL:
+
+    numbers         "top 5" is not "top 10"
+    negations       "with" is not "without"
+    directions      "highest"/"top"/"most" are not "lowest"/"bottom"/"least",
+                    "newest"/"latest" are not "oldest"/"earliest"
+    content words   everything but STOPWORDS, compared in singular form and
+                    allowing one typo, so "products by revenue" is not
+                    "customers by revenue" and "per region" is not "per month"
+
+A rejected match only costs an LLM call; an accepted wrong one returns a
+wrong answer, so the guards err on the side of rejecting.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .constants import QUESTION_NGRAM_SIZE, QUESTION_SIMILARITY_THRESHOLD
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_NUMBER_RE = re.compile(r"^[0-9]+(?:\.[0-9]+)?$")
+
+# Written-out numbers are compared like digits
+NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7",
+    "eight": "8", "nine": "9", "ten": "10", "twenty": "20", "fifty": "50", "hundred": "100",
+}
+
+NEGATIONS = frozenset({"not", "no", "without", "except", "excluding", "exclude", "never", "non"})
+
+# Words that do not change what a question asks for
+STOPWORDS = frozenset({
+    "a", "an", "the", "of", "in", "on", "at", "by", "per", "for", "to", "from", "with", "and",
+    "is", "are", "was", "were", "be", "been", "me", "my", "our", "us", "we", "i", "you",
+    "show", "list", "give", "get", "find", "display", "return", "tell", "see", "fetch",
+    "what", "which", "who", "whose", "how", "many", "much", "all", "each", "every", "any",
+    "do", "does", "did", "please", "that", "this", "these", "those", "have", "has", "had",
+    "there", "their", "it", "its", "can", "could", "would", "want", "need", "like", "some",
+})
+
+# Words that choose an ordering or a side of a comparison, by direction
+DIRECTIONS = {
+    **dict.fromkeys(
+        ("top", "best", "highest", "most", "max", "maximum", "largest", "biggest", "greatest",
+         "more", "above", "over", "descending", "desc"), "high"),
+    **dict.fromkeys(
+        ("bottom", "worst", "lowest", "least", "min", "minimum", "smallest", "fewest", "less",
+         "below", "under", "ascending", "asc"), "low"),
+    **dict.fromkeys(("newest", "latest", "recent", "last"), "new"),
+    **dict.fromkeys(("oldest", "earliest", "first"), "old"),
+}
+
+
+def stem(word: str) -> str:
+    """Crude singular form, enough to match 'products' with a 'product' table."""
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def words(question: str) -> List[str]:
+    """Lower-cased words and numbers of a question."""
+    return _WORD_RE.findall(question.lower())
+
+
+def char_ngrams(question: str, size: int = QUESTION_NGRAM_SIZE) -> Counter:
+    """
+    Counts of the character n-grams of a question's words, padded with spaces
+    at word boundaries.
+
+    Stopwords are skipped; number words and direction words are replaced by
+    their digits and direction, so "five best" and "top 5" share n-grams.
+    """
+    grams: Counter = Counter()
+    for word in words(question):
+        if word in STOPWORDS:
+            continue
+        word = NUMBER_WORDS.get(word) or DIRECTIONS.get(word) or word
+        padded = f" {word} "
+        grams.update(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+    return grams
+
+
+class QuestionSignature(NamedTuple):
+    """The parts of a question that must agree for two questions to share SQL"""
+    numbers: Tuple[str, ...]
+    negations: FrozenSet[str]
+    directions: FrozenSet[str]
+    content: FrozenSet[str]
+
+
+def question_signature(question: str) -> QuestionSignature:
+    """Split a question into the parts compared by same_intent."""
+    numbers = []
+    negations = set()
+    directions = set()
+    content = set()
+    for word in words(question):
+        if _NUMBER_RE.match(word) or word in NUMBER_WORDS:
+            numbers.append(NUMBER_WORDS.get(word, word))
+        elif word in NEGATIONS:
+            negations.add(word)
+        elif word in DIRECTIONS:
+            directions.add(DIRECTIONS[word])
+        elif word not in STOPWORDS:
+            content.add(stem(word))
+    return QuestionSignature(tuple(sorted(numbers)), frozenset(negations), frozenset(directions), frozenset(content))
+
+
+def _one_edit_apart(a: str, b: str) -> bool:
+    """True if b results from a by at most one inserted, deleted or replaced character."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _covered(words_a: FrozenSet[str], words_b: FrozenSet[str]) -> bool:
+    """Every word of words_a is in words_b, or one typo away from a word there if long enough."""
+    return all(
+        word in words_b or (len(word) >= 5 and any(_one_edit_apart(word, other) for other in words_b))
+        for word in words_a
+    )
+
+
+def same_intent(question: str, other: str) -> bool:
+    """Check that two questions agree on numbers, negations, directions and content words."""
+    a, b = question_signature(question), question_signature(other)
+    return (
+        a.numbers == b.numbers
+        and a.negations == b.negations
+        and a.directions == b.directions
+        and _covered(a.content, b.content)
+        and _covered(b.content, a.content)
+    )
+
+
+class QuestionIndex:
+    """TF-IDF character n-gram index of questions with cosine similarity lookup"""
+
+    def __init__(self, questions: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Counter] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # IDF and vector norms of the current contents; recomputed after changes
+        self._idf: Optional[Dict[str, float]] = None
+        self._norms: Dict[str, float] = {}
+        for question in questions:
+            self.add(question)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, question: str) -> bool:
+        return question in self._docs
+
+    def add(self, question: str) -> None:
+        """Index a question; adding it again has no effect."""
+        with self._lock:
+            if question in self._docs:
+                return
+            grams = char_ngrams(question)
+            self._docs[question] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(question)
+            self._idf = None
+
+    def remove(self, question: str) -> None:
+        """Drop a question from the index, if present."""
+        with self._lock:
+            grams = self._docs.pop(question, None)
+            if grams is None:
+                return
+            for gram in grams:
+                posting = self._postings[gram]
+                posting.discard(question)
+                if not posting:
+                    del self._postings[gram]
+            self._idf = None
+
+    def similar(self, question: str, threshold: float = QUESTION_SIMILARITY_THRESHOLD, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Return indexed questions whose cosine similarity reaches threshold.
+
+        Args:
+            question: Question to look up
+            threshold: Minimum similarity, between 0 and 1
+            limit: Maximum number of matches
+
+        Returns:
+            (question, similarity) pairs, most similar first
+        """
+        with self._lock:
+            if not self._docs:
+                return []
+            idf = self._weights()
+
+            # n-grams never seen in the index cannot match, but still count
+            # towards the query's norm so unrelated words lower the similarity
+            unseen_idf = math.log(1 + len(self._docs)) + 1
+            query = {gram: count * idf.get(gram, unseen_idf) for gram, count in char_ngrams(question).items()}
+            query_norm = math.sqrt(sum(weight * weight for weight in query.values()))
+            if query_norm == 0:
+                return []
+
+            # Only questions sharing an n-gram can score above zero
+            scores: Dict[str, float] = {}
+            for gram, weight in query.items():
+                for doc in self._postings.get(gram, ()):
+                    scores[doc] = scores.get(doc, 0.0) + weight * self._docs[doc][gram] * idf[gram]
+
+            matches = []
+            for doc, dot in scores.items():
+                norm = self._norms[doc]
+                similarity = dot / (query_norm * norm) if norm else 0.0
+                if similarity >= threshold:
+                    matches.append((doc, similarity))
+            matches.sort(key=lambda match: match[1], reverse=True)
+            return matches[:limit]
+
+    def _weights(self) -> Dict[str, float]:
+        """Smoothed IDF of every indexed n-gram, with the document norms it implies."""
+        if self._idf is None:
+            total = len(self._docs)
+            self._idf = {
+                gram: math.log((1 + total) / (1 + len(docs))) + 1 for gram, docs in self._postings.items()
+            }
+            self._norms = {
+                doc: math.sqrt(sum((count * self._idf[gram]) ** 2 for gram, count in grams.items()))
+                for doc, grams in self._docs.items()
+            }
+        return self._idf
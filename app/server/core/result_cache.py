@@ -0,0 +1,257 @@
+"""
+In-memory cache of query results.
+
+Dashboards re-run the same generated SQL over and over against data that
+rarely changes. Each result page is kept in a least-recently-used cache
+bounded by the estimated size of the cached objects in bytes, keyed by the
+normalized SQL and the page requested.
+
+An entry remembers which tables its query read, as reported by SQLite's
+authorizer while the statement was prepared, together with their data
+versions. Ingest and table deletion bump the version of every table they
+change right after committing, so entries of queries over those tables stop
+matching while entries over other tables stay valid. Versions are drawn from
+one counter and never reused, so a table that is dropped and uploaded again
+cannot match entries of its earlier contents.
+
+Queries whose result can change without a write are not cached: those
+reading SQLite's or the application's internal tables, running pragmas or
+calling functions such as random() or date('now'). Writes made by other
+processes do not bump versions and are not noticed.
+"""
+
+import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional, Set, Tuple
+
+from .constants import QUERY_CACHE_BYTES, QUERY_CACHE_ENTRY_BYTES
+from .db_pool import DEFAULT_DB_PATH, MEMORY_DB_PATH
+from .sql_security import authorize_user_query, is_internal_table
+
+# String literals and quoted identifiers, which normalize_sql keeps verbatim,
+# and comments, which it drops
+_TOKEN_RE = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|--[^\n]*|/\*.*?(?:\*/|$))""",
+    re.DOTALL
+)
+_SPACE_RE = re.compile(r"\s+")
+
+# Keywords and literals that make a result depend on the clock
+_VOLATILE_RE = re.compile(r"\bcurrent_(?:date|time|timestamp)\b|'now'", re.IGNORECASE)
+
+# Built-in functions whose results differ between runs over the same data
+VOLATILE_FUNCTIONS = frozenset({
+    "random", "randomblob", "changes", "total_changes", "last_insert_rowid",
+})
+
+_lock = threading.Lock()
+_table_versions: Dict[Tuple[str, str], int] = {}
+_last_version = 0
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Canonical form of a query for cache keys.
+
+    Drops comments, collapses whitespace outside string literals and quoted
+    identifiers and drops trailing semicolons, so formatting differences of
+    generated SQL do not cause misses.
+    """
+    normalized = []
+    unquoted = []
+    # The capturing split alternates unquoted text and tokens
+    for i, part in enumerate(_TOKEN_RE.split(sql)):
+        if i % 2 == 0:
+            unquoted.append(part)
+        elif part.startswith(("--", "/*")):
+            unquoted.append(" ")
+        else:
+            normalized.append(_SPACE_RE.sub(" ", "".join(unquoted)))
+            normalized.append(part)
+            unquoted = []
+    normalized.append(_SPACE_RE.sub(" ", "".join(unquoted)))
+    return "".join(normalized).strip().rstrip(";").strip()
+
+
+def current_version() -> int:
+    """Return the newest table version handed out so far."""
+    with _lock:
+        return _last_version
+
+
+def bump_table_versions(table_names: Iterable[str], db_path: str = DEFAULT_DB_PATH) -> None:
+    """
+    Give tables a new data version, invalidating cached results that read them.
+
+    Call after the write has been committed: a query running between the
+    commit and the bump may see the new data, but its result is tagged with
+    the old version and so never served.
+    """
+    global _last_version
+    with _lock:
+        for table_name in table_names:
+            _last_version += 1
+            _table_versions[(db_path, table_name)] = _last_version
+
+
+class QueryReads:
+    """Tables a statement reads and whether its result may change without a write"""
+
+    def __init__(self):
+        self.tables: Set[str] = set()
+        self.volatile = False
+
+
+@contextmanager
+def track_reads(conn: sqlite3.Connection) -> Iterator[QueryReads]:
+    """
+    Record what the statements prepared on conn inside the block read.
+
+    Uses an authorizer callback, which SQLite invokes while preparing a
+    statement, so the SQL is never parsed here. The callback also denies
+    what user SQL may not do (see authorize_user_query).
+    """
+    reads = QueryReads()
+
+    def authorize(action: int, arg1: Optional[str], arg2: Optional[str], db_name: Optional[str], source: Optional[str]) -> int:
+        if action == sqlite3.SQLITE_READ and arg1:
+            if is_internal_table(arg1):
+                reads.volatile = True
+            else:
+                reads.tables.add(arg1)
+        elif action == sqlite3.SQLITE_FUNCTION and arg2 and arg2.lower() in VOLATILE_FUNCTIONS:
+            reads.volatile = True
+        elif action == sqlite3.SQLITE_PRAGMA:
+            reads.volatile = True
+        return authorize_user_query(action, arg1, arg2, db_name, source)
+
+    conn.set_authorizer(authorize)
+    try:
+        yield reads
+    finally:
+        conn.set_authorizer(None)
+
+
+def estimate_bytes(value: Any) -> int:
+    """Approximate memory held by a result of dicts, lists, tuples and scalars."""
+    size = 0
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            # Keys are the column names, shared by every row
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+    return size
+
+
+class ResultCache:
+    """Least-recently-used query results bounded by their estimated size"""
+
+    def __init__(self, max_bytes: int = QUERY_CACHE_BYTES, max_entry_bytes: int = QUERY_CACHE_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.size_bytes = 0
+        self._lock = threading.Lock()
+        # key -> (result, db_path, table versions, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], str, Dict[str, int], int]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None if missing or outdated."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, db_path, versions, _ = entry
+            if any(_table_versions.get((db_path, table), 0) != version for table, version in versions.items()):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return dict(result)
+
+    def put(self, key: Hashable, result: Dict[str, Any], db_path: str, versions: Dict[str, int]) -> bool:
+        """
+        Cache a result read at the given table versions, evicting the least recently used.
+
+        Returns:
+            bool: False if the result is too large to be cached
+        """
+        size = estimate_bytes(result)
+        if size > self.max_entry_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, db_path, versions, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        self.size_bytes -= self._entries.pop(key)[3]
+
+
+_cache = ResultCache()
+
+
+def lookup_result(key: Hashable, db_path: str = DEFAULT_DB_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached result of a query, or None.
+
+    Args:
+        key: Normalized SQL plus whatever else selects the result (page, format)
+        db_path: Path of the SQLite database the query runs on
+    """
+    if db_path == MEMORY_DB_PATH:
+        return None
+    return _cache.get((db_path, key))
+
+
+def store_result(
+    key: Hashable,
+    result: Dict[str, Any],
+    sql: str,
+    reads: QueryReads,
+    version: int,
+    db_path: str = DEFAULT_DB_PATH
+) -> None:
+    """
+    Cache a freshly computed result unless it may be outdated already.
+
+    Args:
+        key: Same key as passed to lookup_result
+        result: Result dict; must not be modified afterwards
+        sql: The query, checked for clock-dependent expressions
+        reads: What the query read, from track_reads
+        version: current_version() taken before the query ran
+        db_path: Path of the SQLite database the query ran on
+    """
+    if db_path == MEMORY_DB_PATH or reads.volatile or _VOLATILE_RE.search(sql):
+        return
+    with _lock:
+        versions = {table: _table_versions.get((db_path, table), 0) for table in reads.tables}
+    if any(table_version > version for table_version in versions.values()):
+        # A table was written while the query ran; its rows may predate the write
+        return
+    _cache.put((db_path, key), result, db_path, versions)
+
+
+def clear_result_cache() -> None:
+    """Drop all cached results, e.g. between tests."""
+    _cache.clear()
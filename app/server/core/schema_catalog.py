@@ -0,0 +1,115 @@
+"""
+In-process catalog of the database schema.
+
+Building the schema takes PRAGMA table_info and a row count for every table,
+so the cost grows with the amount of data. The catalog keeps the last result
+and hands out copies until the database changes.
+
+A change is noticed in two ways. Ingest and table deletion call
+invalidate_schema as soon as they commit. Everything else, including writes
+from other processes, is caught by comparing PRAGMA schema_version (bumped by
+DDL) and PRAGMA data_version (bumped by commits from any other connection)
+with the values recorded when the catalog was built. Both pragmas are read
+from one dedicated connection, because data_version is only comparable on
+the connection that reads it.
+"""
+
+import copy
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .db_pool import DEFAULT_DB_PATH, MEMORY_DB_PATH, open_connection
+
+
+class SchemaCatalog:
+    """Cached schema of one database file"""
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._version: Optional[Tuple[int, int]] = None
+        self._schema: Optional[Dict[str, Any]] = None
+    
+    def get(self, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the schema, calling load only if the database changed since the last call.
+        
+        Args:
+            load: Builds the schema dict from the database; exceptions propagate
+                and nothing is cached
+                
+        Returns:
+            A copy of the cached schema
+        """
+        with self._lock:
+            # Read the version before loading, so a change made while loading
+            # triggers another load next time
+            version = self._current_version()
+            if self._schema is None or version != self._version:
+                self._schema = load()
+                self._version = version
+            return copy.deepcopy(self._schema)
+    
+    def invalidate(self) -> None:
+        """Drop the cached schema so the next get reloads it."""
+        with self._lock:
+            self._schema = None
+    
+    def close(self) -> None:
+        with self._lock:
+            self._schema = None
+            if self._watch_conn is not None:
+                self._watch_conn.close()
+                self._watch_conn = None
+    
+    def _current_version(self) -> Tuple[int, int]:
+        if self._watch_conn is None:
+            self._watch_conn = open_connection(self.db_path)
+        return (
+            self._watch_conn.execute("PRAGMA schema_version").fetchone()[0],
+            self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        )
+
+
+_catalogs: Dict[str, SchemaCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_schema_catalog(db_path: str = DEFAULT_DB_PATH) -> SchemaCatalog:
+    """Return the catalog of a database file, creating it on first use."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(db_path)
+        if catalog is None:
+            catalog = _catalogs[db_path] = SchemaCatalog(db_path)
+        return catalog
+
+
+def cached_schema(load: Callable[[], Dict[str, Any]], db_path: str = DEFAULT_DB_PATH) -> Dict[str, Any]:
+    """
+    Return the schema of a database through its catalog.
+    
+    An in-memory database is private to each connection, so its schema is
+    always loaded fresh.
+    """
+    if db_path == MEMORY_DB_PATH:
+        return load()
+    return get_schema_catalog(db_path).get(load)
+
+
+def invalidate_schema(db_path: str = DEFAULT_DB_PATH) -> None:
+    """Forget the cached schema of a database after changing its tables."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(db_path)
+    if catalog is not None:
+        catalog.invalidate()
+
+
+def close_schema_catalogs() -> None:
+    """Drop every catalog and close its connection."""
+    with _catalogs_lock:
+        catalogs = list(_catalogs.values())
+        _catalogs.clear()
+    for catalog in catalogs:
+        catalog.close()
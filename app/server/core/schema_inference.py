@@ -0,0 +1,146 @@
+"""
+Sampled column type inference for uploads.
+
+Upload parsers hand over Python values: JSON scalars from JSON/JSONL, and
+pandas-parsed values from CSV, where anything pandas cannot read as a number
+stays a string. A sample of the non-null values of each column decides its
+declared SQLite type before any rows are written:
+
+    BOOLEAN    true/false/yes/no strings or JSON booleans, stored as 1/0
+    INTEGER    whole numbers
+    REAL       other decimal numbers
+    DATE       ISO dates (YYYY-MM-DD)
+    TIMESTAMP  ISO date-times, optionally with fractional seconds and offset
+    TEXT       anything else
+
+Numeric strings need no per-row conversion: SQLite's INTEGER and REAL column
+affinities store them as numbers on insert. Values that later turn out not to
+fit are kept as they are, so a sample that guessed wrong never fails a load.
+Only boolean strings are converted, with coerce_boolean.
+"""
+
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Type candidates in order of preference when several fit every sampled value
+TYPE_PRECEDENCE = ("BOOLEAN", "INTEGER", "REAL", "DATE", "TIMESTAMP")
+
+TRUE_STRINGS = frozenset({"true", "yes"})
+FALSE_STRINGS = frozenset({"false", "no"})
+
+# No leading zeros, so identifiers such as zip codes stay TEXT
+_INTEGER_RE = re.compile(r"[+-]?(0|[1-9]\d*)")
+_REAL_RE = re.compile(r"[+-]?((0|[1-9]\d*)(\.\d+)?|\.\d+)([eE][+-]?\d+)?")
+_DATE_RE = re.compile(r"\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])")
+_TIMESTAMP_RE = re.compile(
+    r"\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])"
+    r"([T ]([01]\d|2[0-3]):[0-5]\d(:[0-5]\d(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?"
+)
+
+# Largest magnitude SQLite stores as a 64-bit integer
+_MAX_INTEGER = 2 ** 63 - 1
+
+
+def is_null(value: Any) -> bool:
+    """Check for missing values: None, and the NaN pandas uses for empty CSV fields."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _candidate_types(value: Any) -> frozenset:
+    """Return the types a single non-null value is compatible with."""
+    if isinstance(value, bool):
+        return frozenset({"BOOLEAN", "INTEGER", "REAL"})
+    if isinstance(value, int):
+        return frozenset({"INTEGER", "REAL"}) if abs(value) <= _MAX_INTEGER else frozenset({"REAL"})
+    if isinstance(value, float):
+        return frozenset({"REAL"})
+    if not isinstance(value, str):
+        return frozenset()
+
+    text = value.strip()
+    lowered = text.lower()
+    if lowered in TRUE_STRINGS or lowered in FALSE_STRINGS:
+        return frozenset({"BOOLEAN"})
+    if _INTEGER_RE.fullmatch(text):
+        return frozenset({"INTEGER", "REAL"}) if abs(int(text)) <= _MAX_INTEGER else frozenset({"REAL"})
+    if _REAL_RE.fullmatch(text):
+        return frozenset({"REAL"})
+    if _DATE_RE.fullmatch(text):
+        return frozenset({"DATE", "TIMESTAMP"})
+    if _TIMESTAMP_RE.fullmatch(text):
+        return frozenset({"TIMESTAMP"})
+    return frozenset()
+
+
+def infer_column_type(values: Iterable[Any]) -> Optional[str]:
+    """
+    Infer a SQLite column type from a sample of a column's values.
+
+    Args:
+        values: Sampled values of one column; nulls are ignored
+
+    Returns:
+        The most specific type every non-null value fits, TEXT if there is
+        none, or None when the sample holds no non-null value
+    """
+    candidates = None
+    for value in values:
+        if is_null(value):
+            continue
+        fits = _candidate_types(value)
+        candidates = fits if candidates is None else candidates & fits
+        if not candidates:
+            return "TEXT"
+
+    if candidates is None:
+        return None
+    return next(column_type for column_type in TYPE_PRECEDENCE if column_type in candidates)
+
+
+def infer_record_types(records: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Infer column types from a sample of flat records with varying keys.
+
+    Args:
+        records: Sampled records mapping column name to value
+
+    Returns:
+        Column name to type for every column with at least one non-null value
+    """
+    samples: Dict[str, List[Any]] = {}
+    for record in records:
+        for column, value in record.items():
+            if not is_null(value):
+                samples.setdefault(column, []).append(value)
+    return {column: infer_column_type(values) for column, values in samples.items()}
+
+
+def coerce_boolean(value: Any) -> Any:
+    """Convert a boolean string or bool to 1/0, leaving other values untouched."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return 1
+        if lowered in FALSE_STRINGS:
+            return 0
+    return value
+
+
+def coerce_boolean_columns(rows: List[Sequence[Any]], positions: Sequence[int]) -> List[Sequence[Any]]:
+    """
+    Apply coerce_boolean to the given column positions of each row.
+
+    Returns rows unchanged when there are no boolean columns.
+    """
+    if not positions:
+        return rows
+    coerced = []
+    for row in rows:
+        row = list(row)
+        for position in positions:
+            row[position] = coerce_boolean(row[position])
+        coerced.append(row)
+    return coerced
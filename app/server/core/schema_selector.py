@@ -0,0 +1,266 @@
+"""
+Relevance selection of the schema described in LLM prompts.
+
+format_schema_for_prompt describes every table and column, so prompts, and
+with them latency and cost, grow with the number of uploaded tables until
+they no longer fit the model's context. Instead the prompt for a question
+only describes the tables it is about.
+
+Tables are ranked with a local lexical index: the words of each table's
+name, its column names and the text values of a sample of its rows, matched
+against the content words of the question (see core.question_index). A word
+counts more in a name than in a value, and less the more tables contain it.
+The SCHEMA_PROMPT_TABLES best tables are kept, plus tables their *_id
+columns point to while room remains, and the columns of wide tables are cut
+to SCHEMA_PROMPT_COLUMNS, matching and key columns first.
+
+The full schema is used when there is nothing to prune, and when the
+ranking is not trustworthy: no table matches any word of the question, or
+more tables tie for the best score than fit the prompt.
+
+The index of each database is kept in memory. Only tables that are new or
+whose columns or row count changed are sampled again.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Set, Tuple
+
+from .constants import SCHEMA_PROMPT_COLUMNS, SCHEMA_PROMPT_TABLES, SCHEMA_PROMPT_SAMPLE_ROWS
+from .db_pool import DEFAULT_DB_PATH, read_connection
+from .question_index import STOPWORDS, question_signature, stem, words
+from .sql_security import SQLSecurityError, execute_query_safely
+
+# Weight of a word by where a table contains it
+NAME_WEIGHT = 3.0
+COLUMN_WEIGHT = 2.0
+VALUE_WEIGHT = 1.0
+
+# Text values longer than this are prose rather than labels and not indexed
+_MAX_VALUE_LENGTH = 64
+
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+
+_indexes: Dict[str, "SchemaIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def identifier_terms(identifier: str) -> FrozenSet[str]:
+    """Singular words of a table or column name, split at underscores and camel case."""
+    return frozenset(
+        stem(word) for word in words(_CAMEL_RE.sub(r"\1 \2", identifier).replace("_", " "))
+        if word not in STOPWORDS and not word.isdigit()
+    )
+
+
+def value_terms(value: Any) -> FrozenSet[str]:
+    """Singular words of a short text value; numbers and other types give none."""
+    if not isinstance(value, str) or len(value) > _MAX_VALUE_LENGTH:
+        return frozenset()
+    return frozenset(
+        stem(word) for word in words(value)
+        if word not in STOPWORDS and not word[0].isdigit()
+    )
+
+
+class TableEntry(NamedTuple):
+    """Indexed words of one table"""
+    signature: Tuple[Any, ...]
+    # word -> weight of the most important place the table contains it
+    terms: Dict[str, float]
+    # column -> words of its name and sampled values
+    column_terms: Dict[str, FrozenSet[str]]
+
+
+class SchemaIndex:
+    """Lexical index of the tables of one database"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._tables: Dict[str, TableEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def refresh(self, schema_info: Dict[str, Any]) -> None:
+        """Index new and changed tables of the schema and forget dropped ones."""
+        tables = schema_info.get('tables', {})
+        with self._lock:
+            for table_name in list(self._tables):
+                if table_name not in tables:
+                    del self._tables[table_name]
+            stale = {
+                table_name: _signature(table_info) for table_name, table_info in tables.items()
+                if table_name not in self._tables or self._tables[table_name].signature != _signature(table_info)
+            }
+            if not stale:
+                return
+            with read_connection(self.db_path) as conn:
+                for table_name, signature in stale.items():
+                    samples = _sample_values(conn, table_name)
+                    self._tables[table_name] = _index_table(table_name, tables[table_name], samples, signature)
+
+    def rank(self, terms: FrozenSet[str]) -> List[Tuple[str, float]]:
+        """
+        Score the indexed tables against the words of a question.
+
+        Returns:
+            (table, score) pairs of the tables matching any word, best first
+        """
+        with self._lock:
+            count = len(self._tables)
+            scores: Dict[str, float] = {}
+            for term in terms:
+                holders = [(name, entry.terms[term]) for name, entry in self._tables.items() if term in entry.terms]
+                if not holders:
+                    continue
+                idf = math.log(1 + count / len(holders))
+                for name, weight in holders:
+                    scores[name] = scores.get(name, 0.0) + weight * idf
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def matching_columns(self, table_name: str, terms: FrozenSet[str]) -> List[str]:
+        """Columns of a table whose name or sampled values contain a word of the question."""
+        with self._lock:
+            entry = self._tables.get(table_name)
+            if entry is None:
+                return []
+            return [column for column, column_terms in entry.column_terms.items() if column_terms & terms]
+
+
+def _signature(table_info: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(table_info['columns'].items()) + (table_info.get('row_count'),)
+
+
+def _sample_values(conn: sqlite3.Connection, table_name: str) -> Dict[str, List[Any]]:
+    """Values of the first SCHEMA_PROMPT_SAMPLE_ROWS rows of a table, by column."""
+    try:
+        cursor = execute_query_safely(
+            conn,
+            "SELECT * FROM {table} LIMIT ?",
+            params=(SCHEMA_PROMPT_SAMPLE_ROWS,),
+            identifier_params={'table': table_name}
+        )
+    except (SQLSecurityError, sqlite3.Error):
+        # An unreadable table is still matched on its names
+        return {}
+    column_names = [description[0] for description in cursor.description]
+    return dict(zip(column_names, (list(values) for values in zip(*cursor.fetchall()))))
+
+
+def _index_table(
+    table_name: str,
+    table_info: Dict[str, Any],
+    samples: Dict[str, List[Any]],
+    signature: Tuple[Any, ...]
+) -> TableEntry:
+    terms: Dict[str, float] = {}
+
+    def add(new_terms: FrozenSet[str], weight: float) -> None:
+        for term in new_terms:
+            terms[term] = max(terms.get(term, 0.0), weight)
+
+    add(identifier_terms(table_name), NAME_WEIGHT)
+    column_terms = {}
+    for column in table_info['columns']:
+        name_terms = identifier_terms(column)
+        found_values = frozenset().union(*(value_terms(value) for value in samples.get(column, ())))
+        add(name_terms, COLUMN_WEIGHT)
+        add(found_values, VALUE_WEIGHT)
+        column_terms[column] = name_terms | found_values
+    return TableEntry(signature, terms, column_terms)
+
+
+def get_schema_index(db_path: str = DEFAULT_DB_PATH) -> SchemaIndex:
+    """Return the schema index of a database, creating it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = _indexes[db_path] = SchemaIndex(db_path)
+        return index
+
+
+def clear_schema_indexes() -> None:
+    """Forget all schema indexes, e.g. between tests."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def select_schema(
+    question: str,
+    schema_info: Dict[str, Any],
+    db_path: str = DEFAULT_DB_PATH,
+    max_tables: int = SCHEMA_PROMPT_TABLES,
+    max_columns: int = SCHEMA_PROMPT_COLUMNS
+) -> Dict[str, Any]:
+    """
+    Return the part of the schema relevant to a question, for the LLM prompt.
+
+    Args:
+        question: Natural language query
+        schema_info: Full schema, as from get_database_schema
+        db_path: Path of the SQLite database, read for sample values
+        max_tables: Most tables to describe
+        max_columns: Most columns to describe per table
+
+    Returns:
+        Schema dict of the same shape with the selected tables and columns in
+        their original order, or schema_info itself when it is used in full
+    """
+    tables = schema_info.get('tables', {})
+    widest = max((len(table_info['columns']) for table_info in tables.values()), default=0)
+    if len(tables) <= max_tables and widest <= max_columns:
+        return schema_info
+
+    index = get_schema_index(db_path)
+    index.refresh(schema_info)
+    terms = question_signature(question).content
+    ranking = index.rank(terms)
+
+    # Low confidence: nothing matches, or the cut would be arbitrary
+    if not ranking or (len(ranking) > max_tables and ranking[max_tables][1] >= ranking[0][1]):
+        return schema_info
+
+    selected = [name for name, _ in ranking[:max_tables]]
+    for table_name in list(selected):
+        for referenced in _referenced_tables(tables[table_name]['columns'], tables):
+            if len(selected) < max_tables and referenced not in selected:
+                selected.append(referenced)
+
+    pruned = {}
+    for table_name, table_info in tables.items():
+        if table_name not in selected:
+            continue
+        columns = table_info['columns']
+        if len(columns) > max_columns:
+            keep = _pick_columns(list(columns), index.matching_columns(table_name, terms), max_columns)
+            columns = {column: columns[column] for column in columns if column in keep}
+        pruned[table_name] = {**table_info, 'columns': columns}
+    return {**schema_info, 'tables': pruned}
+
+
+def _referenced_tables(columns: Dict[str, str], tables: Dict[str, Any]) -> List[str]:
+    """Tables that *_id columns name, e.g. customers for customer_id."""
+    by_stem = {stem(name.lower()): name for name in tables}
+    referenced = []
+    for column in columns:
+        lowered = column.lower()
+        if lowered.endswith("_id"):
+            name = by_stem.get(stem(lowered[:-3]))
+            if name is not None:
+                referenced.append(name)
+    return referenced
+
+
+def _pick_columns(columns: List[str], matching: List[str], limit: int) -> Set[str]:
+    """Matching columns first, then key columns, then the rest in table order."""
+    keys = [column for column in columns if column.lower() == "id" or column.lower().endswith("_id")]
+    keep: Dict[str, None] = {}
+    for column in matching + keys + columns:
+        if len(keep) == limit:
+            break
+        keep[column] = None
+    return set(keep)
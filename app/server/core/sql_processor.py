@@ -1,69 +1,183 @@
 import sqlite3
-from typing import Dict, Any
+from functools import partial
+from typing import Dict, Any, Iterator, Optional
 from .sql_security import (
     execute_query_safely, 
     validate_sql_query, 
+    is_internal_table,
+    user_query_authorizer,
     SQLSecurityError
 )
+from .db_pool import read_connection
+from .export_utils import Encoder, encode_arrow_ipc, scan_column_types, stream_cursor
+from .result_cache import current_version, lookup_result, normalize_sql, store_result, track_reads
+from .schema_catalog import cached_schema
+from .table_stats import read_row_counts
+from .constants import ARROW_TYPE_SAMPLE_ROWS, QUERY_MAX_ROWS, QUERY_RESULT_FORMATS
 
-def execute_sql_safely(sql_query: str) -> Dict[str, Any]:
+def execute_sql_safely(
+    sql_query: str,
+    page_size: Optional[int] = None,
+    offset: int = 0,
+    result_format: str = "records"
+) -> Dict[str, Any]:
     """
     Execute SQL query with safety checks
+    
+    Only one page of the result is read from the cursor, so a query without a
+    LIMIT never pulls its whole result into memory. No more than
+    QUERY_MAX_ROWS rows of a result can be fetched across all pages.
+    
+    Pages are cached (see core.result_cache) until a table the query read is
+    written, so repeated queries skip SQLite entirely.
+    
+    Args:
+        sql_query: SQL to run
+        page_size: Rows to return (defaults to, and is capped by, QUERY_MAX_ROWS)
+        offset: Result rows to skip, e.g. those delivered on earlier pages
+        result_format: "records" returns one dict per row in results; "rows"
+            (one list per row) and "columns" (one list per column) are built
+            from the cursor tuples and returned in rows / column_data
+        
+    Returns:
+        Dict with results, columns and error, plus has_more when further rows
+        can be fetched and truncated when the result was cut off at QUERY_MAX_ROWS
     """
     try:
+        if result_format not in QUERY_RESULT_FORMATS:
+            raise ValueError(
+                f"Invalid result format '{result_format}'. Expected one of: {', '.join(QUERY_RESULT_FORMATS)}"
+            )
+        
         # Validate the SQL query for dangerous operations
         validate_sql_query(sql_query)
         
-        # Connect to database
-        conn = sqlite3.connect("db/database.db")
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        
-        # Execute query safely
-        # Note: Since this is a user-provided complete SQL query,
-        # we can't use parameterization. The validate_sql_query
-        # function provides protection against dangerous operations.
-        cursor = conn.cursor()
-        cursor.execute(sql_query)
-        
-        # Get results
-        rows = cursor.fetchall()
-        
-        # Convert rows to dictionaries
-        results = []
-        columns = []
+        limit = max(0, min(page_size or QUERY_MAX_ROWS, QUERY_MAX_ROWS - offset))
         
-        if rows:
-            columns = list(rows[0].keys())
-            for row in rows:
-                results.append(dict(row))
+        # Repeat queries on unchanged tables are answered from memory
+        cache_key = (normalize_sql(sql_query), limit, offset, result_format)
+        cached = lookup_result(cache_key)
+        if cached is not None:
+            return cached
+        version = current_version()
         
-        conn.close()
+        # Borrow a pooled connection
+        with read_connection() as conn:
+            # Execute query safely
+            # Note: Since this is a user-provided complete SQL query,
+            # we can't use parameterization. The validate_sql_query
+            # function provides protection against dangerous operations.
+            cursor = conn.cursor()
+            if result_format == "records":
+                cursor.row_factory = sqlite3.Row  # Enable column access by name
+            with track_reads(conn) as reads:
+                cursor.execute(sql_query)
+            
+            # Skip rows of earlier pages, then read one row beyond the page
+            # to learn whether more follow
+            skip_rows(cursor, offset)
+            rows = cursor.fetchmany(limit + 1)
         
-        return {
-            'results': results,
-            'columns': columns,
+        more_rows = len(rows) > limit
+        rows = rows[:limit]
+        at_cap = offset + limit >= QUERY_MAX_ROWS
+        page = {
+            'has_more': more_rows and not at_cap,
+            'truncated': more_rows and at_cap,
             'error': None
         }
+        
+        if result_format != "records":
+            # Compact layouts: column names once, values straight from the tuples
+            columns = [description[0] for description in cursor.description or ()]
+            if result_format == "rows":
+                page['rows'] = rows
+            else:
+                page['column_data'] = [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+            result = {'results': [], 'columns': columns, **page}
+        else:
+            # Convert rows to dictionaries
+            results = []
+            columns = []
+            
+            if rows:
+                columns = list(rows[0].keys())
+                for row in rows:
+                    results.append(dict(row))
+            
+            result = {'results': results, 'columns': columns, **page}
+        
+        store_result(cache_key, result, sql_query, reads, version)
+        return result
     
     except SQLSecurityError as e:
         return {
             'results': [],
             'columns': [],
+            'has_more': False,
+            'truncated': False,
             'error': f"Security error: {str(e)}"
         }
     except Exception as e:
         return {
             'results': [],
             'columns': [],
+            'has_more': False,
+            'truncated': False,
             'error': str(e)
         }
 
-def get_database_schema() -> Dict[str, Any]:
+def skip_rows(cursor: sqlite3.Cursor, count: int, chunk_rows: int = 10_000) -> None:
     """
-    Get complete database schema information
+    Advance a cursor past count rows without keeping them
     """
-    try:
-        conn = sqlite3.connect("db/database.db")
+    while count > 0:
+        skipped = len(cursor.fetchmany(min(count, chunk_rows)))
+        if not skipped:
+            break
+        count -= skipped
+
+def stream_sql_safely(
+    sql_query: str,
+    encode: Encoder,
+    max_rows: Optional[int] = QUERY_MAX_ROWS
+) -> Iterator[bytes]:
+    """
+    Execute SQL query with safety checks and encode its result as a stream
+    
+    A generator: the query only runs once the first chunk is requested, and
+    the pooled connection is held until the stream is exhausted or closed.
+    Memory use is bounded by one batch of rows, whatever the result size.
+    
+    Arrow streams need every column's type before the first batch, so for
+    them the leading ARROW_TYPE_SAMPLE_ROWS rows are scanned inside SQLite
+    beforehand (see scan_column_types); a later value that does not fit its
+    column ends the stream with a notice (see encode_arrow_ipc). A stream cut
+    at max_rows also ends with a notice.
+    
+    Args:
+        sql_query: SQL to run
+        encode: Encoder from core.export_utils, e.g. encode_ndjson
+        max_rows: Stop after this many rows (defaults to QUERY_MAX_ROWS; None streams every row)
+        
+    Raises:
+        SQLSecurityError: If the query fails validation
+        sqlite3.Error: If the query cannot be executed
+    """
+    validate_sql_query(sql_query)
+    with read_connection() as conn, user_query_authorizer(conn):
+        cursor = conn.execute(sql_query)
+        if encode is encode_arrow_ipc:
+            column_count = len(cursor.description or ())
+            sample = ARROW_TYPE_SAMPLE_ROWS if max_rows is None else min(max_rows, ARROW_TYPE_SAMPLE_ROWS)
+            encode = partial(encode_arrow_ipc, column_types=scan_column_types(conn, sql_query, column_count, sample))
+        yield from stream_cursor(cursor, encode, max_rows)
+
+def load_database_schema() -> Dict[str, Any]:
+    """
+    Read every user table's columns and row count from the database
+    """
+    with read_connection() as conn:
         cursor = conn.cursor()
         
         # Get all tables safely
@@ -72,13 +186,10 @@ def get_database_schema() -> Dict[str, Any]:
         
         schema = {'tables': {}}
         
-        for table in tables:
-            table_name = table[0]
-            
-            # Skip system tables
-            if table_name.startswith('sqlite_'):
-                continue
-            
+        # Skip system and internal bookkeeping tables
+        table_names = [table[0] for table in tables if not is_internal_table(table[0])]
+        
+        for table_name in table_names:
             try:
                 # Get columns for each table using safe query execution
                 cursor_info = execute_query_safely(
@@ -92,26 +203,30 @@ def get_database_schema() -> Dict[str, Any]:
                 for col in columns_info:
                     columns[col[1]] = col[2]  # column_name: data_type
                 
-                # Get row count safely
-                cursor_count = execute_query_safely(
-                    conn,
-                    "SELECT COUNT(*) FROM {table}",
-                    identifier_params={'table': table_name}
-                )
-                row_count = cursor_count.fetchone()[0]
-                
                 schema['tables'][table_name] = {
-                    'columns': columns,
-                    'row_count': row_count
+                    'columns': columns
                 }
                 
             except SQLSecurityError:
                 # Skip tables with invalid names
                 continue
         
-        conn.close()
-        
-        return schema
+        # Row counts maintained by ingest instead of COUNT(*) scans
+        row_counts = read_row_counts(conn, schema['tables'])
+        for table_name, table_info in schema['tables'].items():
+            table_info['row_count'] = row_counts[table_name]
+    
+    return schema
+
+def get_database_schema() -> Dict[str, Any]:
+    """
+    Get complete database schema information
+    
+    Served from the in-process schema catalog, which reloads it only after
+    the database has changed.
+    """
+    try:
+        return cached_schema(load_database_schema)
         
     except Exception as e:
         return {'tables': {}, 'error': str(e)}
\ No newline at end of file
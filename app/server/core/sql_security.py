@@ -6,7 +6,10 @@ and proper escaping mechanisms.
 
 import re
 import sqlite3
-from typing import Any, List, Tuple, Optional, Union
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Tuple, Optional, Union
+
+from .constants import INTERNAL_TABLE_PREFIX
 
 
 class SQLSecurityError(Exception):
@@ -91,6 +94,28 @@ def escape_identifier(identifier: str) -> str:
     return f"[{escaped}]"
 
 
+def quote_identifier(identifier: str) -> str:
+    """
+    Quote an arbitrary identifier with SQLite double-quote escaping.
+
+    Column names derived from uploaded files (CSV headers, flattened JSON keys)
+    may legitimately contain characters that validate_identifier rejects, so
+    they cannot go through escape_identifier. Doubling embedded quotes makes
+    any string a single, inert identifier token.
+
+    Args:
+        identifier: The identifier to quote
+
+    Returns:
+        str: The quoted identifier
+    """
+    if not identifier:
+        raise SQLSecurityError("Empty identifier name is not allowed")
+
+    escaped = identifier.replace('"', '""')
+    return f'"{escaped}"'
+
+
 def execute_query_safely(
     conn: sqlite3.Connection,
     query: str,
@@ -207,6 +232,45 @@ def validate_sql_query(query: str) -> bool:
     return True
 
 
+def authorize_user_query(
+    action: int,
+    arg1: Optional[str],
+    arg2: Optional[str],
+    db_name: Optional[str],
+    source: Optional[str]
+) -> int:
+    """
+    SQLite authorizer callback for SQL that comes from outside the application.
+
+    validate_sql_query only looks at the text, so the statement is checked
+    again as SQLite prepares it: attaching or detaching databases, pragmas
+    and reads of the application's bookkeeping tables are denied. The SQLite
+    schema tables stay readable, so questions about the tables still work.
+
+    Returns:
+        int: sqlite3.SQLITE_DENY for forbidden actions, else sqlite3.SQLITE_OK
+    """
+    if action in (sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH, sqlite3.SQLITE_PRAGMA):
+        return sqlite3.SQLITE_DENY
+    if action == sqlite3.SQLITE_READ and arg1 and arg1.startswith(INTERNAL_TABLE_PREFIX):
+        return sqlite3.SQLITE_DENY
+    return sqlite3.SQLITE_OK
+
+
+@contextmanager
+def user_query_authorizer(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Check statements prepared on conn inside the with block with authorize_user_query.
+
+    A denied statement fails to prepare with sqlite3.DatabaseError ("not authorized").
+    """
+    conn.set_authorizer(authorize_user_query)
+    try:
+        yield conn
+    finally:
+        conn.set_authorizer(None)
+
+
 def sanitize_value_for_like(value: str) -> str:
     """
     Sanitize a value for use in a LIKE clause by escaping special characters.
@@ -267,7 +331,20 @@ def get_safe_table_list(conn: sqlite3.Connection) -> List[str]:
     cursor.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
     )
-    return [row[0] for row in cursor.fetchall()]
+    return [row[0] for row in cursor.fetchall() if not is_internal_table(row[0])]
+
+
+def is_internal_table(table_name: str) -> bool:
+    """
+    Check whether a table is one of the application's bookkeeping tables.
+
+    Args:
+        table_name: Name of the table to check
+
+    Returns:
+        bool: True for SQLite and application-internal tables
+    """
+    return table_name.startswith("sqlite_") or table_name.startswith(INTERNAL_TABLE_PREFIX)
 
 
 def check_table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
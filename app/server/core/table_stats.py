@@ -0,0 +1,110 @@
+"""
+Maintained row counts of uploaded tables.
+
+SELECT COUNT(*) walks a whole table, so listing the schema of a large
+database used to take as long as reading all of it. Instead every write path
+of the application records the row count of the tables it changes, inside
+the same transaction, in an internal statistics table.
+
+Each entry also stores the table's MAX(rowid), which SQLite answers from the
+end of the table's b-tree without a scan. A count is only trusted while that
+value still matches, so rows appended by anything outside the application
+(another process, the sqlite3 shell) are noticed and the table is counted
+again. Tables without an entry are counted as well.
+"""
+
+import sqlite3
+from typing import Dict, Iterable, Optional
+
+from .constants import INTERNAL_TABLE_PREFIX
+from .sql_security import execute_query_safely
+
+STATS_TABLE = f"{INTERNAL_TABLE_PREFIX}table_stats"
+
+
+def ensure_stats_table(conn: sqlite3.Connection) -> None:
+    """Create the statistics table if it does not exist yet."""
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS "{STATS_TABLE}" ('
+        "table_name TEXT PRIMARY KEY, row_count INTEGER NOT NULL, max_rowid INTEGER)"
+    )
+
+
+def count_rows(conn: sqlite3.Connection, table_name: str) -> int:
+    """Count a table's rows with a full scan."""
+    return execute_query_safely(
+        conn,
+        "SELECT COUNT(*) FROM {table}",
+        identifier_params={'table': table_name}
+    ).fetchone()[0]
+
+
+def max_rowid(conn: sqlite3.Connection, table_name: str) -> Optional[int]:
+    """Return the largest rowid of a table, or None when it is empty."""
+    return execute_query_safely(
+        conn,
+        "SELECT MAX(rowid) FROM {table}",
+        identifier_params={'table': table_name}
+    ).fetchone()[0]
+
+
+def record_row_count(conn: sqlite3.Connection, table_name: str, row_count: int) -> None:
+    """
+    Store the row count of a table.
+    
+    Runs on the caller's connection without committing, so the count becomes
+    part of the transaction that changed the table.
+    """
+    ensure_stats_table(conn)
+    conn.execute(
+        f'INSERT OR REPLACE INTO "{STATS_TABLE}" (table_name, row_count, max_rowid) VALUES (?, ?, ?)',
+        (table_name, row_count, max_rowid(conn, table_name))
+    )
+
+
+def forget_table(conn: sqlite3.Connection, table_name: str) -> None:
+    """Remove the statistics of a dropped table, without committing."""
+    ensure_stats_table(conn)
+    conn.execute(f'DELETE FROM "{STATS_TABLE}" WHERE table_name = ?', (table_name,))
+
+
+def read_row_counts(conn: sqlite3.Connection, table_names: Iterable[str]) -> Dict[str, int]:
+    """
+    Return the row counts of the given tables.
+    
+    Recorded counts are used while the table's MAX(rowid) is unchanged;
+    other tables are counted with a scan. Nothing is written, so this works
+    on read connections.
+    """
+    try:
+        recorded = {
+            name: (row_count, recorded_max)
+            for name, row_count, recorded_max in conn.execute(
+                f'SELECT table_name, row_count, max_rowid FROM "{STATS_TABLE}"'
+            )
+        }
+    except sqlite3.OperationalError:
+        # No counts have been recorded in this database yet
+        recorded = {}
+    
+    counts = {}
+    for table_name in table_names:
+        entry = recorded.get(table_name)
+        if entry is not None and entry[1] == _max_rowid_or_none(conn, table_name):
+            counts[table_name] = entry[0]
+        else:
+            counts[table_name] = count_rows(conn, table_name)
+    return counts
+
+
+def _max_rowid_or_none(conn: sqlite3.Connection, table_name: str) -> Optional[int]:
+    try:
+        return max_rowid(conn, table_name)
+    except sqlite3.OperationalError:
+        # WITHOUT ROWID tables created outside the application
+        return None
+
+
+def read_row_count(conn: sqlite3.Connection, table_name: str) -> int:
+    """Return the row count of one table (see read_row_counts)."""
+    return read_row_counts(conn, [table_name])[table_name]
@@ -0,0 +1,402 @@
+"""
+Streaming SQLite table writer used by the upload converters.
+
+Rows are written in batches with executemany inside a single transaction, so
+an upload is either written completely or not at all, and memory is bounded by
+the batch size rather than by the size of the uploaded file.
+
+While a load is running the connection is switched to bulk-load settings
+(WAL journal, relaxed fsync, large page cache, in-memory temp storage). Indexes
+of a replaced table are rebuilt once after the rows are in, and the previous
+connection settings are restored when the transaction ends.
+"""
+
+import sqlite3
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from .constants import BULK_LOAD_CACHE_SIZE_KIB, BULK_LOAD_SYNCHRONOUS, NESTED_DELIMITER, UPLOAD_MODES
+from .sql_security import execute_query_safely, quote_identifier
+from .table_stats import forget_table, max_rowid, read_row_count, record_row_count
+
+# Per-connection settings changed for the duration of a load and restored afterwards
+RESTORED_PRAGMAS = ("synchronous", "cache_size", "temp_store")
+
+
+def child_table_names(conn: sqlite3.Connection, table_name: str) -> List[str]:
+    """
+    Return the existing child tables of a table: those named {table}__{array}
+    that hold parent_rowid and item_index columns, as child_writer loads them.
+    """
+    prefix = f"{table_name}{NESTED_DELIMITER}"
+    candidates = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND substr(name, 1, ?) = ?",
+            (len(prefix), prefix)
+        )
+    ]
+    return [name for name in candidates if _is_child_table(conn, name)]
+
+
+def parent_table_names(conn: sqlite3.Connection, table_name: str) -> List[str]:
+    """
+    Return the names of the tables a child table hangs off, nearest last:
+    every {parent} that table_name starts with followed by NESTED_DELIMITER.
+    Empty if table_name is not a child table.
+    """
+    if not _is_child_table(conn, table_name):
+        return []
+    parts = table_name.split(NESTED_DELIMITER)
+    return [NESTED_DELIMITER.join(parts[:end]) for end in range(1, len(parts))]
+
+
+def _is_child_table(conn: sqlite3.Connection, table_name: str) -> bool:
+    cursor_info = execute_query_safely(conn, "PRAGMA table_info({table})", identifier_params={'table': table_name})
+    columns = {col[1] for col in cursor_info.fetchall()}
+    return {"parent_rowid", "item_index"} <= columns
+
+
+class TableWriter:
+    """
+    Write rows into a single SQLite table within one transaction.
+
+    Modes:
+        replace: drop any existing table and load the rows into a new one
+        append: add the rows to the existing table, widening it as needed
+        upsert: insert the rows, updating existing rows with the same key_columns
+
+    Usage:
+        writer = TableWriter(conn, "users")
+        writer.begin()
+        writer.add_columns({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "John"), (2, "Jane")])
+        writer.commit()
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        table_name: str,
+        mode: str = "replace",
+        key_columns: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ):
+        if mode not in UPLOAD_MODES:
+            raise ValueError(f"Unsupported upload mode '{mode}'. Use one of: {', '.join(UPLOAD_MODES)}")
+        if mode == "upsert" and not key_columns:
+            raise ValueError("Upsert mode requires at least one key column")
+
+        self.conn = conn
+        self.table_name = table_name
+        self.mode = mode
+        self.key_columns = list(key_columns or [])
+        # Layout of the rows passed to write_rows
+        self.columns: List[str] = []
+        # Lower-cased names of the columns the table currently has
+        self._table_columns: Set[str] = set()
+        self.rows_written = 0
+        # Called with the running total of rows written after each batch
+        self.progress_callback = progress_callback
+        self._insert_sql = None
+        self._saved_pragmas: Dict[str, Any] = {}
+        self._deferred_indexes: List[str] = []
+        # Rowid the next written row gets when rowids are assigned explicitly
+        self.first_rowid = 1
+        self._explicit_rowids = False
+        self._children: List["TableWriter"] = []
+        # Child tables of a replaced table, dropped whether or not the new data fills them again
+        self._dropped_children: List[str] = []
+        # Rows the table held before this load (see table_stats)
+        self._previous_row_count = 0
+
+    def begin(self) -> None:
+        """
+        Switch to bulk-load settings and open the ingest transaction.
+
+        In replace mode any previous table of the same name is dropped along
+        with its child tables; its indexes are remembered and rebuilt by
+        commit(). In append and upsert mode the existing table, if any, is kept
+        and extended.
+        """
+        self._apply_bulk_load_pragmas()
+        self.conn.execute("BEGIN")
+        if self.mode == "replace":
+            # Rows of an old child table would point at unrelated new parent rows
+            self._dropped_children = child_table_names(self.conn, self.table_name)
+            for name in self._dropped_children:
+                execute_query_safely(
+                    self.conn,
+                    "DROP TABLE IF EXISTS {table}",
+                    identifier_params={'table': name},
+                    allow_ddl=True
+                )
+                forget_table(self.conn, name)
+        self._prepare_table()
+
+    @property
+    def table_names(self) -> List[str]:
+        """Names of the tables this writer changes: its own, its child tables and the child tables it dropped."""
+        children = [child.table_name for child in self._children]
+        return [self.table_name, *children, *(name for name in self._dropped_children if name not in children)]
+
+    def child_writer(self, table_name: str) -> "TableWriter":
+        """
+        Return a writer for a related table loaded in this writer's transaction.
+
+        The child table is replaced or appended to along with this one and is
+        committed or rolled back together with it.
+
+        Args:
+            table_name: Name of the child table
+        """
+        mode = "replace" if self.mode == "replace" else "append"
+        child = TableWriter(self.conn, table_name, mode)
+        child._prepare_table()
+        self._children.append(child)
+        return child
+
+    def assign_rowids(self) -> None:
+        """
+        Insert rows with consecutive explicit rowids starting at first_rowid.
+
+        Callers can then work out the rowid of every row before it is written,
+        e.g. to reference it from child tables. Not available for upserts,
+        where an updated row keeps its existing rowid.
+        """
+        if self.mode == "upsert":
+            raise ValueError("Explicit row ids are not supported in upsert mode")
+        self._explicit_rowids = True
+        self._insert_sql = None
+
+    def _prepare_table(self) -> None:
+        """Drop or inspect the target table at the start of the transaction."""
+        if self.mode == "replace":
+            # The unique index an upsert added belongs to that upsert's keys,
+            # which replaced data need not be unique on
+            key_index_prefix = self._key_index_name([])
+            self._deferred_indexes = [
+                sql for name, sql in self.conn.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                    (self.table_name,)
+                )
+                if not name.startswith(key_index_prefix)
+            ]
+            execute_query_safely(
+                self.conn,
+                "DROP TABLE IF EXISTS {table}",
+                identifier_params={'table': self.table_name},
+                allow_ddl=True
+            )
+            return
+
+        cursor_info = execute_query_safely(
+            self.conn,
+            "PRAGMA table_info({table})",
+            identifier_params={'table': self.table_name}
+        )
+        self._table_columns = {col[1].lower() for col in cursor_info.fetchall()}
+        if not self._table_columns:
+            return
+
+        self.first_rowid = execute_query_safely(
+            self.conn,
+            "SELECT COALESCE(MAX(rowid), 0) + 1 FROM {table}",
+            identifier_params={'table': self.table_name}
+        ).fetchone()[0]
+        self._previous_row_count = read_row_count(self.conn, self.table_name)
+        if self.mode == "upsert":
+            self._ensure_key_index()
+
+    def create_table(self, column_types: Dict[str, str]) -> None:
+        """
+        Create the target table.
+
+        Args:
+            column_types: Ordered mapping of column name to SQLite type
+        """
+        if not column_types:
+            raise ValueError("Cannot create a table without columns")
+
+        column_defs = ", ".join(
+            f"{quote_identifier(name)} {col_type}" for name, col_type in column_types.items()
+        )
+        execute_query_safely(
+            self.conn,
+            f"CREATE TABLE {{table}} ({column_defs})",
+            identifier_params={'table': self.table_name},
+            allow_ddl=True
+        )
+        self.columns = list(column_types)
+        self._table_columns = {name.lower() for name in column_types}
+        self._insert_sql = None
+
+        if self.mode == "upsert":
+            self._ensure_key_index()
+
+    def add_columns(self, column_types: Dict[str, str]) -> None:
+        """
+        Extend the row layout, creating or widening the table as needed.
+
+        Columns the table does not have yet are added with ALTER TABLE ADD
+        COLUMN; rows already in the table get NULL in them. Rows not yet
+        written must be flushed with write_rows before the layout changes.
+
+        Args:
+            column_types: Ordered mapping of new column name to SQLite type
+        """
+        if not column_types:
+            return
+
+        if not self._table_columns:
+            self.create_table(column_types)
+            return
+
+        for name, col_type in column_types.items():
+            if name.lower() not in self._table_columns:
+                execute_query_safely(
+                    self.conn,
+                    f"ALTER TABLE {{table}} ADD COLUMN {quote_identifier(name)} {col_type}",
+                    identifier_params={'table': self.table_name},
+                    allow_ddl=True
+                )
+                self._table_columns.add(name.lower())
+            self.columns.append(name)
+        self._insert_sql = None
+
+    def write_rows(self, rows: List[Sequence[Any]]) -> None:
+        """
+        Write a batch of rows with one prepared executemany call.
+
+        Args:
+            rows: Row tuples ordered like self.columns
+        """
+        if not rows:
+            return
+
+        if self._insert_sql is None:
+            self._insert_sql = self._build_insert_sql()
+
+        if self._explicit_rowids:
+            first = self.first_rowid + self.rows_written
+            rows = [(rowid, *row) for rowid, row in enumerate(rows, first)]
+
+        self.conn.executemany(self._insert_sql, rows)
+        self.rows_written += len(rows)
+        if self.progress_callback:
+            self.progress_callback(self.rows_written)
+
+    def _build_insert_sql(self) -> str:
+        """Build the INSERT (or upsert) statement for the current row layout."""
+        columns = (["rowid"] if self._explicit_rowids else []) + self.columns
+        column_list = ", ".join(quote_identifier(name) for name in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = (
+            f"INSERT INTO {quote_identifier(self.table_name)} "
+            f"({column_list}) VALUES ({placeholders})"
+        )
+
+        if self.mode == "upsert":
+            layout = {name.lower() for name in self.columns}
+            missing = [key for key in self.key_columns if key.lower() not in layout]
+            if missing:
+                raise ValueError(f"Key column(s) not found in upload: {', '.join(missing)}")
+
+            keys = {key.lower() for key in self.key_columns}
+            key_list = ", ".join(quote_identifier(key) for key in self.key_columns)
+            updates = ", ".join(
+                f"{quote_identifier(name)} = excluded.{quote_identifier(name)}"
+                for name in self.columns if name.lower() not in keys
+            )
+            sql += f" ON CONFLICT ({key_list}) " + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING")
+
+        return sql
+
+    def _ensure_key_index(self) -> None:
+        """Create the unique index on the key columns that upserts conflict on."""
+        missing = [key for key in self.key_columns if key.lower() not in self._table_columns]
+        if missing:
+            raise ValueError(f"Key column(s) not found in table: {', '.join(missing)}")
+
+        index_name = self._key_index_name(self.key_columns)
+        key_list = ", ".join(quote_identifier(key) for key in self.key_columns)
+        try:
+            self.conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {quote_identifier(index_name)} "
+                f"ON {quote_identifier(self.table_name)} ({key_list})"
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(
+                f"Existing rows in '{self.table_name}' are not unique on key column(s) "
+                f"{', '.join(self.key_columns)}"
+            )
+
+    def _key_index_name(self, key_columns: Sequence[str]) -> str:
+        return f"ux_{self.table_name}__{'__'.join(key_columns)}"
+
+    def commit(self, before_commit: Optional[Callable[[sqlite3.Connection], None]] = None) -> None:
+        """
+        Build deferred indexes, record row counts, commit the ingest transaction
+        and restore settings.
+
+        Args:
+            before_commit: Called with the connection right before the commit,
+                so its writes become part of the ingest transaction
+        """
+        for writer in [self, *self._children]:
+            writer._build_deferred_indexes()
+            writer._record_row_count()
+
+        if before_commit is not None:
+            before_commit(self.conn)
+        self.conn.commit()
+        self._restore_pragmas()
+
+    def _record_row_count(self) -> None:
+        """Store the table's new row count without scanning it where possible."""
+        if not self._table_columns:
+            # Nothing was loaded, so a replaced table no longer exists
+            forget_table(self.conn, self.table_name)
+        elif self.mode == "upsert":
+            # Merged rows keep their rowid and inserted ones are numbered on
+            # from the old largest rowid, so the rowid growth counts the inserts
+            inserted = (max_rowid(self.conn, self.table_name) or 0) - (self.first_rowid - 1)
+            record_row_count(self.conn, self.table_name, self._previous_row_count + inserted)
+        else:
+            record_row_count(self.conn, self.table_name, self._previous_row_count + self.rows_written)
+
+    def _build_deferred_indexes(self) -> None:
+        """Recreate the indexes of a replaced table now that its rows are in."""
+        for index_sql in self._deferred_indexes:
+            try:
+                self.conn.execute(index_sql)
+            except sqlite3.OperationalError:
+                # The indexed columns no longer exist in the new data
+                continue
+            except sqlite3.IntegrityError:
+                # A unique index the new data is not unique on
+                continue
+        self._deferred_indexes = []
+
+    def rollback(self) -> None:
+        """Abandon the ingest transaction, leaving any previous table untouched."""
+        if self.conn.in_transaction:
+            self.conn.rollback()
+        self._restore_pragmas()
+
+    def _apply_bulk_load_pragmas(self) -> None:
+        """Remember the current connection settings and switch to bulk-load ones."""
+        self._saved_pragmas = {
+            name: self.conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in RESTORED_PRAGMAS
+        }
+
+        # WAL is persistent and safe to keep; it can only be set outside a transaction
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={BULK_LOAD_SYNCHRONOUS}")
+        self.conn.execute(f"PRAGMA cache_size={-BULK_LOAD_CACHE_SIZE_KIB}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
+    def _restore_pragmas(self) -> None:
+        """Put back the settings saved by _apply_bulk_load_pragmas."""
+        for name, value in self._saved_pragmas.items():
+            self.conn.execute(f"PRAGMA {name}={int(value)}")
+        self._saved_pragmas = {}
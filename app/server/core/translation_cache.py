@@ -0,0 +1,195 @@
+"""
+Persistent cache of natural language to SQL translations.
+
+Every question costs an LLM round trip of several seconds, although users
+and dashboards ask the same questions again and again. Generated SQL is
+stored in an internal table of the database, keyed by the normalized
+question, so it survives restarts and repeat questions skip the LLM.
+
+A translation is only valid for the schema it was generated against. Each
+entry stores a fingerprint of every table its SQL mentions: a hash of that
+table's part of format_schema_for_prompt, without the row count, so loading
+more rows keeps translations while adding, removing or retyping columns does
+not. An entry is used only while all of its tables still exist with the same
+fingerprint, so a schema change invalidates exactly the translations that
+touch the changed tables.
+
+Questions without a stored translation are looked up in a similarity index
+(see core.question_index) over the stored questions, so a rewording of an
+earlier question reuses its SQL too. The index of each database is built
+from the cache table on first use and extended as translations are stored.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from .constants import INTERNAL_TABLE_PREFIX, TRANSLATION_CACHE_ENTRIES
+from .db_pool import DEFAULT_DB_PATH, read_connection, write_connection
+from .llm_processor import format_table_for_prompt
+from .question_index import QuestionIndex, same_intent
+
+CACHE_TABLE = f"{INTERNAL_TABLE_PREFIX}translations"
+
+# Identifiers of a SQL statement: quoted forms first, then bare words
+_IDENTIFIER_RE = re.compile(r'"((?:[^"]|"")*)"|`([^`]*)`|\[([^\]]*)\]|([A-Za-z_][A-Za-z0-9_$]*)')
+
+# Trailing characters that do not change what a question asks
+_QUESTION_TRAILER = " \t\n?.!"
+
+_indexes: Dict[str, QuestionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def normalize_question(question: str) -> str:
+    """Canonical form of a question: lower case, single spaces, no trailing punctuation."""
+    return " ".join(question.lower().split()).strip(_QUESTION_TRAILER)
+
+
+def table_fingerprint(table_name: str, table_info: Dict[str, Any]) -> str:
+    """Hash of a table's columns as the LLM prompt presents them."""
+    description = "\n".join(format_table_for_prompt(table_name, {'columns': table_info['columns']}))
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+def tables_in_sql(sql: str, table_names: Iterable[str]) -> Dict[str, str]:
+    """
+    Return the schema tables a SQL statement mentions, by lower-cased name.
+
+    Matches identifiers against the known table names, case-insensitively as
+    SQLite does. A column or literal that happens to share a table's name
+    only adds a dependency, which never serves a stale translation.
+    """
+    by_lower = {name.lower(): name for name in table_names}
+    mentioned = {}
+    for match in _IDENTIFIER_RE.finditer(sql):
+        identifier = next(group for group in match.groups() if group is not None).replace('""', '"')
+        name = by_lower.get(identifier.lower())
+        if name is not None:
+            mentioned[name.lower()] = name
+    return mentioned
+
+
+def ensure_cache_table(conn: sqlite3.Connection) -> None:
+    """Create the cache table if it does not exist yet."""
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS "{CACHE_TABLE}" ('
+        "question TEXT PRIMARY KEY, sql TEXT NOT NULL, table_fingerprints TEXT NOT NULL)"
+    )
+
+
+def get_question_index(db_path: str = DEFAULT_DB_PATH) -> QuestionIndex:
+    """Return the similarity index of a database's stored questions, building it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            with read_connection(db_path) as conn:
+                try:
+                    questions = [row[0] for row in conn.execute(f'SELECT question FROM "{CACHE_TABLE}"')]
+                except sqlite3.OperationalError:
+                    # No translation has been recorded yet
+                    questions = []
+            index = _indexes[db_path] = QuestionIndex(questions)
+        return index
+
+
+def lookup_translation(
+    question: str,
+    schema_info: Dict[str, Any],
+    db_path: str = DEFAULT_DB_PATH,
+    similar: bool = True
+) -> Optional[str]:
+    """
+    Return the stored SQL for a question, or a similar one, if it still fits the schema.
+
+    Args:
+        question: Natural language query
+        schema_info: Current schema, as from get_database_schema
+        db_path: Path of the SQLite database
+        similar: Also consider differently worded questions from the similarity index
+
+    Returns:
+        The SQL, or None if no matching question was answered against the current schema
+    """
+    key = normalize_question(question)
+    candidates = [key]
+    if similar:
+        index = get_question_index(db_path)
+        candidates += [
+            match for match, _ in index.similar(key)
+            if match != key and same_intent(key, match)
+        ]
+
+    with read_connection(db_path) as conn:
+        for candidate in candidates:
+            try:
+                row = conn.execute(
+                    f'SELECT sql, table_fingerprints FROM "{CACHE_TABLE}" WHERE question = ?',
+                    (candidate,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # No translation has been recorded yet
+                return None
+            if row is None:
+                if candidate != key:
+                    # Pruned from the table since the index was built
+                    index.remove(candidate)
+                continue
+            if _fits_schema(json.loads(row[1]), schema_info):
+                return row[0]
+    return None
+
+
+def _fits_schema(fingerprints: Dict[str, str], schema_info: Dict[str, Any]) -> bool:
+    """Check that every table a translation used still exists with the same columns."""
+    tables = schema_info.get('tables', {})
+    return all(
+        table_name in tables and table_fingerprint(table_name, tables[table_name]) == fingerprint
+        for table_name, fingerprint in fingerprints.items()
+    )
+
+
+def record_translation(
+    question: str,
+    schema_info: Dict[str, Any],
+    sql: str,
+    db_path: str = DEFAULT_DB_PATH
+) -> None:
+    """
+    Store the SQL generated for a question, pruning the oldest entries,
+    and add the question to the similarity index.
+
+    Only record SQL that passed validation and ran, so a bad generation is
+    not repeated.
+
+    Args:
+        question: Natural language query
+        schema_info: Schema the SQL was generated against
+        sql: Generated SQL
+        db_path: Path of the SQLite database
+        
+    Raises:
+        PoolTimeoutError: If another write, e.g. an ingest, holds the writer
+    """
+    tables = schema_info.get('tables', {})
+    fingerprints = {
+        name: table_fingerprint(name, tables[name])
+        for name in tables_in_sql(sql, tables).values()
+    }
+    # Not worth delaying the answer for: while an ingest holds the writer,
+    # the translation is not stored
+    with write_connection(db_path, timeout=0) as conn:
+        ensure_cache_table(conn)
+        conn.execute(
+            f'INSERT OR REPLACE INTO "{CACHE_TABLE}" (question, sql, table_fingerprints) VALUES (?, ?, ?)',
+            (normalize_question(question), sql, json.dumps(fingerprints))
+        )
+        conn.execute(
+            f'DELETE FROM "{CACHE_TABLE}" WHERE rowid <= (SELECT MAX(rowid) FROM "{CACHE_TABLE}") - ?',
+            (TRANSLATION_CACHE_ENTRIES,)
+        )
+        conn.commit()
+    get_question_index(db_path).add(normalize_question(question))
@@ -0,0 +1,198 @@
+"""
+Content-addressed cache of completed uploads.
+
+Each uploaded table remembers the hash of the upload that produced its
+current contents together with the summary returned to the client. When the
+same file is uploaded again into an unchanged table, the stored summary is
+returned instead of re-parsing and rewriting the data.
+
+Entries live in an internal table next to the data. Any ingest into a table
+clears its entry inside the ingest transaction and records its own entry in
+that same transaction, and deleting a table clears it too, so an entry is only ever present while the table still holds exactly
+what the recorded upload left behind.
+
+Hashing costs a full read of the upload, so it is skipped for modes that are
+never cached, and when the target table has no cached upload to match the
+digest is taken by HashingReader during the same read the parser does.
+"""
+
+import hashlib
+import io
+import json
+import sqlite3
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from .constants import INTERNAL_TABLE_PREFIX, UPLOAD_HASH_CHUNK_BYTES
+from .db_pool import read_connection
+
+CACHE_TABLE = f"{INTERNAL_TABLE_PREFIX}upload_cache"
+
+# Modes whose result is the same whenever the same file is applied to the
+# table it produced. Appending the same file twice doubles the rows.
+CACHEABLE_MODES = ("replace", "upsert")
+
+
+def hash_stream(
+    stream: BinaryIO,
+    chunk_bytes: int = UPLOAD_HASH_CHUNK_BYTES,
+    sink: Optional[BinaryIO] = None
+) -> str:
+    """
+    Compute the SHA-256 of a seekable binary stream and rewind it.
+
+    Args:
+        stream: Binary file-like object; hashing starts at its current position
+        chunk_bytes: Block size read at a time
+        sink: Optional binary file that receives a copy of every block, so an
+            upload can be spooled and hashed in one pass
+
+    Returns:
+        str: Hex digest of the remaining stream contents
+    """
+    start = stream.tell()
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(chunk_bytes), b""):
+        digest.update(block)
+        if sink is not None:
+            sink.write(block)
+    stream.seek(start)
+    return digest.hexdigest()
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Raw binary reader that hashes the bytes read through it.
+
+    Wrapped in io.BufferedReader it can be handed to the streaming parsers, so
+    an upload is hashed while it is parsed instead of in a separate pass.
+    """
+
+    def __init__(self, raw: BinaryIO, chunk_bytes: int = UPLOAD_HASH_CHUNK_BYTES):
+        self.raw = raw
+        self.chunk_bytes = chunk_bytes
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.raw.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self.digest.update(data)
+        return size
+
+    def hexdigest(self) -> str:
+        """Hash whatever the parser left unread and return the digest of the whole stream."""
+        for block in iter(lambda: self.raw.read(self.chunk_bytes), b""):
+            self.digest.update(block)
+        return self.digest.hexdigest()
+
+
+def upload_key(
+    content_hash: str,
+    file_type: str,
+    mode: str,
+    key_columns: Optional[List[str]] = None,
+    variant: str = ""
+) -> Optional[str]:
+    """
+    Build the cache key for an upload, or None if the upload cannot be cached.
+
+    The same bytes parsed as a different format, merged with different keys
+    or flattened with different options (variant) produce a different table,
+    so those settings are part of the key.
+    """
+    if mode not in CACHEABLE_MODES:
+        return None
+    keys = ",".join(key_columns or [])
+    return f"{content_hash}:{file_type}:{mode}:{keys}:{variant}"
+
+
+def ensure_cache_table(conn: sqlite3.Connection) -> None:
+    """Create the cache table if it does not exist yet."""
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS "{CACHE_TABLE}" ('
+        "table_name TEXT PRIMARY KEY, upload_key TEXT NOT NULL, summary TEXT NOT NULL)"
+    )
+
+
+def invalidate_table(conn: sqlite3.Connection, table_name: str) -> None:
+    """
+    Forget the cached upload for a table.
+
+    Runs on the caller's connection without committing, so it becomes part of
+    the transaction that modifies the table.
+    """
+    ensure_cache_table(conn)
+    conn.execute(f'DELETE FROM "{CACHE_TABLE}" WHERE table_name = ?', (table_name,))
+
+
+def has_cached_upload(table_name: str, db_path: str = "db/database.db") -> bool:
+    """Whether any upload is recorded for table_name, i.e. whether hashing could find a match."""
+    with read_connection(db_path) as conn:
+        try:
+            row = conn.execute(
+                f'SELECT 1 FROM "{CACHE_TABLE}" WHERE table_name = ?', (table_name,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # No upload has been recorded yet
+            return False
+    return row is not None
+
+
+def lookup_upload(
+    table_name: str,
+    key: str,
+    db_path: str = "db/database.db"
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored summary if table_name was produced by the upload with this key.
+
+    Args:
+        table_name: Sanitized table name the upload would write to
+        key: Cache key from upload_key
+        db_path: Path of the SQLite database
+
+    Returns:
+        Summary dict (table_name, schema, row_count, sample_data) or None
+    """
+    with read_connection(db_path) as conn:
+        try:
+            row = conn.execute(
+                f'SELECT summary FROM "{CACHE_TABLE}" WHERE table_name = ? AND upload_key = ?',
+                (table_name, key)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # No upload has been recorded yet
+            return None
+    return json.loads(row[0]) if row else None
+
+
+def record_upload(
+    conn: sqlite3.Connection,
+    key: str,
+    result: Dict[str, Any]
+) -> None:
+    """
+    Remember the summary of an upload for its table.
+
+    Runs on the ingest's connection without committing, so the entry is
+    committed together with the rows it describes (see run_ingest).
+
+    Args:
+        conn: Connection of the ingest transaction
+        key: Cache key from upload_key
+        result: Converter result with table_name, schema, row_count and sample_data
+    """
+    summary = {
+        'table_name': result['table_name'],
+        'schema': result['schema'],
+        'row_count': result['row_count'],
+        'sample_data': result['sample_data']
+    }
+    ensure_cache_table(conn)
+    conn.execute(
+        f'INSERT OR REPLACE INTO "{CACHE_TABLE}" (table_name, upload_key, summary) VALUES (?, ?, ?)',
+        (result['table_name'], key, json.dumps(summary, default=str))
+    )
@@ -1,7 +1,11 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import BackgroundTasks, FastAPI, File, Form, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from contextlib import ExitStack, asynccontextmanager
 from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional
+from urllib.parse import quote
+import io
 import os
 import sqlite3
 import traceback
@@ -12,6 +16,7 @@ import sys
 from core.data_models import (
     FileUploadResponse,
     QueryRequest,
+    QueryPageRequest,
     QueryResponse,
     DatabaseSchemaResponse,
     InsightsRequest,
@@ -21,19 +26,61 @@ from core.data_models import (
     ColumnInfo,
     RandomQueryResponse,
     ExportRequest,
-    QueryExportRequest
+    QueryExportRequest,
+    IngestJobResponse
 )
-from core.file_processor import convert_csv_to_sqlite, convert_json_to_sqlite, convert_jsonl_to_sqlite
-from core.llm_processor import generate_sql, generate_random_query
-from core.sql_processor import execute_sql_safely, get_database_schema
+from core.file_processor import (
+    sanitize_table_name,
+    clean_column_name,
+    convert_csv_stream_to_sqlite,
+    convert_json_stream_to_sqlite,
+    convert_jsonl_stream_to_sqlite,
+    convert_parquet_stream_to_sqlite,
+    convert_arrow_stream_to_sqlite
+)
+from core.constants import ARRAY_MAX_ITEMS, QUERY_PAGE_ROWS
+from core.db_pool import PoolTimeoutError, read_connection, write_connection, close_pools
+from core.concurrency import run_blocking, stream_blocking
+from core.schema_catalog import invalidate_schema, close_schema_catalogs
+from core.result_cache import bump_table_versions
+from core.table_stats import forget_table
+from core.table_writer import child_table_names, parent_table_names
+from core.query_pages import create_page_token, resolve_page_token
+from core.compression import split_compression, open_decompressed
+from core.upload_cache import (
+    CACHEABLE_MODES,
+    HashingReader,
+    hash_stream,
+    has_cached_upload,
+    upload_key,
+    lookup_upload,
+    invalidate_table
+)
+from core.ingest_jobs import IngestJob, spool_upload, submit_ingest_job, get_ingest_job
+from core.parallel_ingest import close_executors
+from core.llm_processor import generate_sql, generate_random_query, warm_llm_clients, close_llm_clients
+from core.translation_cache import lookup_translation, record_translation
+from core.schema_selector import select_schema
+from core.sql_processor import execute_sql_safely, stream_sql_safely, get_database_schema
 from core.insights import generate_insights
 from core.sql_security import (
     execute_query_safely,
     validate_identifier,
     check_table_exists,
+    get_safe_table_list,
+    is_internal_table,
     SQLSecurityError
 )
-from core.export_utils import generate_csv_from_data, generate_csv_from_table, generate_json_from_data, generate_json_from_table
+from core.export_utils import (
+    Encoder,
+    generate_csv_from_data,
+    generate_json_from_data,
+    stream_table,
+    encode_csv,
+    encode_json_array,
+    encode_ndjson,
+    encode_arrow_ipc
+)
 
 # Load .env file from server directory
 load_dotenv()
@@ -50,10 +97,29 @@ logging.basicConfig(
 # Create logger for this module
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Create the LLM clients up front; requests share their connection pools.
+    # A failure here is not fatal: the clients are created again on first use
+    try:
+        providers = warm_llm_clients()
+        logger.info(f"[SUCCESS] LLM clients ready: {', '.join(providers) or 'none'}")
+    except Exception as e:
+        logger.error(f"[ERROR] LLM client warm-up failed: {str(e)}")
+    yield
+    close_llm_clients()
+    # Stop the parse worker processes
+    close_executors()
+    # Close the pooled database connections
+    close_schema_catalogs()
+    close_pools()
+
 app = FastAPI(
     title="Natural Language SQL Interface",
     description="Convert natural language to SQL queries",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration for frontend
@@ -64,6 +130,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Query-SQL"],
 )
 
 # Global app state
@@ -72,35 +139,265 @@ app_start_time = datetime.now()
 # Ensure database directory exists
 os.makedirs("db", exist_ok=True)
 
-@app.post("/api/upload", response_model=FileUploadResponse)
-async def upload_file(file: UploadFile = File(...)) -> FileUploadResponse:
-    """Upload and convert .json, .jsonl or .csv file to SQLite table"""
-    try:
-        # Validate file type
-        if not file.filename.endswith(('.csv', '.json', '.jsonl')):
-            raise HTTPException(400, "Only .csv, .json, and .jsonl files are supported")
-        
-        # Generate table name from filename
-        table_name = file.filename.rsplit('.', 1)[0].lower().replace(' ', '_')
-        
-        # Read file content
-        content = await file.read()
+# Upload file types accepted by the ingest endpoints (before any compression suffix)
+UPLOAD_FILE_TYPES = ('.csv', '.json', '.jsonl', '.parquet', '.arrow', '.feather')
+
+def validate_upload_filename(filename: str) -> None:
+    """Reject uploads whose file type cannot be ingested"""
+    base_name, _ = split_compression(filename)
+    if not base_name.endswith(UPLOAD_FILE_TYPES):
+        raise HTTPException(400, "Only .csv, .json, .jsonl, .parquet, .arrow and .feather files are supported (optionally .gz, .bz2 or .zst compressed)")
+
+def ingest_upload(
+    stream: BinaryIO,
+    filename: str,
+    mode: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    content_hash: Optional[str] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    array_strategy: str = "flatten",
+    array_max_items: Optional[int] = None
+) -> FileUploadResponse:
+    """
+    Convert one uploaded file into a SQLite table, reusing an identical earlier upload.
+    
+    Shared by the synchronous upload endpoint and background ingest jobs.
+    content_hash may be passed when the upload was already hashed while it
+    was spooled. Otherwise the upload is only hashed up front when its table
+    has a cached upload it could match; a fresh upload is hashed while it is
+    parsed. progress_callback receives the running count of rows written.
+    array_strategy and array_max_items control how JSONL arrays are stored and
+    are ignored for other formats.
+    """
+    validate_upload_filename(filename)
+    base_name, compression = split_compression(filename)
+    
+    # Generate table name from filename
+    table_name = base_name.rsplit('.', 1)[0].lower().replace(' ', '_')
+    file_type = base_name.rsplit('.', 1)[1].lower()
+    
+    options = {'mode': mode, 'key_columns': key_columns, 'progress_callback': progress_callback}
+    variant = ""
+    if file_type == 'jsonl':
+        options['array_strategy'] = array_strategy
+        options['array_max_items'] = array_max_items or ARRAY_MAX_ITEMS
+        variant = f"{array_strategy}:{options['array_max_items']}"
+    
+    # Wrappers opened over the upload (hashing, decompression, the temporary
+    # spool) are closed on success and on error; the upload stream stays the caller's
+    with ExitStack() as opened:
+        # Identical content already loaded into an unchanged table needs no re-ingest
+        cache_keys = [clean_column_name(col) for col in key_columns or []]
+        cache_key = None
+        if mode in CACHEABLE_MODES:
+            # The columnar readers seek, so only their decompressing spool reads the upload in one pass
+            seeks = file_type in ('parquet', 'arrow', 'feather') and compression is None
+            if content_hash is None and (seeks or has_cached_upload(sanitize_table_name(table_name))):
+                content_hash = hash_stream(stream)
+            if content_hash is None:
+                hasher = HashingReader(stream)
+                stream = opened.enter_context(io.BufferedReader(hasher))
+                # Known only once the parser has read the whole upload
+                options['cache_key'] = lambda: upload_key(hasher.hexdigest(), file_type, mode, cache_keys, variant)
+            else:
+                cache_key = upload_key(content_hash, file_type, mode, cache_keys, variant)
+                options['cache_key'] = lambda: cache_key
+        cached = lookup_upload(sanitize_table_name(table_name), cache_key) if cache_key else None
+        if cached:
+            return FileUploadResponse(
+                table_name=cached['table_name'],
+                table_schema=cached['schema'],
+                row_count=cached['row_count'],
+                sample_data=cached['sample_data'],
+                rows_written=0,
+                cached=True
+            )
         
-        # Convert to SQLite based on file type
-        if file.filename.endswith('.csv'):
-            result = convert_csv_to_sqlite(content, table_name)
-        elif file.filename.endswith('.jsonl'):
-            result = convert_jsonl_to_sqlite(content, table_name)
+        # Convert to SQLite based on file type, decompressing while parsing;
+        # the columnar readers seek, so those are decompressed to a temporary file
+        if compression is not None:
+            stream = opened.enter_context(
+                open_decompressed(stream, compression, seekable=file_type in ('parquet', 'arrow', 'feather'))
+            )
+        if file_type == 'csv':
+            result = convert_csv_stream_to_sqlite(stream, table_name, **options)
+        elif file_type == 'jsonl':
+            result = convert_jsonl_stream_to_sqlite(stream, table_name, **options)
+        elif file_type == 'parquet':
+            result = convert_parquet_stream_to_sqlite(stream, table_name, **options)
+        elif file_type in ('arrow', 'feather'):
+            result = convert_arrow_stream_to_sqlite(stream, table_name, **options)
         else:
-            result = convert_json_to_sqlite(content, table_name)
+            result = convert_json_stream_to_sqlite(stream, table_name, **options)
+    
+    return FileUploadResponse(
+        table_name=result['table_name'],
+        table_schema=result['schema'],
+        row_count=result['row_count'],
+        sample_data=result['sample_data'],
+        rows_written=result.get('rows_written'),
+        ingest_time_ms=result.get('ingest_time_ms'),
+        rows_per_second=result.get('rows_per_second')
+    )
+
+def parse_key_columns(key_columns: Optional[str]) -> Optional[List[str]]:
+    """Split the comma-separated key_columns form field"""
+    return [col.strip() for col in key_columns.split(',') if col.strip()] if key_columns else None
+
+def ingest_job_response(job: IngestJob) -> IngestJobResponse:
+    """Build the status response for a background ingest job"""
+    return IngestJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        filename=job.filename,
+        bytes_total=job.bytes_total,
+        bytes_processed=job.bytes_processed,
+        rows_written=job.rows_written,
+        elapsed_seconds=job.elapsed_seconds,
+        eta_seconds=job.eta_seconds,
+        result=job.result,
+        error=job.error
+    )
+
+def list_user_tables() -> List[str]:
+    """Return the names of the uploaded tables"""
+    with read_connection() as conn:
+        return get_safe_table_list(conn)
+
+def drop_user_table(table_name: str) -> None:
+    """Drop an uploaded table with its child tables and forget its and its parents' cached uploads; 404 if there is none"""
+    with write_connection() as conn:
+        # Check if table exists using secure method; internal tables are not user data
+        if is_internal_table(table_name) or not check_table_exists(conn, table_name):
+            raise HTTPException(404, f"Table '{table_name}' not found")
+        
+        # A parent's cached upload would skip recreating a dropped child table
+        for parent in parent_table_names(conn, table_name):
+            invalidate_table(conn, parent)
         
-        response = FileUploadResponse(
-            table_name=result['table_name'],
-            table_schema=result['schema'],
-            row_count=result['row_count'],
-            sample_data=result['sample_data']
+        dropped = [table_name, *child_table_names(conn, table_name)]
+        for name in dropped:
+            invalidate_table(conn, name)
+            forget_table(conn, name)
+            
+            # Drop the table using safe query execution with DDL permission
+            execute_query_safely(
+                conn,
+                "DROP TABLE IF EXISTS {table}",
+                identifier_params={'table': name},
+                allow_ddl=True
+            )
+        conn.commit()
+    invalidate_schema()
+    bump_table_versions(dropped)
+
+def stream_user_table(table_name: str, encode: Encoder) -> Iterator[bytes]:
+    """Encode a table chunk by chunk on a pooled connection; 404 if it does not exist"""
+    with read_connection() as conn:
+        if not check_table_exists(conn, table_name):
+            raise HTTPException(404, f"Table '{table_name}' not found")
+        yield from stream_table(conn, table_name, encode)
+
+async def stream_query_export(token: str, encode: Encoder) -> AsyncIterator[bytes]:
+    """
+    Start streaming the whole result of a query the server ran earlier for download
+    
+    The query is identified by a token the server issued, so only SQL the
+    server generated itself is run; 404 for unknown tokens, 400 if the SQL
+    fails. Streaming keeps memory flat, so exports are not held to the
+    QUERY_MAX_ROWS cap of pages.
+    """
+    page = resolve_page_token(token)
+    if page is None:
+        raise HTTPException(404, "Unknown or expired query")
+    try:
+        return await stream_blocking("export", stream_sql_safely(page['sql'], encode, max_rows=None))
+    except (SQLSecurityError, sqlite3.Error) as e:
+        raise HTTPException(400, f"Error running query for export: {str(e)}")
+
+# Streamed formats of /api/query: encoder and media type
+QUERY_STREAMS = {
+    "ndjson": (encode_ndjson, "application/x-ndjson"),
+    "arrow": (encode_arrow_ipc, "application/vnd.apache.arrow.stream"),
+}
+
+async def run_query_page(sql: str, offset: int, page_size: int, result_format: str = "records") -> QueryResponse:
+    """Run one page of a query and attach the token for the page after it"""
+    start_time = datetime.now()
+    result = await run_blocking("query", execute_sql_safely, sql, page_size, offset, result_format)
+    execution_time = (datetime.now() - start_time).total_seconds() * 1000
+    
+    if result['error']:
+        raise Exception(result['error'])
+    
+    if result_format == "rows":
+        row_count = len(result['rows'])
+    elif result_format == "columns":
+        row_count = len(result['column_data'][0]) if result['column_data'] else 0
+    else:
+        row_count = len(result['results'])
+    return QueryResponse(
+        sql=sql,
+        results=result['results'],
+        columns=result['columns'],
+        result_format=result_format,
+        rows=result.get('rows'),
+        column_data=result.get('column_data'),
+        row_count=row_count,
+        execution_time_ms=execution_time,
+        offset=offset,
+        has_more=result['has_more'],
+        next_token=create_page_token(sql, offset + row_count, page_size, result_format) if result['has_more'] else None,
+        truncated=result['truncated']
+    )
+
+async def remember_translation(question: str, schema_info: Dict[str, Any], sql: str) -> None:
+    """
+    Store the SQL of a successful query for repeat questions; failing to store it is only logged
+    
+    Runs as a background task once the response is sent, so a busy writer never delays an answer.
+    """
+    try:
+        await run_blocking("translation", record_translation, question, schema_info, sql)
+    except PoolTimeoutError:
+        logger.info("Translation not stored: the database writer is busy with another write")
+    except Exception as e:
+        logger.error(f"[ERROR] Storing translation failed: {str(e)}")
+
+@app.post("/api/upload", response_model=FileUploadResponse)
+async def upload_file(
+    file: UploadFile = File(...),
+    mode: str = Form("replace"),
+    key_columns: Optional[str] = Form(None),
+    array_strategy: str = Form("flatten"),
+    array_max_items: Optional[int] = Form(None)
+) -> FileUploadResponse:
+    """
+    Upload and convert .json, .jsonl, .csv, .parquet or Arrow IPC
+    (.arrow/.feather) file to SQLite table.
+    
+    Files may be compressed with gzip (.gz), bzip2 (.bz2) or zstd (.zst); they
+    are decompressed as they are parsed (Parquet and Arrow IPC into a temporary
+    file first, since their readers seek). mode is replace (default), append or
+    upsert; upsert needs key_columns as a comma-separated list of the columns
+    that identify a row.
+    
+    For JSONL, array_strategy chooses how arrays are stored: flatten (one
+    column per element, default), json (one JSON text column), first_k (the
+    first array_max_items elements) or child_table (a {table}__{column} table
+    of elements keyed by parent_rowid).
+    """
+    try:
+        # UploadFile is already spooled to a temporary file on disk, so stream
+        # it instead of reading the whole body into memory
+        response = await run_blocking(
+            "upload", ingest_upload, file.file, file.filename, mode, parse_key_columns(key_columns),
+            array_strategy=array_strategy, array_max_items=array_max_items
         )
-        logger.info(f"[SUCCESS] File upload: {response}")
+        if response.cached:
+            logger.info(f"[SUCCESS] File upload (cached): {response.table_name}")
+        else:
+            logger.info(f"[SUCCESS] File upload: {response}")
         return response
     except Exception as e:
         logger.error(f"[ERROR] File upload failed: {str(e)}")
@@ -113,32 +410,94 @@ async def upload_file(file: UploadFile = File(...)) -> FileUploadResponse:
             error=str(e)
         )
 
+@app.post("/api/upload/jobs", response_model=IngestJobResponse)
+async def create_upload_job(
+    file: UploadFile = File(...),
+    mode: str = Form("replace"),
+    key_columns: Optional[str] = Form(None),
+    array_strategy: str = Form("flatten"),
+    array_max_items: Optional[int] = Form(None)
+) -> IngestJobResponse:
+    """
+    Start a background ingest of an uploaded file and return its job id immediately.
+    
+    Accepts the same files and form fields as /api/upload. Poll
+    /api/upload/{job_id} for progress and the final result.
+    """
+    try:
+        validate_upload_filename(file.filename)
+        filename = file.filename
+        keys = parse_key_columns(key_columns)
+        
+        # The request's upload file is closed once this handler returns, so
+        # copy it somewhere the job can read later (off the event loop)
+        path, size, content_hash = await run_blocking(
+            "upload", spool_upload, file.file, os.path.splitext(filename)[1], mode in CACHEABLE_MODES
+        )
+        job = submit_ingest_job(
+            filename, path, size, content_hash,
+            lambda stream, upload_hash, progress: ingest_upload(
+                stream, filename, mode, keys, upload_hash, progress, array_strategy, array_max_items
+            )
+        )
+        
+        response = ingest_job_response(job)
+        logger.info(f"[SUCCESS] Upload job created: {job.job_id} for {filename} ({size} bytes)")
+        return response
+    except Exception as e:
+        logger.error(f"[ERROR] Upload job creation failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return IngestJobResponse(
+            job_id="",
+            status="failed",
+            filename=file.filename or "",
+            error=str(e)
+        )
+
+@app.get("/api/upload/{job_id}", response_model=IngestJobResponse)
+async def get_upload_job(job_id: str) -> IngestJobResponse:
+    """Report progress of a background ingest job: bytes read, rows written and ETA"""
+    job = get_ingest_job(job_id)
+    if job is None:
+        raise HTTPException(404, f"Upload job '{job_id}' not found")
+    return ingest_job_response(job)
+
 @app.post("/api/query", response_model=QueryResponse)
-async def process_natural_language_query(request: QueryRequest) -> QueryResponse:
+async def process_natural_language_query(request: QueryRequest, background_tasks: BackgroundTasks) -> QueryResponse:
     """Process natural language query and return SQL results"""
     try:
         # Get database schema
-        schema_info = get_database_schema()
+        schema_info = await run_blocking("query_schema", get_database_schema)
         
-        # Generate SQL using routing logic
-        sql = generate_sql(request, schema_info)
-        
-        # Execute SQL query
-        start_time = datetime.now()
-        result = execute_sql_safely(sql)
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        # Reuse the stored translation of a repeat question, else generate SQL using routing logic
+        sql = await run_blocking("query_schema", lookup_translation, request.query, schema_info)
+        translated = sql is None
+        if translated:
+            # Describe only the tables relevant to the question to the LLM
+            prompt_schema = await run_blocking("query_schema", select_schema, request.query, schema_info)
+            logger.info(
+                f"[SUCCESS] Prompt schema: {len(prompt_schema.get('tables', {}))} of "
+                f"{len(schema_info.get('tables', {}))} tables"
+            )
+            sql = await run_blocking("llm", generate_sql, request, prompt_schema)
         
-        if result['error']:
-            raise Exception(result['error'])
+        if request.stream:
+            # Stream the whole result as it comes off the cursor; the SQL
+            # travels in a header since the body holds only rows
+            encode, media_type = QUERY_STREAMS[request.stream]
+            chunks = await stream_blocking("query", stream_sql_safely(sql, encode))
+            if translated:
+                background_tasks.add_task(remember_translation, request.query, schema_info, sql)
+            logger.info(f"[SUCCESS] Query streaming: SQL={sql}, format={request.stream}")
+            return StreamingResponse(chunks, media_type=media_type, headers={"X-Query-SQL": quote(sql)})
         
-        response = QueryResponse(
-            sql=sql,
-            results=result['results'],
-            columns=result['columns'],
-            row_count=len(result['results']),
-            execution_time_ms=execution_time
-        )
-        logger.info(f"[SUCCESS] Query processed: SQL={sql}, rows={len(result['results'])}, time={execution_time}ms")
+        # Execute SQL query, reading only the first page of the result
+        page_size = request.page_size or QUERY_PAGE_ROWS
+        response = await run_query_page(sql, 0, page_size, request.result_format)
+        response.query_id = create_page_token(sql, 0, page_size, request.result_format)
+        if translated:
+            background_tasks.add_task(remember_translation, request.query, schema_info, sql)
+        logger.info(f"[SUCCESS] Query processed: SQL={sql}, rows={response.row_count}, time={response.execution_time_ms}ms, cached_sql={not translated}")
         return response
     except Exception as e:
         logger.error(f"[ERROR] Query processing failed: {str(e)}")
@@ -152,11 +511,36 @@ async def process_natural_language_query(request: QueryRequest) -> QueryResponse
             error=str(e)
         )
 
+@app.post("/api/query/page", response_model=QueryResponse)
+async def fetch_query_page(request: QueryPageRequest) -> QueryResponse:
+    """Fetch the next page of a query result by its continuation token"""
+    page = resolve_page_token(request.token)
+    if page is None:
+        raise HTTPException(404, "Unknown or expired page token")
+    try:
+        response = await run_query_page(
+            page['sql'], page['offset'], page['page_size'], page['result_format']
+        )
+        logger.info(f"[SUCCESS] Query page fetched: offset={page['offset']}, rows={response.row_count}")
+        return response
+    except Exception as e:
+        logger.error(f"[ERROR] Query page failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return QueryResponse(
+            sql=page['sql'],
+            results=[],
+            columns=[],
+            row_count=0,
+            execution_time_ms=0,
+            offset=page['offset'],
+            error=str(e)
+        )
+
 @app.get("/api/schema", response_model=DatabaseSchemaResponse)
 async def get_database_schema_endpoint() -> DatabaseSchemaResponse:
     """Get current database schema and table information"""
     try:
-        schema = get_database_schema()
+        schema = await run_blocking("schema", get_database_schema)
         tables = []
         
         for table_name, table_info in schema['tables'].items():
@@ -195,7 +579,7 @@ async def get_database_schema_endpoint() -> DatabaseSchemaResponse:
 async def generate_insights_endpoint(request: InsightsRequest) -> InsightsResponse:
     """Generate statistical insights for table columns"""
     try:
-        insights = generate_insights(request.table_name, request.column_names)
+        insights = await run_blocking("insights", generate_insights, request.table_name, request.column_names)
         response = InsightsResponse(
             table_name=request.table_name,
             insights=insights,
@@ -218,7 +602,7 @@ async def generate_random_query_endpoint() -> RandomQueryResponse:
     """Generate a random natural language query based on database schema"""
     try:
         # Get database schema
-        schema_info = get_database_schema()
+        schema_info = await run_blocking("schema", get_database_schema)
         
         # Check if there are any tables
         if not schema_info.get('tables'):
@@ -228,7 +612,7 @@ async def generate_random_query_endpoint() -> RandomQueryResponse:
             )
         
         # Generate random query using LLM
-        random_query = generate_random_query(schema_info)
+        random_query = await run_blocking("llm", generate_random_query, schema_info)
         
         response = RandomQueryResponse(query=random_query)
         logger.info(f"[SUCCESS] Random query generated: {random_query}")
@@ -246,11 +630,7 @@ async def health_check() -> HealthCheckResponse:
     """Health check endpoint with database status"""
     try:
         # Check database connection
-        conn = sqlite3.connect("db/database.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
-        conn.close()
+        tables = await run_blocking("health", list_user_tables)
         
         uptime = (datetime.now() - app_start_time).total_seconds()
         
@@ -282,22 +662,7 @@ async def delete_table(table_name: str):
         except SQLSecurityError as e:
             raise HTTPException(400, str(e))
         
-        conn = sqlite3.connect("db/database.db")
-        
-        # Check if table exists using secure method
-        if not check_table_exists(conn, table_name):
-            conn.close()
-            raise HTTPException(404, f"Table '{table_name}' not found")
-        
-        # Drop the table using safe query execution with DDL permission
-        execute_query_safely(
-            conn,
-            "DROP TABLE IF EXISTS {table}",
-            identifier_params={'table': table_name},
-            allow_ddl=True
-        )
-        conn.commit()
-        conn.close()
+        await run_blocking("write", drop_user_table, table_name)
         
         response = {"message": f"Table '{table_name}' deleted successfully"}
         logger.info(f"[SUCCESS] Table deleted: {table_name}")
@@ -316,21 +681,12 @@ async def export_table(request: ExportRequest) -> Response:
         # Validate table name
         validate_identifier(request.table_name, "table")
         
-        # Connect to database
-        conn = sqlite3.connect("db/database.db")
-        
-        # Check if table exists
-        if not check_table_exists(conn, request.table_name):
-            conn.close()
-            raise HTTPException(404, f"Table '{request.table_name}' not found")
-        
-        # Generate CSV
-        csv_data = generate_csv_from_table(conn, request.table_name)
-        conn.close()
+        # Stream CSV as rows are read
+        csv_chunks = await stream_blocking("export", stream_user_table(request.table_name, encode_csv))
         
         # Return CSV response
-        return Response(
-            content=csv_data,
+        return StreamingResponse(
+            csv_chunks,
             media_type="text/csv",
             headers={
                 "Content-Disposition": f'attachment; filename="{request.table_name}_export.csv"'
@@ -347,8 +703,19 @@ async def export_table(request: ExportRequest) -> Response:
 async def export_query_results(request: QueryExportRequest) -> Response:
     """Export query results as CSV file"""
     try:
+        if request.token is not None:
+            # Run the query again and stream its whole result, not just the rows the client holds
+            csv_chunks = await stream_query_export(request.token, encode_csv)
+            return StreamingResponse(
+                csv_chunks,
+                media_type="text/csv",
+                headers={
+                    "Content-Disposition": 'attachment; filename="query_results.csv"'
+                }
+            )
+        
         # Generate CSV from query results
-        csv_data = generate_csv_from_data(request.data, request.columns)
+        csv_data = await run_blocking("export", generate_csv_from_data, request.data, request.columns)
 
         # Return CSV response
         return Response(
@@ -358,6 +725,8 @@ async def export_query_results(request: QueryExportRequest) -> Response:
                 "Content-Disposition": 'attachment; filename="query_results.csv"'
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[ERROR] Query export failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
@@ -370,21 +739,12 @@ async def export_table_json(request: ExportRequest) -> Response:
         # Validate table name
         validate_identifier(request.table_name, "table")
 
-        # Connect to database
-        conn = sqlite3.connect("db/database.db")
-
-        # Check if table exists
-        if not check_table_exists(conn, request.table_name):
-            conn.close()
-            raise HTTPException(404, f"Table '{request.table_name}' not found")
-
-        # Generate JSON
-        json_data = generate_json_from_table(conn, request.table_name)
-        conn.close()
+        # Stream JSON as rows are read
+        json_chunks = await stream_blocking("export", stream_user_table(request.table_name, encode_json_array))
 
         # Return JSON response
-        return Response(
-            content=json_data,
+        return StreamingResponse(
+            json_chunks,
             media_type="application/json",
             headers={
                 "Content-Disposition": f'attachment; filename="{request.table_name}_export.json"'
@@ -401,8 +761,19 @@ async def export_table_json(request: ExportRequest) -> Response:
 async def export_query_results_json(request: QueryExportRequest) -> Response:
     """Export query results as JSON file"""
     try:
+        if request.token is not None:
+            # Run the query again and stream its whole result, not just the rows the client holds
+            json_chunks = await stream_query_export(request.token, encode_json_array)
+            return StreamingResponse(
+                json_chunks,
+                media_type="application/json",
+                headers={
+                    "Content-Disposition": 'attachment; filename="query_results.json"'
+                }
+            )
+        
         # Generate JSON from query results
-        json_data = generate_json_from_data(request.data, request.columns)
+        json_data = await run_blocking("export", generate_json_from_data, request.data, request.columns)
 
         # Return JSON response
         return Response(
@@ -412,6 +783,8 @@ async def export_query_results_json(request: QueryExportRequest) -> Response:
                 "Content-Disposition": 'attachment; filename="query_results.json"'
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[ERROR] Query JSON export failed: {str(e)}")
         logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
@@ -0,0 +1,15 @@
+import pytest
+from core.db_pool import close_pools
+from core.result_cache import clear_result_cache
+from core.schema_catalog import close_schema_catalogs
+from core.schema_selector import clear_schema_indexes
+
+
+@pytest.fixture(autouse=True)
+def reset_db_pools():
+    """Close pooled connections and drop cached schemas, indexes and results so no test sees another test's databases"""
+    yield
+    clear_result_cache()
+    clear_schema_indexes()
+    close_schema_catalogs()
+    close_pools()
@@ -0,0 +1,130 @@
+import bz2
+import gzip
+import io
+import pytest
+from core.compression import split_compression, open_decompressed
+from core.file_processor import (
+    convert_csv_stream_to_sqlite,
+    convert_json_stream_to_sqlite,
+    convert_jsonl_stream_to_sqlite,
+    convert_parquet_stream_to_sqlite,
+    convert_arrow_stream_to_sqlite
+)
+
+
+CSV_CONTENT = b'id,name,note\n1,John,"hello, world"\n2,Jane,"two\nlines"\n'
+JSONL_CONTENT = b'{"id": 1, "user": {"name": "John"}}\n{"id": 2, "user": {"name": "Jane"}}\n'
+JSON_CONTENT = b'[{"id": 1, "name": "John"}, {"id": 2, "name": "Jane"}]'
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "test.db")
+
+
+class TestCompression:
+
+    def test_split_compression(self):
+        """Test that compression suffixes are recognized and stripped"""
+        assert split_compression("events.jsonl.gz") == ("events.jsonl", "gzip")
+        assert split_compression("Sales.CSV.BZ2") == ("Sales.CSV", "bz2")
+        assert split_compression("events.jsonl.zst") == ("events.jsonl", "zstd")
+        assert split_compression("users.csv") == ("users.csv", None)
+
+    def test_uncompressed_stream_is_unchanged(self):
+        """Test that plain uploads are passed through as-is"""
+        stream = io.BytesIO(CSV_CONTENT)
+        assert open_decompressed(stream, None) is stream
+
+    @pytest.mark.parametrize("codec,compress", [("gzip", gzip.compress), ("bz2", bz2.compress)])
+    def test_closing_leaves_source_open(self, codec, compress):
+        """Test that closing the decompressed stream or spool never closes the caller's stream"""
+        source = io.BytesIO(compress(CSV_CONTENT))
+
+        for seekable in (False, True):
+            source.seek(0)
+            with open_decompressed(source, codec, seekable=seekable) as decoded:
+                assert decoded.read() == CSV_CONTENT
+            assert decoded.closed
+            assert not source.closed
+
+    @pytest.mark.parametrize("codec,compress", [("gzip", gzip.compress), ("bz2", bz2.compress)])
+    def test_csv_roundtrip(self, db_path, codec, compress):
+        """Test that compressed CSV, including quoted line breaks, loads like plain CSV"""
+        stream = open_decompressed(io.BytesIO(compress(CSV_CONTENT)), codec)
+        result = convert_csv_stream_to_sqlite(stream, "notes", db_path)
+
+        assert result['row_count'] == 2
+        assert result['sample_data'][1]['note'] == "two\nlines"
+
+    def test_gzip_csv_parallel(self, db_path):
+        """Test that the sharded parser reads from a decompressing stream"""
+        stream = open_decompressed(io.BytesIO(gzip.compress(CSV_CONTENT)), "gzip")
+        result = convert_csv_stream_to_sqlite(stream, "notes", db_path, workers=2)
+
+        assert result['row_count'] == 2
+        assert result['sample_data'][0]['note'] == "hello, world"
+
+    def test_gzip_jsonl_and_json(self, db_path):
+        """Test that compressed JSONL and JSON load through the streaming parsers"""
+        jsonl = open_decompressed(io.BytesIO(gzip.compress(JSONL_CONTENT)), "gzip")
+        result = convert_jsonl_stream_to_sqlite(jsonl, "events", db_path)
+        assert result['row_count'] == 2
+        assert 'user__name' in result['schema']
+
+        json_stream = open_decompressed(io.BytesIO(bz2.compress(JSON_CONTENT)), "bz2")
+        result = convert_json_stream_to_sqlite(json_stream, "users", db_path)
+        assert result['row_count'] == 2
+
+    def test_zstd_jsonl(self, db_path):
+        """Test that zstd uploads decode across multiple frames"""
+        zstandard = pytest.importorskip("zstandard")
+        compressor = zstandard.ZstdCompressor()
+        lines = JSONL_CONTENT.splitlines(keepends=True)
+        payload = b"".join(compressor.compress(line) for line in lines)
+
+        stream = open_decompressed(io.BytesIO(payload), "zstd")
+        result = convert_jsonl_stream_to_sqlite(stream, "events", db_path)
+        assert result['row_count'] == 2
+
+    def test_zstd_columnar_files(self, db_path):
+        """Test that zstd Parquet and Arrow IPC files are spooled to a seekable file"""
+        zstandard = pytest.importorskip("zstandard")
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        table = pa.table({"id": [1, 2], "name": ["John", "Jane"]})
+        compressor = zstandard.ZstdCompressor()
+
+        parquet = io.BytesIO()
+        pq.write_table(table, parquet)
+        stream = open_decompressed(io.BytesIO(compressor.compress(parquet.getvalue())), "zstd", seekable=True)
+        assert stream.seekable()
+        assert convert_parquet_stream_to_sqlite(stream, "users", db_path)['row_count'] == 2
+
+        for open_writer in (pa.ipc.new_file, pa.ipc.new_stream):
+            arrow = io.BytesIO()
+            with open_writer(arrow, table.schema) as writer:
+                writer.write_table(table)
+            stream = open_decompressed(io.BytesIO(compressor.compress(arrow.getvalue())), "zstd", seekable=True)
+            assert convert_arrow_stream_to_sqlite(stream, "users", db_path)['row_count'] == 2
+
+    def test_zstd_arrow_stream_format_without_spooling(self, db_path):
+        """Test that the Arrow streaming format is sniffed without seeking"""
+        zstandard = pytest.importorskip("zstandard")
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2]})
+        arrow = io.BytesIO()
+        with pa.ipc.new_stream(arrow, table.schema) as writer:
+            writer.write_table(table)
+
+        payload = zstandard.ZstdCompressor().compress(arrow.getvalue())
+        stream = open_decompressed(io.BytesIO(payload), "zstd")
+        assert not stream.seekable()
+        assert convert_arrow_stream_to_sqlite(stream, "events", db_path)['row_count'] == 2
+
+    def test_corrupt_gzip(self, db_path):
+        """Test that a damaged archive surfaces as a conversion error"""
+        stream = open_decompressed(io.BytesIO(b"not gzip data"), "gzip")
+        with pytest.raises(Exception) as exc_info:
+            convert_jsonl_stream_to_sqlite(stream, "events", db_path)
+        assert "Error converting JSONL to SQLite" in str(exc_info.value)
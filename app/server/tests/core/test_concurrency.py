@@ -0,0 +1,168 @@
+import threading
+import time
+import anyio
+import pytest
+from core import concurrency
+from core.concurrency import run_blocking, stream_blocking
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    """Give every test its own limiters and small group limits"""
+    monkeypatch.setattr(concurrency, "_limiters", {})
+    monkeypatch.setattr(concurrency, "ENDPOINT_CONCURRENCY", {"slow": 2, "fast": 1})
+
+
+class TestRunBlocking:
+    
+    def test_runs_in_worker_thread(self):
+        """Test that the function runs off the event loop thread and returns its result"""
+        async def main():
+            return await run_blocking("fast", lambda a, b=0: (threading.get_ident(), a + b), 1, b=2)
+        
+        thread_id, total = anyio.run(main)
+        assert thread_id != threading.get_ident()
+        assert total == 3
+    
+    def test_group_limit_bounds_concurrency(self):
+        """Test that a group never runs more calls at once than its limit"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+        
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+        
+        async def main():
+            async with anyio.create_task_group() as tg:
+                for _ in range(6):
+                    tg.start_soon(run_blocking, "slow", work)
+        
+        anyio.run(main)
+        assert max(peak) == 2
+    
+    def test_busy_group_does_not_block_other_groups(self):
+        """Test that a saturated group leaves other groups free to run"""
+        release = threading.Event()
+        
+        async def main():
+            async with anyio.create_task_group() as tg:
+                for _ in range(2):
+                    tg.start_soon(run_blocking, "slow", release.wait, 5)
+                await anyio.sleep(0.05)
+                started = time.perf_counter()
+                await run_blocking("fast", lambda: None)
+                elapsed = time.perf_counter() - started
+                release.set()
+            return elapsed
+        
+        assert anyio.run(main) < 1
+    
+    def test_exceptions_propagate(self):
+        """Test that errors raised in the worker reach the caller"""
+        def fail():
+            raise ValueError("boom")
+        
+        async def main():
+            await run_blocking("fast", fail)
+        
+        with pytest.raises(ValueError, match="boom"):
+            anyio.run(main)
+
+
+class TestStreamBlocking:
+    
+    def test_yields_items_and_closes_iterator(self):
+        """Test that all items arrive and the generator is closed afterwards"""
+        closed = []
+        
+        def numbers():
+            try:
+                yield from range(3)
+            finally:
+                closed.append(True)
+        
+        async def main():
+            return [item async for item in await stream_blocking("fast", numbers())]
+        
+        assert anyio.run(main) == [0, 1, 2]
+        assert closed == [True]
+    
+    def test_setup_errors_raise_before_streaming(self):
+        """Test that an error raised for the first item reaches the caller"""
+        def broken():
+            raise ValueError("bad query")
+            yield
+        
+        async def main():
+            await stream_blocking("fast", broken())
+        
+        with pytest.raises(ValueError, match="bad query"):
+            anyio.run(main)
+    
+    def test_closing_early_closes_iterator(self):
+        """Test that a stream abandoned midway gives its resources back"""
+        closed = []
+        
+        def endless():
+            try:
+                while True:
+                    yield 1
+            finally:
+                closed.append(True)
+        
+        async def main():
+            items = await stream_blocking("fast", endless())
+            await items.__anext__()
+            await items.aclose()
+        
+        anyio.run(main)
+        assert closed == [True]
+    
+    def test_open_stream_holds_group_slot(self):
+        """Test that a stream counts against its group until closed, not only while producing items"""
+        def endless():
+            while True:
+                yield 1
+        
+        async def main():
+            items = await stream_blocking("fast", endless())
+            await items.__anext__()
+            with anyio.move_on_after(0.1):
+                await run_blocking("fast", lambda: None)
+                return "ran while stream open"
+            await items.aclose()
+            await run_blocking("fast", lambda: None)
+            return "waited for stream"
+        
+        assert anyio.run(main) == "waited for stream"
+    
+    def test_failed_setup_gives_slot_back(self):
+        """Test that a stream failing on its first item does not keep its slot"""
+        def broken():
+            raise ValueError("bad query")
+            yield
+        
+        async def main():
+            with pytest.raises(ValueError):
+                await stream_blocking("fast", broken())
+            with anyio.fail_after(1):
+                await run_blocking("fast", lambda: None)
+        
+        anyio.run(main)
+
+
+
+class TestGroupLimits:
+    
+    def test_reader_groups_fit_the_pool(self):
+        """Test that every group holding read connections together leaves one reader free"""
+        from core.constants import DB_POOL_READERS, ENDPOINT_CONCURRENCY, INGEST_JOB_WORKERS, READER_GROUPS
+        
+        assert "query_schema" in READER_GROUPS
+        assert sum(ENDPOINT_CONCURRENCY[group] for group in READER_GROUPS) + INGEST_JOB_WORKERS < DB_POOL_READERS
@@ -0,0 +1,143 @@
+import sqlite3
+import threading
+import pytest
+from core import db_pool
+from core.db_pool import ConnectionPool, PoolTimeoutError, read_connection, write_connection, get_pool, close_pools
+from core.constants import DB_CACHE_SIZE_KIB, DB_MMAP_BYTES
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a file database with one table"""
+    path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+    conn.execute("INSERT INTO users VALUES (1, 'John')")
+    conn.commit()
+    conn.close()
+    yield path
+    close_pools()
+
+
+class TestConnectionPool:
+    
+    def test_connections_are_configured(self, db_path):
+        """Test that pooled connections use WAL, mmap and the pool's page cache"""
+        with read_connection(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == DB_MMAP_BYTES
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -DB_CACHE_SIZE_KIB
+    
+    def test_readers_are_query_only(self, db_path):
+        """Test that nothing can be written through a read connection"""
+        with read_connection(db_path) as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO users VALUES (2, 'Jane')")
+        with write_connection(db_path) as conn:
+            conn.execute("INSERT INTO users VALUES (2, 'Jane')")
+            conn.commit()
+    
+    def test_reader_authorizer_is_reset(self, db_path):
+        """Test that an authorizer left on a reader does not reach the next checkout"""
+        with read_connection(db_path) as first:
+            first.set_authorizer(lambda *args: sqlite3.SQLITE_DENY)
+        with read_connection(db_path) as second:
+            assert second is first
+            assert second.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+    
+    def test_reader_is_reused(self, db_path):
+        """Test that a returned reader is handed out again with its state reset"""
+        with read_connection(db_path) as first:
+            first.row_factory = sqlite3.Row
+        with read_connection(db_path) as second:
+            assert second is first
+            assert second.row_factory is None
+    
+    def test_readers_are_bounded(self, db_path, monkeypatch):
+        """Test that a checkout waits for a free reader and times out"""
+        monkeypatch.setattr(db_pool, "DB_POOL_TIMEOUT_SECONDS", 0.05)
+        pool = ConnectionPool(db_path, max_readers=1)
+        errors = []
+        
+        def checkout():
+            try:
+                with pool.reader():
+                    pass
+            except PoolTimeoutError as e:
+                errors.append(e)
+        
+        with pool.reader():
+            thread = threading.Thread(target=checkout)
+            thread.start()
+            thread.join()
+        pool.close()
+        
+        assert len(errors) == 1
+    
+    def test_writer_waits_for_long_writes(self, db_path, monkeypatch):
+        """Test that a write queues behind a write outlasting the reader timeout instead of failing"""
+        monkeypatch.setattr(db_pool, "DB_POOL_TIMEOUT_SECONDS", 0.05)
+        pool = ConnectionPool(db_path)
+        waited = []
+        
+        def write():
+            with pool.writer():
+                waited.append(True)
+        
+        with pool.writer():
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+        thread.join()
+        pool.close()
+        
+        assert waited == [True]
+    
+    def test_writer_timeout(self, db_path):
+        """Test that a writer checkout given a timeout gives up"""
+        pool = ConnectionPool(db_path)
+        errors = []
+        
+        def write():
+            try:
+                with pool.writer(timeout=0.05):
+                    pass
+            except PoolTimeoutError as e:
+                errors.append(e)
+        
+        with pool.writer():
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join()
+        pool.close()
+        
+        assert len(errors) == 1
+    
+    def test_writer_rolls_back_uncommitted_changes(self, db_path):
+        """Test that work left uncommitted by a failed write is discarded"""
+        with pytest.raises(ValueError):
+            with write_connection(db_path) as conn:
+                conn.execute("INSERT INTO users VALUES (2, 'Jane')")
+                raise ValueError("boom")
+        
+        with write_connection(db_path) as conn:
+            conn.execute("INSERT INTO users VALUES (3, 'Bob')")
+            conn.commit()
+        
+        with read_connection(db_path) as conn:
+            assert conn.execute("SELECT id FROM users ORDER BY id").fetchall() == [(1,), (3,)]
+    
+    def test_memory_database_is_not_pooled(self):
+        """Test that every in-memory checkout gets its own connection"""
+        with write_connection(":memory:") as conn:
+            conn.execute("CREATE TABLE t (id INTEGER)")
+        with read_connection(":memory:") as conn:
+            assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+    
+    def test_close_pools_forgets_pools(self, db_path):
+        """Test that closed pools are replaced by fresh ones"""
+        pool = get_pool(db_path)
+        close_pools()
+        
+        assert get_pool(db_path) is not pool
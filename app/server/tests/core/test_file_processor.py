@@ -1,6 +1,8 @@
+import io
+import sqlite3
 import pytest
 from pathlib import Path
-from core.file_processor import convert_csv_to_sqlite, convert_json_to_sqlite, convert_jsonl_to_sqlite, flatten_json_object, discover_jsonl_fields
+from core.file_processor import convert_csv_to_sqlite, convert_csv_stream_to_sqlite, convert_json_to_sqlite, convert_jsonl_to_sqlite, convert_jsonl_stream_to_sqlite, convert_json_stream_to_sqlite, convert_parquet_stream_to_sqlite, convert_arrow_stream_to_sqlite, iter_json_array, flatten_json_object, discover_jsonl_fields
 
 
 @pytest.fixture
@@ -86,6 +88,45 @@ class TestFileProcessor:
         
         assert "Error converting CSV to SQLite" in str(exc_info.value)
     
+    def test_convert_csv_stream_to_sqlite_multiple_chunks(self, test_db):
+        """Test streaming CSV ingest across several chunks"""
+        rows = "\n".join(f"{i},name_{i},{i * 1.5}" for i in range(25))
+        csv_stream = io.BytesIO(f"id,Full Name,score\n{rows}\n".encode('utf-8'))
+        
+        result = convert_csv_stream_to_sqlite(csv_stream, "scores", test_db, chunk_rows=10)
+        
+        assert result['row_count'] == 25
+        assert result['schema'] == {'id': 'INTEGER', 'full_name': 'TEXT', 'score': 'REAL'}
+        assert result['sample_data'][0] == {'id': 0, 'full_name': 'name_0', 'score': 0.0}
+        assert result['rows_per_second'] > 0
+        assert result['ingest_time_ms'] > 0
+    
+    def test_convert_csv_stream_to_sqlite_failure_keeps_previous_table(self, tmp_path):
+        """Test that a failed streaming ingest rolls back and keeps the old table"""
+        db_path = str(tmp_path / "test.db")
+        convert_csv_stream_to_sqlite(io.BytesIO(b"id,name,city\n1,John,NYC\n"), "users", db_path)
+        
+        broken = b"id,name,city\n" + b"2,Jane,LA\n" * 12 + b"3,Bob,SF,extra,fields\n" + b"4,Ann,LA\n" * 8
+        with pytest.raises(Exception) as exc_info:
+            convert_csv_stream_to_sqlite(io.BytesIO(broken), "users", db_path, chunk_rows=5)
+        
+        assert "Error converting CSV to SQLite" in str(exc_info.value)
+        
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT id, name, city FROM users").fetchall() == [(1, 'John', 'NYC')]
+        conn.close()
+    
+    def test_convert_csv_stream_to_sqlite_parallel_matches_serial(self, test_db, test_assets_dir):
+        """Test that parsing on a worker pool yields the same table as in-process parsing"""
+        csv_data = (test_assets_dir / "test_users.csv").read_bytes()
+        
+        serial = convert_csv_stream_to_sqlite(io.BytesIO(csv_data), "users", test_db, workers=1)
+        parallel = convert_csv_stream_to_sqlite(io.BytesIO(csv_data), "users", test_db, workers=2)
+        
+        assert parallel['schema'] == serial['schema']
+        assert parallel['row_count'] == serial['row_count']
+        assert parallel['sample_data'] == serial['sample_data']
+    
     def test_convert_json_to_sqlite_success(self, test_db, test_assets_dir):
         # Load real JSON file
         json_file = test_assets_dir / "test_products.json"
@@ -149,6 +190,50 @@ class TestFileProcessor:
         
         assert "JSON array is empty" in str(exc_info.value)
     
+    def test_iter_json_array_small_chunks(self):
+        """Test incremental parsing when elements straddle read boundaries"""
+        json_stream = io.BytesIO(b' [ {"id": 12345, "tags": ["a", "b"]},\n {"id": 67, "name": "\xc3\xa9t\xc3\xa9"} ] ')
+        
+        elements = list(iter_json_array(json_stream, chunk_size=3))
+        
+        assert elements == [
+            {"id": 12345, "tags": ["a", "b"]},
+            {"id": 67, "name": "\u00e9t\u00e9"}
+        ]
+    
+    def test_iter_json_array_trailing_data(self):
+        """Test that content after the top-level array is rejected"""
+        json_stream = io.BytesIO(b'[{"id": 1}] {"id": 2}')
+        
+        with pytest.raises(ValueError) as exc_info:
+            list(iter_json_array(json_stream))
+        
+        assert "unexpected data after top-level array" in str(exc_info.value)
+    
+    def test_convert_json_stream_to_sqlite_nested_values(self, test_db):
+        """Test streaming JSON ingest with differing keys and nested values"""
+        json_stream = io.BytesIO(
+            b'[{"id": 1, "Full Name": "Laptop", "specs": {"ram": 16}},'
+            b' {"id": 2, "price": 19.99, "tags": ["book"]}]'
+        )
+        
+        result = convert_json_stream_to_sqlite(json_stream, "items", test_db, batch_rows=1)
+        
+        assert result['row_count'] == 2
+        assert result['schema'] == {
+            'id': 'INTEGER', 'full_name': 'TEXT', 'specs': 'TEXT', 'price': 'REAL', 'tags': 'TEXT'
+        }
+        assert result['sample_data'][0]['specs'] == '{"ram": 16}'
+        assert result['sample_data'][1]['tags'] == '["book"]'
+        assert result['sample_data'][1]['full_name'] is None
+    
+    def test_convert_json_to_sqlite_array_of_primitives(self, test_db):
+        """Test that arrays of non-objects are rejected"""
+        with pytest.raises(Exception) as exc_info:
+            convert_json_to_sqlite(b'[1, 2, 3]', "test_table", test_db)
+        
+        assert "JSON must be an array of objects" in str(exc_info.value)
+    
     def test_flatten_json_object_nested_dict(self):
         """Test flattening nested dictionary objects"""
         obj = {
@@ -207,6 +292,43 @@ class TestFileProcessor:
         assert flatten_json_object(True) == {"": True}
         assert flatten_json_object(None) == {"": None}
     
+    def test_flatten_json_object_order_and_edge_cases(self):
+        """Test document order, empty containers, top-level lists and an explicit prefix"""
+        obj = {"b": 1, "a": {"y": [], "x": {}, "z": [{"k": None}]}, "c": [[1, 2], 3]}
+        
+        flattened = flatten_json_object(obj)
+        
+        assert list(flattened.items()) == [
+            ("b", 1), ("a__z_0__k", None), ("c_0_0", 1), ("c_0_1", 2), ("c_1", 3)
+        ]
+        assert flatten_json_object([{"id": 1}]) == {"_0__id": 1}
+        assert flatten_json_object({"id": 1}, "event") == {"event__id": 1}
+        assert flatten_json_object({}) == {}
+    
+    def test_flatten_json_object_deep_nesting(self):
+        """Test that deep documents do not hit the recursion limit"""
+        obj = leaf = {}
+        for _ in range(5000):
+            leaf["n"] = {}
+            leaf = leaf["n"]
+        leaf["value"] = 1
+        
+        flattened = flatten_json_object(obj)
+        
+        assert list(flattened.values()) == [1]
+        assert next(iter(flattened)).count("__") == 5000
+    
+    def test_flatten_json_object_key_path_cache_is_bounded(self, monkeypatch):
+        """Test that records with ever-new keys do not grow the key path cache without end"""
+        from core import file_processor
+        monkeypatch.setattr(file_processor, "KEY_PATH_CACHE_SIZE", 100)
+        monkeypatch.setattr(file_processor, "_dict_key_paths", file_processor._KeyPathCache())
+        
+        for i in range(1000):
+            assert flatten_json_object({"counts": {f"k{i}": 1}}) == {f"counts__k{i}": 1}
+        
+        assert len(file_processor._dict_key_paths) < 100
+    
     def test_discover_jsonl_fields_basic(self):
         """Test field discovery with basic JSONL content"""
         jsonl_content = b'{"name": "John", "age": 30}\n{"name": "Jane", "age": 25, "city": "NYC"}'
@@ -392,4 +514,339 @@ class TestFileProcessor:
         assert jane_data is not None
         assert jane_data['age'] is None
         assert jane_data['city'] == 'NYC'
-        assert jane_data['profile__bio'] == 'Engineer'
\ No newline at end of file
+        assert jane_data['profile__bio'] == 'Engineer'
+    
+    def test_convert_jsonl_stream_to_sqlite_widens_schema(self, test_db):
+        """Test that keys first seen in later batches widen the table"""
+        jsonl_stream = io.BytesIO(
+            b'{"id": 1, "name": "John"}\n'
+            b'{"id": 2, "name": "Jane"}\n'
+            b'{"id": 3, "profile": {"city": "NYC"}, "score": 9.5}\n'
+        )
+        
+        result = convert_jsonl_stream_to_sqlite(jsonl_stream, "people", test_db, batch_rows=1)
+        
+        assert result['row_count'] == 3
+        assert list(result['schema']) == ['id', 'name', 'profile__city', 'score']
+        assert result['schema']['score'] == 'REAL'
+        assert result['sample_data'][0] == {'id': 1, 'name': 'John', 'profile__city': None, 'score': None}
+        assert result['sample_data'][2] == {'id': 3, 'name': None, 'profile__city': 'NYC', 'score': 9.5}
+        assert result['rows_per_second'] > 0
+    
+    def test_convert_jsonl_stream_to_sqlite_types_from_first_value(self, test_db):
+        """Test that leading nulls do not force a column to TEXT"""
+        jsonl_stream = io.BytesIO(
+            b'{"id": 1, "age": null, "note": null}\n'
+            b'{"id": 2, "age": 30, "note": null}\n'
+        )
+        
+        result = convert_jsonl_stream_to_sqlite(jsonl_stream, "people", test_db)
+        
+        assert result['schema'] == {'id': 'INTEGER', 'age': 'INTEGER', 'note': 'TEXT'}
+        assert result['sample_data'][1]['age'] == 30
+    
+    def test_convert_jsonl_stream_to_sqlite_samples_column_types(self, test_db):
+        """Test that types come from a sample of values rather than the first one"""
+        jsonl_stream = io.BytesIO(
+            b'{"id": "1", "price": 10, "active": "true", "day": "2024-01-01", "seen_at": "2024-01-01T10:00:00Z"}\n'
+            b'{"id": "2", "price": 10.5, "active": "false", "day": "2024-01-02", "seen_at": "2024-01-02T11:30:00Z"}\n'
+        )
+        
+        result = convert_jsonl_stream_to_sqlite(jsonl_stream, "orders", test_db)
+        
+        assert result['schema'] == {
+            'id': 'INTEGER', 'price': 'REAL', 'active': 'BOOLEAN', 'day': 'DATE', 'seen_at': 'TIMESTAMP'
+        }
+        assert result['sample_data'][0]['id'] == 1
+        assert result['sample_data'][0]['active'] == 1
+        assert result['sample_data'][1]['active'] == 0
+        assert result['sample_data'][1]['day'] == '2024-01-02'
+    
+    def test_convert_csv_to_sqlite_infers_typed_columns(self, test_db):
+        """Test that CSV text columns holding dates or booleans get typed, and sparse ints stay INTEGER"""
+        csv_data = (
+            b"id,signup_date,last_login,verified,visits\n"
+            b"1,2024-01-05,2024-01-05 10:00:00,yes,3\n"
+            b"2,2024-02-10,2024-02-11T08:15:00,no,\n"
+            b"3,,,yes,7\n"
+        )
+        
+        result = convert_csv_to_sqlite(csv_data, "signups", test_db)
+        
+        assert result['schema'] == {
+            'id': 'INTEGER',
+            'signup_date': 'DATE',
+            'last_login': 'TIMESTAMP',
+            'verified': 'BOOLEAN',
+            'visits': 'INTEGER'
+        }
+        assert [row['verified'] for row in result['sample_data']] == [1, 0, 1]
+        assert [row['visits'] for row in result['sample_data']] == [3, None, 7]
+    
+    def test_convert_csv_to_sqlite_samples_beyond_first_rows(self, test_db):
+        """Test that a value past the first few dozen rows still keeps a column from being typed"""
+        csv_data = b"answer\n" + b"yes\nno\n" * 30 + b"maybe\n"
+        
+        result = convert_csv_to_sqlite(csv_data, "answers", test_db)
+        
+        assert result['schema'] == {'answer': 'TEXT'}
+        assert result['sample_data'][0]['answer'] == 'yes'
+    
+    def test_convert_jsonl_stream_to_sqlite_parallel_matches_serial(self, test_db, test_assets_dir):
+        """Test that parsing on a worker pool yields the same table as in-process parsing"""
+        jsonl_data = (test_assets_dir / "complex_data.jsonl").read_bytes()
+        
+        serial = convert_jsonl_stream_to_sqlite(io.BytesIO(jsonl_data), "events", test_db, workers=1)
+        parallel = convert_jsonl_stream_to_sqlite(io.BytesIO(jsonl_data), "events", test_db, workers=2)
+        
+        assert parallel['schema'] == serial['schema']
+        assert parallel['row_count'] == serial['row_count']
+        assert parallel['sample_data'] == serial['sample_data']
+    
+    def test_convert_jsonl_stream_to_sqlite_rows_before_first_value(self, test_db):
+        """Test rows that carry no non-null value before any column exists"""
+        jsonl_stream = io.BytesIO(b'{}\n{"error": null}\n{"id": 3}\n')
+        
+        result = convert_jsonl_stream_to_sqlite(jsonl_stream, "events", test_db)
+        
+        assert result['row_count'] == 3
+        assert result['schema'] == {'id': 'INTEGER', 'error': 'TEXT'}
+        assert [row['id'] for row in result['sample_data']] == [None, None, 3]
+    
+    def test_convert_csv_to_sqlite_append_mode(self, tmp_path):
+        """Test that append mode adds rows and widens the existing table"""
+        db_path = str(tmp_path / "test.db")
+        convert_csv_to_sqlite(b"id,name\n1,John\n", "users", db_path)
+        
+        result = convert_csv_to_sqlite(b"id,name,city\n2,Jane,LA\n", "users", db_path, mode="append")
+        
+        assert result['row_count'] == 2
+        assert result['rows_written'] == 1
+        assert list(result['schema']) == ['id', 'name', 'city']
+        assert result['sample_data'][0] == {'id': 1, 'name': 'John', 'city': None}
+        assert result['sample_data'][1] == {'id': 2, 'name': 'Jane', 'city': 'LA'}
+    
+    def test_convert_jsonl_to_sqlite_upsert_mode(self, tmp_path):
+        """Test that upsert mode updates rows with matching keys and inserts the rest"""
+        db_path = str(tmp_path / "test.db")
+        convert_jsonl_to_sqlite(
+            b'{"id": 1, "name": "John", "age": 30}\n{"id": 2, "name": "Jane", "age": 25}',
+            "users", db_path, mode="upsert", key_columns=["id"]
+        )
+        
+        result = convert_jsonl_to_sqlite(
+            b'{"id": 2, "name": "Jane", "age": 26}\n{"id": 3, "name": "Bob", "age": 40}',
+            "users", db_path, mode="upsert", key_columns=["id"]
+        )
+        
+        assert result['row_count'] == 3
+        assert result['rows_written'] == 2
+        ages = {row['id']: row['age'] for row in result['sample_data']}
+        assert ages == {1: 30, 2: 26, 3: 40}
+        
+        conn = sqlite3.connect(db_path)
+        index_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name='users'").fetchone()[0]
+        conn.close()
+        assert "UNIQUE" in index_sql
+    
+    def test_convert_csv_to_sqlite_upsert_rejects_duplicate_existing_keys(self, tmp_path):
+        """Test that upsert refuses a table whose rows are not unique on the key"""
+        db_path = str(tmp_path / "test.db")
+        convert_csv_to_sqlite(b"id,name\n1,John\n1,Johnny\n", "users", db_path)
+        
+        with pytest.raises(Exception) as exc_info:
+            convert_csv_to_sqlite(b"id,name\n1,Jo\n", "users", db_path, mode="upsert", key_columns=["id"])
+        
+        assert "not unique on key column(s) id" in str(exc_info.value)
+    
+    def test_convert_csv_to_sqlite_upsert_missing_key_column(self, test_db):
+        """Test that upsert keys must be present in the upload"""
+        with pytest.raises(Exception) as exc_info:
+            convert_csv_to_sqlite(b"id,name\n1,John\n", "users", test_db, mode="upsert", key_columns=["email"])
+        
+        assert "Key column(s) not found" in str(exc_info.value)
+    
+    def test_convert_csv_to_sqlite_invalid_mode(self, test_db):
+        """Test that unknown upload modes are rejected"""
+        with pytest.raises(Exception) as exc_info:
+            convert_csv_to_sqlite(b"id\n1\n", "users", test_db, mode="merge")
+        
+        assert "Unsupported upload mode 'merge'" in str(exc_info.value)
+    
+    ARRAY_JSONL = (
+        b'{"id": 1, "tags": ["a", "b", "c"], "items": [{"sku": "x", "qty": 2}, {"sku": "y", "qty": 1}]}\n'
+        b'{"id": 2, "tags": [], "items": [{"sku": "z", "qty": 5}]}\n'
+    )
+    
+    def test_convert_jsonl_array_strategy_json(self, tmp_path):
+        """Test that the json strategy keeps each array in one queryable column"""
+        db_path = str(tmp_path / "test.db")
+        result = convert_jsonl_to_sqlite(self.ARRAY_JSONL, "orders", db_path, array_strategy="json")
+        
+        assert list(result['schema']) == ['id', 'tags', 'items']
+        conn = sqlite3.connect(db_path)
+        skus = conn.execute(
+            "SELECT json_extract(value, '$.sku') FROM orders, json_each(orders.items) ORDER BY 1"
+        ).fetchall()
+        tags = conn.execute("SELECT json_array_length(tags) FROM orders ORDER BY id").fetchall()
+        conn.close()
+        assert skus == [('x',), ('y',), ('z',)]
+        assert tags == [(3,), (0,)]
+    
+    def test_convert_jsonl_array_strategy_first_k(self, tmp_path):
+        """Test that first_k keeps only the leading array elements as columns"""
+        db_path = str(tmp_path / "test.db")
+        result = convert_jsonl_to_sqlite(
+            self.ARRAY_JSONL, "orders", db_path, array_strategy="first_k", array_max_items=1
+        )
+        
+        assert list(result['schema']) == ['id', 'tags_0', 'items_0__sku', 'items_0__qty']
+        assert result['sample_data'][0]['tags_0'] == 'a'
+    
+    def test_convert_jsonl_array_strategy_child_table(self, tmp_path):
+        """Test that child_table moves elements to tables keyed by the parent rowid"""
+        db_path = str(tmp_path / "test.db")
+        result = convert_jsonl_to_sqlite(self.ARRAY_JSONL, "orders", db_path, array_strategy="child_table")
+        
+        assert list(result['schema']) == ['id', 'tags__count', 'items__count']
+        conn = sqlite3.connect(db_path)
+        items = conn.execute(
+            "SELECT o.id, i.item_index, i.sku, i.qty FROM orders o "
+            "JOIN orders__items i ON i.parent_rowid = o.rowid ORDER BY o.id, i.item_index"
+        ).fetchall()
+        tags = conn.execute("SELECT parent_rowid, item_index, value FROM orders__tags").fetchall()
+        conn.close()
+        assert items == [(1, 0, 'x', 2), (1, 1, 'y', 1), (2, 0, 'z', 5)]
+        assert tags == [(1, 0, 'a'), (1, 1, 'b'), (1, 2, 'c')]
+    
+    def test_convert_jsonl_child_table_append_continues_rowids(self, tmp_path):
+        """Test that appended parents and their children get fresh rowids"""
+        db_path = str(tmp_path / "test.db")
+        convert_jsonl_to_sqlite(self.ARRAY_JSONL, "orders", db_path, array_strategy="child_table")
+        convert_jsonl_to_sqlite(
+            b'{"id": 3, "tags": ["d"]}\n', "orders", db_path, mode="append", array_strategy="child_table"
+        )
+        
+        conn = sqlite3.connect(db_path)
+        tags = conn.execute(
+            "SELECT o.id, t.value FROM orders o JOIN orders__tags t ON t.parent_rowid = o.rowid ORDER BY t.rowid"
+        ).fetchall()
+        conn.close()
+        assert tags == [(1, 'a'), (1, 'b'), (1, 'c'), (3, 'd')]
+    
+    def test_convert_jsonl_child_table_replace_drops_stale_children(self, tmp_path):
+        """Test that replacing a table drops child tables the new data no longer fills"""
+        db_path = str(tmp_path / "test.db")
+        convert_jsonl_to_sqlite(self.ARRAY_JSONL, "orders", db_path, array_strategy="child_table")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE orders__archive (id INTEGER)")
+        conn.commit()
+        conn.close()
+        
+        convert_jsonl_to_sqlite(b'{"id": 3, "tags": ["d"]}\n', "orders", db_path, array_strategy="child_table")
+        
+        conn = sqlite3.connect(db_path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        tags = conn.execute("SELECT parent_rowid, value FROM orders__tags").fetchall()
+        conn.close()
+        assert 'orders__items' not in tables
+        assert 'orders__archive' in tables
+        assert tags == [(1, 'd')]
+    
+    def test_convert_jsonl_array_strategy_rejected(self, test_db):
+        """Test that unknown strategies and child tables with upsert are rejected"""
+        with pytest.raises(Exception) as exc_info:
+            convert_jsonl_to_sqlite(self.ARRAY_JSONL, "orders", test_db, array_strategy="explode")
+        assert "Unsupported array strategy 'explode'" in str(exc_info.value)
+        
+        with pytest.raises(Exception) as exc_info:
+            convert_jsonl_to_sqlite(
+                self.ARRAY_JSONL, "orders", test_db, mode="upsert", key_columns=["id"], array_strategy="child_table"
+            )
+        assert "not supported with upsert mode" in str(exc_info.value)
+
+
+class TestArrowIngest:
+    
+    def make_table(self, pa):
+        """Build a table covering scalar, temporal, nested and dictionary columns"""
+        import datetime
+        import decimal
+        return pa.table({
+            "id": pa.array([1, 2, 3], type=pa.int64()),
+            "Price": pa.array([decimal.Decimal("1.50"), None, decimal.Decimal("3.25")], type=pa.decimal128(10, 2)),
+            "active": [True, False, None],
+            "signed_up": pa.array([datetime.datetime(2024, 1, 1, 12, 30), None, datetime.datetime(2024, 3, 1)], type=pa.timestamp("us")),
+            "user": [{"name": "John", "tier": 1}, {"name": "Jane", "tier": 2}, None],
+            "tags": [["a", "b"], [], None],
+            "country": pa.array(["US", "DE", "US"]).dictionary_encode()
+        })
+    
+    def test_convert_parquet_stream_to_sqlite(self, tmp_path):
+        """Test that Parquet types map to SQLite affinities without inference"""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        
+        buffer = io.BytesIO()
+        pq.write_table(self.make_table(pa), buffer, row_group_size=2)
+        buffer.seek(0)
+        
+        result = convert_parquet_stream_to_sqlite(buffer, "events", str(tmp_path / "test.db"), batch_rows=2)
+        
+        assert result['row_count'] == 3
+        assert result['rows_written'] == 3
+        assert result['schema'] == {
+            'id': 'INTEGER',
+            'price': 'REAL',
+            'active': 'INTEGER',
+            'signed_up': 'TIMESTAMP',
+            'user__name': 'TEXT',
+            'user__tier': 'INTEGER',
+            'tags': 'TEXT',
+            'country': 'TEXT'
+        }
+        first, second, third = result['sample_data']
+        assert first['price'] == 1.5
+        assert first['signed_up'] == "2024-01-01 12:30:00"
+        assert first['user__name'] == "John"
+        assert first['tags'] == '["a", "b"]'
+        assert first['country'] == "US"
+        assert second['price'] is None
+        assert third['user__name'] is None
+        assert third['tags'] is None
+    
+    def test_convert_arrow_stream_to_sqlite_file_and_stream_formats(self, tmp_path):
+        """Test that both Arrow IPC layouts are read"""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2], "name": ["John", "Jane"]})
+        
+        for open_writer in (pa.ipc.new_file, pa.ipc.new_stream):
+            buffer = io.BytesIO()
+            with open_writer(buffer, table.schema) as writer:
+                writer.write_table(table)
+            buffer.seek(0)
+            
+            result = convert_arrow_stream_to_sqlite(buffer, "users", str(tmp_path / "test.db"))
+            assert result['row_count'] == 2
+            assert result['schema'] == {'id': 'INTEGER', 'name': 'TEXT'}
+    
+    def test_convert_parquet_stream_to_sqlite_empty_file_keeps_schema(self, tmp_path):
+        """Test that a Parquet file with no rows still creates typed columns"""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        
+        buffer = io.BytesIO()
+        pq.write_table(pa.table({"id": pa.array([], type=pa.int32()), "score": pa.array([], type=pa.float64())}), buffer)
+        buffer.seek(0)
+        
+        result = convert_parquet_stream_to_sqlite(buffer, "empty", str(tmp_path / "test.db"))
+        assert result['row_count'] == 0
+        assert result['schema'] == {'id': 'INTEGER', 'score': 'REAL'}
+    
+    def test_convert_parquet_stream_to_sqlite_invalid_file(self, tmp_path):
+        """Test that a non-Parquet upload is reported as a conversion error"""
+        pytest.importorskip("pyarrow")
+        
+        with pytest.raises(Exception) as exc_info:
+            convert_parquet_stream_to_sqlite(io.BytesIO(b"id,name\n1,John\n"), "bad", str(tmp_path / "test.db"))
+        assert "Error converting Parquet to SQLite" in str(exc_info.value)
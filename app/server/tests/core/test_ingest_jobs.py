@@ -0,0 +1,87 @@
+import io
+import os
+import time
+from core.ingest_jobs import ProgressReader, spool_upload, submit_ingest_job, get_ingest_job
+from core.file_processor import convert_jsonl_stream_to_sqlite
+from core.upload_cache import hash_stream
+
+
+JSONL_CONTENT = b"".join(b'{"id": %d, "name": "user_%d"}\n' % (i, i) for i in range(50))
+
+
+def wait_for(job, timeout=10):
+    """Poll a job until it leaves the queued/running states"""
+    deadline = time.time() + timeout
+    while job.status in ("queued", "running"):
+        assert time.time() < deadline, "ingest job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+class TestIngestJobs:
+
+    def test_progress_reader_counts_bytes(self):
+        """Test that the buffered wrapper reads lines and reports consumed bytes"""
+        counted = []
+        stream = io.BufferedReader(ProgressReader(io.BytesIO(JSONL_CONTENT), counted.append))
+
+        assert len(list(stream)) == 50
+        assert sum(counted) == len(JSONL_CONTENT)
+
+    def test_spool_upload(self):
+        """Test that spooling copies and hashes the upload in one pass"""
+        path, size, content_hash = spool_upload(io.BytesIO(JSONL_CONTENT), ".jsonl")
+        try:
+            with open(path, "rb") as f:
+                assert f.read() == JSONL_CONTENT
+            assert size == len(JSONL_CONTENT)
+            assert content_hash == hash_stream(io.BytesIO(JSONL_CONTENT))
+        finally:
+            os.remove(path)
+
+    def test_spool_upload_without_hash(self):
+        """Test that uploads which cannot be cached are copied without hashing"""
+        path, size, content_hash = spool_upload(io.BytesIO(JSONL_CONTENT), hashed=False)
+        try:
+            assert size == len(JSONL_CONTENT)
+            assert content_hash is None
+        finally:
+            os.remove(path)
+
+    def test_job_reports_progress_and_result(self, tmp_path):
+        """Test that a job runs the ingest in the background and tracks its progress"""
+        db_path = str(tmp_path / "test.db")
+        path, size, content_hash = spool_upload(io.BytesIO(JSONL_CONTENT))
+
+        def ingest(stream, upload_hash, progress):
+            assert upload_hash == content_hash
+            return convert_jsonl_stream_to_sqlite(stream, "users", db_path, batch_rows=10, progress_callback=progress)
+
+        job = wait_for(submit_ingest_job("users.jsonl", path, size, content_hash, ingest))
+
+        assert job.status == "succeeded"
+        assert job.result['row_count'] == 50
+        assert job.rows_written == 50
+        assert job.bytes_processed == job.bytes_total == size
+        assert job.eta_seconds is None
+        assert get_ingest_job(job.job_id) is job
+        assert not os.path.exists(path)
+
+    def test_failed_job_keeps_error(self, tmp_path):
+        """Test that conversion errors end the job as failed with the message"""
+        db_path = str(tmp_path / "test.db")
+        path, size, content_hash = spool_upload(io.BytesIO(b'{"id": 1}\nnot json\n'))
+
+        job = wait_for(submit_ingest_job(
+            "bad.jsonl", path, size, content_hash,
+            lambda stream, upload_hash, progress: convert_jsonl_stream_to_sqlite(stream, "bad", db_path)
+        ))
+
+        assert job.status == "failed"
+        assert "Invalid JSON on line 2" in job.error
+        assert job.result is None
+        assert not os.path.exists(path)
+
+    def test_unknown_job(self):
+        """Test that an unknown id has no job"""
+        assert get_ingest_job("missing") is None
@@ -5,9 +5,21 @@ from core.llm_processor import (
     generate_sql_with_openai, 
     generate_sql_with_anthropic, 
     format_schema_for_prompt,
-    generate_sql
+    generate_sql,
+    get_llm_client,
+    warm_llm_clients,
+    close_llm_clients
 )
 from core.data_models import QueryRequest
+from core.constants import LLM_CONNECT_TIMEOUT_SECONDS, LLM_TIMEOUT_SECONDS
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_clients():
+    """Give every test its own provider clients, so mocked classes take effect"""
+    close_llm_clients()
+    yield
+    close_llm_clients()
 
 
 class TestLLMProcessor:
@@ -284,4 +296,67 @@ class TestLLMProcessor:
             result = generate_sql(request, schema_info)
             
             assert result == "SELECT * FROM sales"
-            mock_openai_func.assert_called_once_with("Show sales data", schema_info)
\ No newline at end of file
+            mock_openai_func.assert_called_once_with("Show sales data", schema_info)
+
+
+class TestLLMClients:
+    
+    @patch('core.llm_processor.OpenAI')
+    def test_client_reused_across_calls(self, mock_openai_class):
+        """Test that repeated generations share one client instead of creating one per call"""
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value.choices[0].message.content = "SELECT 1"
+        
+        with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'}):
+            generate_sql_with_openai("first", {'tables': {}})
+            generate_sql_with_openai("second", {'tables': {}})
+        
+        mock_openai_class.assert_called_once()
+        assert mock_client.chat.completions.create.call_count == 2
+    
+    @patch('core.llm_processor.Anthropic')
+    def test_client_configured_with_timeouts(self, mock_anthropic_class):
+        """Test that clients get the configured timeouts and a dedicated HTTP client"""
+        get_llm_client("anthropic", "test-key")
+        
+        kwargs = mock_anthropic_class.call_args.kwargs
+        assert kwargs['api_key'] == "test-key"
+        assert kwargs['timeout'].read == LLM_TIMEOUT_SECONDS
+        assert kwargs['timeout'].connect == LLM_CONNECT_TIMEOUT_SECONDS
+        assert kwargs['http_client'] is not None
+    
+    @patch('core.llm_processor.OpenAI')
+    def test_new_api_key_replaces_client(self, mock_openai_class):
+        """Test that a rotated API key gets a new client"""
+        mock_openai_class.side_effect = lambda **kwargs: MagicMock()
+        
+        first = get_llm_client("openai", "old-key")
+        assert get_llm_client("openai", "old-key") is first
+        assert get_llm_client("openai", "new-key") is not first
+        assert mock_openai_class.call_count == 2
+    
+    def test_unknown_provider(self):
+        """Test that an unknown provider is rejected"""
+        with pytest.raises(ValueError, match="Unknown LLM provider"):
+            get_llm_client("other", "test-key")
+    
+    @patch('core.llm_processor.Anthropic')
+    @patch('core.llm_processor.OpenAI')
+    def test_warm_creates_configured_providers(self, mock_openai_class, mock_anthropic_class):
+        """Test that warming creates clients only for providers with a key"""
+        with patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'test-key'}, clear=True):
+            assert warm_llm_clients() == ["anthropic"]
+        
+        mock_openai_class.assert_not_called()
+        mock_anthropic_class.assert_called_once()
+    
+    @patch('core.llm_processor.OpenAI')
+    def test_close_closes_clients(self, mock_openai_class):
+        """Test that closing shuts clients down and the next call creates a new one"""
+        mock_openai_class.side_effect = lambda **kwargs: MagicMock()
+        
+        first = get_llm_client("openai", "test-key")
+        close_llm_clients()
+        
+        first.close.assert_called_once()
+        assert get_llm_client("openai", "test-key") is not first
@@ -0,0 +1,71 @@
+import io
+import pytest
+from core.parallel_ingest import close_executors, get_executor, iter_line_shards, map_shards_ordered
+from core.file_processor import parse_jsonl_shard
+
+
+class TestParallelIngest:
+    
+    def test_iter_line_shards_cuts_on_line_boundaries(self):
+        """Test that every shard ends on a line break and line numbers carry over"""
+        stream = io.BytesIO(b"aaaa\nbb\ncccccc\nd\n")
+        
+        shards = list(iter_line_shards(stream, shard_bytes=6))
+        
+        assert b"".join(shard for shard, _ in shards) == b"aaaa\nbb\ncccccc\nd\n"
+        assert all(shard.endswith(b"\n") for shard, _ in shards)
+        assert [line for _, line in shards] == [1, 2, 3]
+    
+    def test_iter_line_shards_without_trailing_newline(self):
+        """Test that the final partial line is still emitted"""
+        stream = io.BytesIO(b"one\ntwo")
+        
+        shards = list(iter_line_shards(stream, shard_bytes=100))
+        
+        assert shards == [(b"one\n", 1), (b"two", 2)]
+    
+    def test_iter_line_shards_quote_aware(self):
+        """Test that CSV shards are never cut inside a quoted field"""
+        data = b'1,"multi\nline\nvalue"\n2,plain\n3,"a ""quoted"" word"\n'
+        
+        shards = list(iter_line_shards(io.BytesIO(data), shard_bytes=4, quote_aware=True))
+        
+        assert [shard for shard, _ in shards] == [
+            b'1,"multi\nline\nvalue"\n',
+            b'2,plain\n',
+            b'3,"a ""quoted"" word"\n'
+        ]
+        assert [line for _, line in shards] == [1, 4, 5]
+    
+    def test_map_shards_ordered_preserves_order(self):
+        """Test that worker results come back in file order"""
+        lines = [f'{{"id": {i}, "user": {{"name": "u{i}"}}}}' for i in range(200)]
+        stream = io.BytesIO("\n".join(lines).encode("utf-8"))
+        
+        results = map_shards_ordered(stream, parse_jsonl_shard, 2, shard_bytes=256)
+        records = [record for shard in results for record in shard]
+        
+        assert [record["id"] for record in records] == list(range(200))
+        assert records[7] == {"id": 7, "user__name": "u7"}
+    
+    def test_map_shards_ordered_reports_absolute_line_numbers(self):
+        """Test that parse errors in later shards report the line in the whole file"""
+        lines = [f'{{"id": {i}}}' for i in range(50)]
+        lines[41] = '{broken'
+        stream = io.BytesIO("\n".join(lines).encode("utf-8"))
+        
+        with pytest.raises(ValueError) as exc_info:
+            list(map_shards_ordered(stream, parse_jsonl_shard, 2, shard_bytes=64))
+        
+        assert "Invalid JSON on line 42" in str(exc_info.value)
+    
+    def test_executors_spawn_workers_and_close(self):
+        """Test that pools start workers with spawn and are replaced after closing"""
+        executor = get_executor(2)
+        assert executor._mp_context.get_start_method() == "spawn"
+        assert get_executor(2) is executor
+        
+        close_executors()
+        
+        assert get_executor(2) is not executor
+        close_executors()
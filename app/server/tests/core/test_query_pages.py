@@ -0,0 +1,38 @@
+from core import query_pages
+from core.query_pages import create_page_token, resolve_page_token
+
+
+class TestQueryPages:
+    
+    def test_token_resolves_to_next_page(self):
+        """Test that a token can be resolved, also more than once"""
+        token = create_page_token("SELECT * FROM users", 100, 50)
+        
+        expected = {'sql': "SELECT * FROM users", 'offset': 100, 'page_size': 50, 'result_format': "records"}
+        assert resolve_page_token(token) == expected
+        assert resolve_page_token(token) == expected
+    
+    def test_token_keeps_result_format(self):
+        """Test that later pages use the layout of the first one"""
+        token = create_page_token("SELECT 1", 1, 1, "columns")
+        
+        assert resolve_page_token(token)['result_format'] == "columns"
+    
+    def test_unknown_token(self):
+        """Test that unknown tokens resolve to None"""
+        assert resolve_page_token("missing") is None
+    
+    def test_expired_token(self, monkeypatch):
+        """Test that tokens stop resolving after their lifetime"""
+        monkeypatch.setattr(query_pages, "QUERY_TOKEN_TTL_SECONDS", -1)
+        token = create_page_token("SELECT 1", 1, 1)
+        
+        assert resolve_page_token(token) is None
+    
+    def test_oldest_tokens_are_dropped(self, monkeypatch):
+        """Test that only the newest tokens are kept"""
+        monkeypatch.setattr(query_pages, "QUERY_TOKEN_HISTORY", 2)
+        tokens = [create_page_token("SELECT 1", i, 1) for i in range(3)]
+        
+        assert resolve_page_token(tokens[0]) is None
+        assert resolve_page_token(tokens[2])['offset'] == 2
@@ -0,0 +1,123 @@
+import sqlite3
+import pytest
+from core.result_cache import (
+    ResultCache,
+    bump_table_versions,
+    current_version,
+    lookup_result,
+    normalize_sql,
+    store_result,
+    track_reads,
+)
+
+
+@pytest.fixture
+def conn():
+    """In-memory database with two small tables"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+    conn.execute("CREATE TABLE orders (id INTEGER, user_id INTEGER)")
+    yield conn
+    conn.close()
+
+
+def run_and_store(conn, sql, key="k", db_path="cache_test.db"):
+    version = current_version()
+    with track_reads(conn) as reads:
+        rows = conn.execute(sql).fetchall()
+    result = {'rows': rows}
+    store_result(key, result, sql, reads, version, db_path)
+    return reads
+
+
+class TestNormalizeSql:
+    
+    def test_collapses_whitespace_and_semicolons(self):
+        """Test that formatting differences map to one key"""
+        assert normalize_sql("SELECT *\n  FROM   users ;") == normalize_sql("SELECT * FROM users")
+    
+    def test_keeps_string_literals(self):
+        """Test that whitespace inside literals still distinguishes queries"""
+        assert normalize_sql("SELECT 'a  b'") == "SELECT 'a  b'"
+    
+    def test_comments_do_not_swallow_the_next_line(self):
+        """Test that a line comment cannot merge with the SQL after it"""
+        assert normalize_sql("SELECT a FROM t1 -- note\n, t2") == "SELECT a FROM t1 , t2"
+        assert normalize_sql("SELECT /* x */ a") == "SELECT a"
+
+
+class TestTrackReads:
+    
+    def test_records_tables_read(self, conn):
+        """Test that joined tables are reported by the authorizer"""
+        with track_reads(conn) as reads:
+            conn.execute("SELECT u.name FROM users u JOIN orders o ON o.user_id = u.id")
+        
+        assert reads.tables == {'users', 'orders'}
+        assert reads.volatile is False
+    
+    def test_marks_volatile_queries(self, conn):
+        """Test that random() and sqlite_master reads are not cacheable"""
+        with track_reads(conn) as reads:
+            conn.execute("SELECT random()")
+        assert reads.volatile is True
+        
+        with track_reads(conn) as reads:
+            conn.execute("SELECT name FROM sqlite_master")
+        assert reads.volatile is True
+
+
+class TestResultCache:
+    
+    def test_hit_until_table_written(self, conn):
+        """Test that a write to a table read by the query invalidates its result"""
+        run_and_store(conn, "SELECT * FROM users")
+        assert lookup_result("k", "cache_test.db") == {'rows': []}
+        
+        bump_table_versions(["orders"], "cache_test.db")
+        assert lookup_result("k", "cache_test.db") is not None
+        
+        bump_table_versions(["users"], "cache_test.db")
+        assert lookup_result("k", "cache_test.db") is None
+    
+    def test_write_during_query_is_not_cached(self, conn):
+        """Test that results computed across a write are dropped"""
+        version = current_version()
+        with track_reads(conn) as reads:
+            conn.execute("SELECT * FROM users").fetchall()
+        bump_table_versions(["users"], "cache_test.db")
+        store_result("k", {'rows': []}, "SELECT * FROM users", reads, version, "cache_test.db")
+        
+        assert lookup_result("k", "cache_test.db") is None
+    
+    def test_clock_queries_are_not_cached(self, conn):
+        """Test that date('now') results are never served from cache"""
+        run_and_store(conn, "SELECT date('now') FROM users")
+        
+        assert lookup_result("k", "cache_test.db") is None
+    
+    def test_memory_databases_are_not_cached(self, conn):
+        """Test that ':memory:' results are not shared between connections"""
+        run_and_store(conn, "SELECT * FROM users", db_path=":memory:")
+        
+        assert lookup_result("k", ":memory:") is None
+    
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test that the byte budget evicts the oldest unused entries"""
+        cache = ResultCache(max_bytes=3500, max_entry_bytes=3500)
+        entry = {'rows': [(i, "x" * 20) for i in range(5)]}
+        for key in "abc":
+            cache.put(key, entry, "db", {})
+        cache.get("a")
+        cache.put("d", entry, "db", {})
+        
+        assert cache.size_bytes <= 3500
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+    
+    def test_skips_oversized_entries(self):
+        """Test that a result larger than the entry limit is not cached"""
+        cache = ResultCache(max_bytes=10_000, max_entry_bytes=100)
+        
+        assert cache.put("big", {'rows': list(range(100))}, "db", {}) is False
+        assert len(cache) == 0
@@ -0,0 +1,105 @@
+import sqlite3
+import pytest
+from core.schema_catalog import SchemaCatalog, cached_schema
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a file database with one table"""
+    path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE users (id INTEGER)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def catalog(db_path):
+    catalog = SchemaCatalog(db_path)
+    yield catalog
+    catalog.close()
+
+
+class CountingLoader:
+    """Schema loader that reads the table names and counts its calls"""
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        conn = sqlite3.connect(self.db_path)
+        names = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        count = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        conn.close()
+        return {'tables': {name: {'row_count': count} for name in names}}
+
+
+class TestSchemaCatalog:
+    
+    def test_unchanged_database_is_loaded_once(self, catalog, db_path):
+        """Test that repeated lookups reuse the cached schema"""
+        load = CountingLoader(db_path)
+        
+        assert catalog.get(load) == catalog.get(load) == {'tables': {'users': {'row_count': 0}}}
+        assert load.calls == 1
+    
+    def test_data_change_reloads(self, catalog, db_path):
+        """Test that a commit from another connection is noticed through data_version"""
+        load = CountingLoader(db_path)
+        catalog.get(load)
+        
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO users VALUES (1)")
+        conn.commit()
+        conn.close()
+        
+        assert catalog.get(load)['tables']['users']['row_count'] == 1
+        assert load.calls == 2
+    
+    def test_schema_change_reloads(self, catalog, db_path):
+        """Test that new tables are noticed through schema_version"""
+        load = CountingLoader(db_path)
+        catalog.get(load)
+        
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE orders (id INTEGER)")
+        conn.commit()
+        conn.close()
+        
+        assert set(catalog.get(load)['tables']) == {'users', 'orders'}
+    
+    def test_invalidate_reloads(self, catalog, db_path):
+        """Test that an explicit invalidation forces the next lookup to load"""
+        load = CountingLoader(db_path)
+        catalog.get(load)
+        catalog.invalidate()
+        catalog.get(load)
+        
+        assert load.calls == 2
+    
+    def test_returns_copies(self, catalog, db_path):
+        """Test that callers cannot change the cached schema"""
+        load = CountingLoader(db_path)
+        catalog.get(load)['tables'].clear()
+        
+        assert 'users' in catalog.get(load)['tables']
+    
+    def test_failed_load_is_not_cached(self, catalog, db_path):
+        """Test that a loader error propagates and the next lookup retries"""
+        def fail():
+            raise sqlite3.Error("boom")
+        
+        with pytest.raises(sqlite3.Error):
+            catalog.get(fail)
+        assert catalog.get(CountingLoader(db_path))['tables']
+    
+    def test_memory_database_is_not_cached(self):
+        """Test that in-memory databases always load fresh"""
+        results = iter([{'tables': {}}, {'tables': {'t': {}}}])
+        
+        assert cached_schema(lambda: next(results), ":memory:") == {'tables': {}}
+        assert cached_schema(lambda: next(results), ":memory:") == {'tables': {'t': {}}}
@@ -0,0 +1,49 @@
+import pytest
+from core.schema_inference import infer_column_type, infer_record_types, coerce_boolean, coerce_boolean_columns
+
+
+class TestSchemaInference:
+
+    @pytest.mark.parametrize("values,expected", [
+        (["1", "-2", "+3"], "INTEGER"),
+        ([1, 2, None], "INTEGER"),
+        (["1", "2.5", "1e3"], "REAL"),
+        ([1, 2.5], "REAL"),
+        (["true", "False", "YES", "no"], "BOOLEAN"),
+        ([True, False], "BOOLEAN"),
+        ([True, 2], "INTEGER"),
+        (["2024-01-31", "2023-12-01"], "DATE"),
+        (["2024-01-31", "2024-02-01T10:30:00Z", "2024-02-01 10:30:00.123+05:30"], "TIMESTAMP"),
+        (["00123", "1"], "TEXT"),
+        (["12", "abc"], "TEXT"),
+        (["2024-13-01"], "TEXT"),
+        (["e5"], "TEXT"),
+        ([str(2 ** 64)], "REAL"),
+        ([{"a": 1}], "TEXT"),
+    ])
+    def test_infer_column_type(self, values, expected):
+        """Test that the most specific type fitting every value is chosen"""
+        assert infer_column_type(values) == expected
+
+    def test_all_null_sample_is_unknown(self):
+        """Test that a sample without values leaves the type undecided"""
+        assert infer_column_type([None, float("nan")]) is None
+        assert infer_column_type([]) is None
+
+    def test_infer_record_types(self):
+        """Test per-column inference over records with varying keys"""
+        records = [
+            {"id": 1, "active": "true", "joined": None},
+            {"id": 2, "active": "false", "joined": "2024-01-01", "score": "9.5"},
+        ]
+        assert infer_record_types(records) == {
+            "id": "INTEGER", "active": "BOOLEAN", "joined": "DATE", "score": "REAL"
+        }
+
+    def test_coerce_boolean(self):
+        """Test that boolean spellings become 1/0 and other values pass through"""
+        assert [coerce_boolean(v) for v in ["True", " no ", True, False, None, "maybe", 5]] == [1, 0, 1, 0, None, "maybe", 5]
+        assert coerce_boolean_columns([("a", "yes"), ("b", "no")], [1]) == [["a", 1], ["b", 0]]
+
+        rows = [("a", "yes")]
+        assert coerce_boolean_columns(rows, []) is rows
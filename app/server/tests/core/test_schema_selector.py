@@ -0,0 +1,128 @@
+import sqlite3
+import pytest
+from core.schema_selector import (
+    get_schema_index,
+    identifier_terms,
+    select_schema,
+    value_terms,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Database with a few related tables among many unrelated ones"""
+    path = str(tmp_path / "catalog.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE customers (id INTEGER, name TEXT, city TEXT)")
+    conn.executemany("INSERT INTO customers VALUES (?, ?, ?)", [(1, "Ann", "Lisbon"), (2, "Bo", "Oslo")])
+    conn.execute("CREATE TABLE orders (id INTEGER, customer_id INTEGER, total REAL)")
+    conn.execute("CREATE TABLE products (id INTEGER, title TEXT, category TEXT)")
+    conn.executemany("INSERT INTO products VALUES (?, ?, ?)", [(1, "Kettle", "Kitchen"), (2, "Lamp", "Lighting")])
+    for i in range(30):
+        conn.execute(f"CREATE TABLE sensor_{i} (reading_id INTEGER, celsius REAL)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def schema_of(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {}
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table'"):
+        columns = {row[1]: row[2] for row in conn.execute(f'PRAGMA table_info("{name}")')}
+        tables[name] = {'columns': columns, 'row_count': 2}
+    conn.close()
+    return {'tables': tables}
+
+
+class TestTerms:
+    
+    def test_identifier_terms(self):
+        """Test that names split at underscores and camel case into singular words"""
+        assert identifier_terms("order_items") == {"order", "item"}
+        assert identifier_terms("unitPrice") == {"unit", "price"}
+    
+    def test_value_terms(self):
+        """Test that only short text values are indexed"""
+        assert value_terms("Kitchen Appliances") == {"kitchen", "appliance"}
+        assert value_terms(42) == frozenset()
+        assert value_terms("x" * 100) == frozenset()
+
+
+class TestSelectSchema:
+    
+    def test_keeps_matching_tables(self, db_path):
+        """Test that only tables named by the question are described"""
+        selected = select_schema("list all products", schema_of(db_path), db_path)
+        
+        assert list(selected['tables']) == ["products"]
+    
+    def test_adds_referenced_tables(self, db_path):
+        """Test that tables that *_id columns point to come along"""
+        selected = select_schema("average order total", schema_of(db_path), db_path)
+        
+        assert set(selected['tables']) == {"orders", "customers"}
+    
+    def test_matches_sample_values(self, db_path):
+        """Test that values in the data select their table"""
+        selected = select_schema("how many are in the kitchen category?", schema_of(db_path), db_path)
+        
+        assert "products" in selected['tables']
+        assert "customers" not in selected['tables']
+    
+    def test_prompt_size_does_not_grow_with_catalog(self, db_path):
+        """Test that the selection stays bounded however many tables exist"""
+        schema_info = schema_of(db_path)
+        
+        selected = select_schema("customers in Lisbon", schema_info, db_path, max_tables=3)
+        
+        assert len(schema_info['tables']) == 33
+        assert list(selected['tables']) == ["customers", "orders"]
+    
+    def test_small_schema_is_used_in_full(self, db_path):
+        """Test that nothing is pruned when everything fits"""
+        schema_info = schema_of(db_path)
+        
+        assert select_schema("products", schema_info, db_path, max_tables=50) is schema_info
+    
+    def test_no_match_falls_back_to_full_schema(self, db_path):
+        """Test that a question matching no table gets the whole schema"""
+        schema_info = schema_of(db_path)
+        
+        assert select_schema("what is the weather like", schema_info, db_path) is schema_info
+    
+    def test_ambiguous_ranking_falls_back_to_full_schema(self, db_path):
+        """Test that more tied best tables than fit the prompt give the whole schema"""
+        schema_info = schema_of(db_path)
+        
+        assert select_schema("celsius readings", schema_info, db_path) is schema_info
+    
+    def test_wide_tables_keep_matching_and_key_columns(self, tmp_path):
+        """Test that wide tables are cut to the column limit, most relevant first"""
+        path = str(tmp_path / "wide.db")
+        columns = {'id': 'INTEGER', **{f'metric_{i}': 'REAL' for i in range(10)}, 'revenue': 'REAL'}
+        schema_info = {'tables': {'sales': {'columns': columns, 'row_count': 0}}}
+        sqlite3.connect(path).execute(
+            "CREATE TABLE sales (" + ", ".join(f"{name} {kind}" for name, kind in columns.items()) + ")"
+        )
+        
+        selected = select_schema("sales revenue", schema_info, path, max_columns=3)
+        
+        assert list(selected['tables']['sales']['columns']) == ['id', 'metric_0', 'revenue']
+    
+    def test_index_follows_schema_changes(self, db_path):
+        """Test that new tables are indexed and dropped ones forgotten"""
+        schema_info = schema_of(db_path)
+        select_schema("products", schema_info, db_path)
+        assert len(get_schema_index(db_path)) == 33
+        
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE products")
+        conn.execute("CREATE TABLE invoices (id INTEGER, amount REAL)")
+        conn.commit()
+        conn.close()
+        
+        selected = select_schema("invoice amounts", schema_of(db_path), db_path)
+        
+        assert list(selected['tables']) == ["invoices"]
+        assert len(get_schema_index(db_path)) == 33
@@ -1,7 +1,10 @@
 import pytest
 import sqlite3
 from unittest.mock import patch
-from core.sql_processor import execute_sql_safely, get_database_schema
+from core import sql_processor
+from core.export_utils import encode_arrow_ipc, encode_ndjson
+from core.sql_processor import execute_sql_safely, get_database_schema, stream_sql_safely
+from core.sql_security import SQLSecurityError
 
 
 @pytest.fixture
@@ -40,9 +43,9 @@ def test_db():
     
     conn.commit()
     
-    # Patch the database connection to use our in-memory database
-    with patch('core.sql_processor.sqlite3.connect') as mock_connect:
-        mock_connect.return_value = conn
+    # Patch the pooled database connection to use our in-memory database
+    with patch('core.sql_processor.read_connection') as mock_read_connection:
+        mock_read_connection.return_value.__enter__.return_value = conn
         yield conn
     
     conn.close()
@@ -148,16 +151,16 @@ class TestSQLProcessor:
     
     def test_get_database_schema_empty_database(self):
         # Test with empty in-memory database
-        with patch('core.sql_processor.sqlite3.connect') as mock_connect:
+        with patch('core.sql_processor.read_connection') as mock_read_connection:
             conn = sqlite3.connect(':memory:')
-            mock_connect.return_value = conn
+            mock_read_connection.return_value.__enter__.return_value = conn
             
             result = get_database_schema()
             assert result == {'tables': {}}
     
     def test_get_database_schema_error(self):
         # Test database connection error
-        with patch('core.sql_processor.sqlite3.connect', side_effect=sqlite3.Error("Connection failed")):
+        with patch('core.sql_processor.read_connection', side_effect=sqlite3.Error("Connection failed")):
             result = get_database_schema()
             
             assert result == {'tables': {}, 'error': 'Connection failed'}
@@ -178,4 +181,133 @@ class TestSQLProcessor:
         for keyword, query in dangerous_operations:
             result = execute_sql_safely(query)
             assert result['error'] is not None
-            # Query should be blocked
\ No newline at end of file
+            # Query should be blocked
+
+class TestQueryPagination:
+    
+    def test_first_page_reports_more_rows(self, test_db):
+        """Test that only one page is read and has_more flags the rest"""
+        result = execute_sql_safely("SELECT name FROM users ORDER BY id", page_size=2)
+        
+        assert [row['name'] for row in result['results']] == ['John', 'Jane']
+        assert result['has_more'] is True
+        assert result['truncated'] is False
+    
+    def test_offset_continues_result(self, test_db):
+        """Test that a later page skips the rows already delivered"""
+        result = execute_sql_safely("SELECT name FROM users ORDER BY id", page_size=2, offset=2)
+        
+        assert [row['name'] for row in result['results']] == ['Bob']
+        assert result['has_more'] is False
+    
+    def test_hard_cap_truncates_result(self, test_db, monkeypatch):
+        """Test that no page reaches past QUERY_MAX_ROWS"""
+        monkeypatch.setattr("core.sql_processor.QUERY_MAX_ROWS", 2)
+        
+        result = execute_sql_safely("SELECT name FROM users ORDER BY id")
+        
+        assert len(result['results']) == 2
+        assert result['has_more'] is False
+        assert result['truncated'] is True
+
+
+class TestResultFormats:
+    
+    def test_rows_format(self, test_db):
+        """Test that rows are returned as value lists ordered like columns"""
+        result = execute_sql_safely("SELECT id, name FROM users ORDER BY id", page_size=2, result_format="rows")
+        
+        assert result['error'] is None
+        assert result['columns'] == ['id', 'name']
+        assert [list(row) for row in result['rows']] == [[1, 'John'], [2, 'Jane']]
+        assert result['results'] == []
+        assert result['has_more'] is True
+    
+    def test_columns_format(self, test_db):
+        """Test that values are returned as one list per column"""
+        result = execute_sql_safely("SELECT id, name FROM users ORDER BY id", result_format="columns")
+        
+        assert result['columns'] == ['id', 'name']
+        assert result['column_data'] == [[1, 2, 3], ['John', 'Jane', 'Bob']]
+    
+    def test_compact_formats_keep_columns_of_empty_result(self, test_db):
+        """Test that column names come from the cursor, not the first row"""
+        result = execute_sql_safely("SELECT id, name FROM users WHERE age > 100", result_format="columns")
+        
+        assert result['columns'] == ['id', 'name']
+        assert result['column_data'] == [[], []]
+    
+    def test_invalid_format(self, test_db):
+        """Test that unknown result formats are rejected"""
+        result = execute_sql_safely("SELECT * FROM users", result_format="xml")
+        
+        assert "Invalid result format" in result['error']
+
+
+class TestStreamSqlSafely:
+    
+    def test_streams_rows(self, test_db):
+        """Test that the result is encoded chunk by chunk"""
+        data = b"".join(stream_sql_safely("SELECT name FROM users ORDER BY id", encode_ndjson))
+        
+        assert data.decode().splitlines() == ['{"name": "John"}', '{"name": "Jane"}', '{"name": "Bob"}']
+    
+    def test_stops_at_max_rows(self, test_db):
+        """Test that streams are capped like pages and end saying so"""
+        data = b"".join(stream_sql_safely("SELECT name FROM users", encode_ndjson, max_rows=2))
+        
+        lines = data.decode().splitlines()
+        assert len(lines) == 3
+        assert lines[-1] == '{"__truncated__": "max_rows"}'
+        assert b"__truncated__" not in b"".join(stream_sql_safely("SELECT name FROM users", encode_ndjson, max_rows=3))
+    
+    def test_no_cap_without_max_rows(self, test_db):
+        """Test that max_rows=None, as used by exports, streams every row"""
+        data = b"".join(stream_sql_safely("SELECT name FROM users", encode_ndjson, max_rows=None))
+        
+        assert len(data.decode().splitlines()) == 3
+    
+    def test_arrow_types_cover_whole_result(self, test_db):
+        """Test that Arrow streams are typed from the whole result, not the first batch"""
+        pa = pytest.importorskip("pyarrow")
+        
+        data = b"".join(stream_sql_safely("SELECT id FROM users UNION ALL SELECT 2.5", encode_arrow_ipc))
+        table = pa.ipc.open_stream(data).read_all()
+        
+        assert table.schema.field('id').type == pa.float64()
+        assert sorted(table.column('id').to_pylist()) == [1.0, 2.0, 2.5, 3.0]
+    
+    def test_arrow_types_come_from_a_sample(self, test_db, monkeypatch):
+        """Test that only leading rows are scanned, and a later misfit ends the stream with a notice"""
+        pa = pytest.importorskip("pyarrow")
+        monkeypatch.setattr(sql_processor, "ARROW_TYPE_SAMPLE_ROWS", 3)
+        
+        sql = "SELECT id FROM users UNION ALL SELECT 2.5"
+        reader = pa.ipc.open_stream(b"".join(stream_sql_safely(sql, encode_arrow_ipc)))
+        batches = []
+        while True:
+            try:
+                batches.append(reader.read_next_batch_with_custom_metadata())
+            except StopIteration:
+                break
+        
+        assert reader.schema.field('id').type == pa.int64()
+        assert sum(batch.batch.num_rows for batch in batches) == 0
+        assert batches[-1].custom_metadata[b"__truncated__"] == b"type_conflict"
+    
+    def test_rejects_dangerous_sql(self, test_db):
+        """Test that validation runs before anything is streamed"""
+        with pytest.raises(SQLSecurityError):
+            next(stream_sql_safely("DROP TABLE users", encode_ndjson))
+    
+    def test_denies_attach_pragma_and_internal_tables(self, test_db, tmp_path):
+        """Test that the authorizer stops what the text validation lets through"""
+        test_db.execute("CREATE TABLE _nlsql_upload_cache (table_name TEXT)")
+        attached = tmp_path / "evil.db"
+        
+        for sql in (f"ATTACH DATABASE '{attached}' AS x", "PRAGMA table_info(users)", "SELECT * FROM _nlsql_upload_cache"):
+            with pytest.raises(sqlite3.DatabaseError):
+                next(stream_sql_safely(sql, encode_ndjson))
+            assert execute_sql_safely(sql)['error']
+        assert not attached.exists()
+        assert b"".join(stream_sql_safely("SELECT COUNT(*) AS n FROM users", encode_ndjson)) == b'{"n": 3}\n'
@@ -0,0 +1,86 @@
+import sqlite3
+import pytest
+from core.file_processor import convert_csv_to_sqlite, convert_jsonl_to_sqlite
+from core.table_stats import STATS_TABLE, read_row_counts, record_row_count, forget_table
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "test.db")
+
+
+def recorded_counts(db_path):
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute(f'SELECT table_name, row_count FROM "{STATS_TABLE}"'))
+    conn.close()
+    return counts
+
+
+class TestTableStats:
+    
+    def test_ingest_records_row_counts(self, db_path):
+        """Test that replace, append and upsert loads keep the recorded count exact"""
+        convert_csv_to_sqlite(b"id,name\n1,a\n2,b\n", "users", db_path)
+        assert recorded_counts(db_path) == {'users': 2}
+        
+        convert_csv_to_sqlite(b"id,name\n3,c\n", "users", db_path, mode="append")
+        assert recorded_counts(db_path) == {'users': 3}
+        
+        result = convert_csv_to_sqlite(b"id,name\n3,cc\n4,d\n", "users", db_path, mode="upsert", key_columns=["id"])
+        assert recorded_counts(db_path) == {'users': 4}
+        assert result['row_count'] == 4
+    
+    def test_upsert_counts_inserts_without_scanning(self, db_path):
+        """Test that upserts add the rowid growth to the recorded count instead of recounting"""
+        convert_csv_to_sqlite(b"id,name\n1,a\n2,b\n", "users", db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute(f'UPDATE "{STATS_TABLE}" SET row_count = 99')
+        conn.commit()
+        conn.close()
+        
+        convert_csv_to_sqlite(b"id,name\n2,bb\n3,c\n3,cc\n", "users", db_path, mode="upsert", key_columns=["id"])
+        
+        assert recorded_counts(db_path) == {'users': 100}
+    
+    def test_child_tables_are_counted(self, db_path):
+        """Test that child tables written with their parent get counts too"""
+        convert_jsonl_to_sqlite(b'{"id": 1, "tags": ["a", "b"]}\n', "logs", db_path, array_strategy="child_table")
+        
+        assert recorded_counts(db_path) == {'logs': 1, 'logs__tags': 2}
+    
+    def test_recorded_count_is_used_without_scanning(self, db_path):
+        """Test that a recorded count is trusted while MAX(rowid) is unchanged"""
+        convert_csv_to_sqlite(b"id\n1\n2\n", "users", db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute(f'UPDATE "{STATS_TABLE}" SET row_count = 99')
+        
+        assert read_row_counts(conn, ["users"]) == {'users': 99}
+        conn.close()
+    
+    def test_outside_append_is_recounted(self, db_path):
+        """Test that rows added behind the application's back are noticed"""
+        convert_csv_to_sqlite(b"id\n1\n2\n", "users", db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO users VALUES (3)")
+        
+        assert read_row_counts(conn, ["users"]) == {'users': 3}
+        conn.close()
+    
+    def test_unrecorded_tables_are_counted(self):
+        """Test that tables without statistics fall back to COUNT(*)"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER)")
+        conn.execute("CREATE TABLE keyed (id INTEGER PRIMARY KEY) WITHOUT ROWID")
+        conn.executemany("INSERT INTO users VALUES (?)", [(1,), (2,)])
+        conn.execute("INSERT INTO keyed VALUES (1)")
+        
+        assert read_row_counts(conn, ["users", "keyed"]) == {'users': 2, 'keyed': 1}
+    
+    def test_forget_table(self):
+        """Test that dropped tables lose their statistics"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER)")
+        record_row_count(conn, "users", 0)
+        forget_table(conn, "users")
+        
+        assert conn.execute(f'SELECT COUNT(*) FROM "{STATS_TABLE}"').fetchone()[0] == 0
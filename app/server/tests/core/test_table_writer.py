@@ -0,0 +1,140 @@
+import sqlite3
+import pytest
+from core.table_writer import TableWriter
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Create a file-backed database so journal settings apply"""
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    yield conn
+    conn.close()
+
+
+class TestTableWriter:
+    
+    def test_load_restores_connection_settings(self, file_db):
+        """Test that bulk-load pragmas are scoped to the load"""
+        file_db.execute("PRAGMA synchronous=FULL")
+        before = [file_db.execute(f"PRAGMA {name}").fetchone()[0] for name in ("synchronous", "cache_size", "temp_store")]
+        
+        writer = TableWriter(file_db, "users")
+        writer.begin()
+        assert file_db.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert file_db.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        writer.create_table({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "John"), (2, "Jane")])
+        writer.commit()
+        
+        after = [file_db.execute(f"PRAGMA {name}").fetchone()[0] for name in ("synchronous", "cache_size", "temp_store")]
+        assert after == before
+        assert file_db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert file_db.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 2
+    
+    def test_rollback_restores_connection_settings(self, file_db):
+        """Test that a failed load also restores settings and keeps no partial table"""
+        file_db.execute("PRAGMA synchronous=FULL")
+        
+        writer = TableWriter(file_db, "users")
+        writer.begin()
+        writer.create_table({"id": "INTEGER"})
+        writer.write_rows([(1,)])
+        writer.rollback()
+        
+        assert file_db.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+        assert file_db.execute("SELECT name FROM sqlite_master WHERE name='users'").fetchone() is None
+    
+    def test_replace_rebuilds_indexes_after_load(self, file_db):
+        """Test that indexes on a replaced table are recreated once the rows are in"""
+        file_db.execute("CREATE TABLE users (id INTEGER, name TEXT, city TEXT)")
+        file_db.execute("CREATE UNIQUE INDEX ux_users_id ON users (id)")
+        file_db.execute("CREATE INDEX ix_users_city ON users (city)")
+        file_db.commit()
+        
+        writer = TableWriter(file_db, "users")
+        writer.begin()
+        writer.create_table({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "John"), (2, "Jane")])
+        writer.commit()
+        
+        indexes = {row[0] for row in file_db.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='users'")}
+        assert indexes == {"ux_users_id"}  # city no longer exists
+    
+    def test_replace_after_upsert_allows_duplicate_keys(self, file_db):
+        """Test that the unique index an upsert added does not carry over to replaced data"""
+        writer = TableWriter(file_db, "feed")
+        writer.begin()
+        writer.create_table({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "a")])
+        writer.commit()
+        writer = TableWriter(file_db, "feed", "upsert", ["id"])
+        writer.begin()
+        writer.add_columns({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "b")])
+        writer.commit()
+        
+        writer = TableWriter(file_db, "feed")
+        writer.begin()
+        writer.create_table({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "c"), (1, "d")])
+        writer.commit()
+        
+        assert file_db.execute("SELECT name FROM feed ORDER BY rowid").fetchall() == [("c",), ("d",)]
+        assert file_db.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='feed'").fetchall() == []
+    
+    def test_replace_skips_unique_index_new_data_breaks(self, file_db):
+        """Test that a unique index the new rows violate is dropped instead of failing the load"""
+        file_db.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        file_db.execute("CREATE UNIQUE INDEX ux_users_id ON users (id)")
+        file_db.commit()
+        
+        writer = TableWriter(file_db, "users")
+        writer.begin()
+        writer.create_table({"id": "INTEGER", "name": "TEXT"})
+        writer.write_rows([(1, "John"), (1, "Jane")])
+        writer.commit()
+        
+        assert file_db.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 2
+    
+    def test_add_columns_widens_existing_rows_with_nulls(self, file_db):
+        """Test that rows written before widening read back NULL in new columns"""
+        writer = TableWriter(file_db, "events")
+        writer.begin()
+        writer.add_columns({"id": "INTEGER"})
+        writer.write_rows([(1,)])
+        writer.add_columns({"kind": "TEXT"})
+        writer.write_rows([(2, "click")])
+        writer.commit()
+        
+        assert file_db.execute("SELECT id, kind FROM events").fetchall() == [(1, None), (2, "click")]
+    
+    def test_child_writer_shares_transaction(self, file_db):
+        """Test that child tables are written and rolled back with their parent"""
+        writer = TableWriter(file_db, "orders")
+        writer.begin()
+        writer.assign_rowids()
+        writer.add_columns({"id": "INTEGER"})
+        child = writer.child_writer("orders__items")
+        child.add_columns({"parent_rowid": "INTEGER", "sku": "TEXT"})
+        writer.write_rows([(10,), (20,)])
+        child.write_rows([(writer.first_rowid + 1, "x")])
+        writer.rollback()
+        
+        tables = file_db.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        assert tables == []
+    
+    def test_assign_rowids_continues_after_existing_rows(self, file_db):
+        """Test that explicit rowids start after the rows already in the table"""
+        file_db.execute("CREATE TABLE orders (id INTEGER)")
+        file_db.executemany("INSERT INTO orders (id) VALUES (?)", [(1,), (2,)])
+        file_db.commit()
+        
+        writer = TableWriter(file_db, "orders", mode="append")
+        writer.begin()
+        writer.assign_rowids()
+        writer.add_columns({"id": "INTEGER"})
+        writer.write_rows([(3,)])
+        writer.commit()
+        
+        assert writer.first_rowid == 3
+        assert file_db.execute("SELECT rowid, id FROM orders").fetchall() == [(1, 1), (2, 2), (3, 3)]
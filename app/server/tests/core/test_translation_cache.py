@@ -0,0 +1,141 @@
+import pytest
+from core import translation_cache
+from core.question_index import QuestionIndex, same_intent
+from core.translation_cache import (
+    lookup_translation,
+    normalize_question,
+    record_translation,
+    tables_in_sql,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of an empty database file"""
+    return str(tmp_path / "translations.db")
+
+
+def schema(**tables):
+    return {'tables': {
+        name: {'columns': columns, 'row_count': 10} for name, columns in tables.items()
+    }}
+
+
+USERS = {'id': 'INTEGER', 'name': 'TEXT'}
+ORDERS = {'id': 'INTEGER', 'user_id': 'INTEGER', 'total': 'REAL'}
+
+
+class TestTranslationCache:
+    
+    def test_repeat_question_is_served(self, db_path):
+        """Test that a stored translation is found for the same question, however it is typed"""
+        schema_info = schema(users=USERS)
+        record_translation("How many users?", schema_info, "SELECT COUNT(*) FROM users", db_path)
+        
+        assert lookup_translation("  how MANY users ", schema_info, db_path) == "SELECT COUNT(*) FROM users"
+        assert lookup_translation("How many orders?", schema_info, db_path) is None
+    
+    def test_unknown_before_anything_is_stored(self, db_path):
+        """Test that lookups work before the cache table exists"""
+        assert lookup_translation("anything", schema(users=USERS), db_path) is None
+    
+    def test_schema_change_invalidates_only_touched_tables(self, db_path):
+        """Test that changing one table's columns keeps translations of other tables"""
+        before = schema(users=USERS, orders=ORDERS)
+        record_translation("all users", before, "SELECT * FROM users", db_path)
+        record_translation("all orders", before, "SELECT * FROM orders", db_path)
+        
+        after = schema(users=USERS, orders={**ORDERS, 'status': 'TEXT'})
+        
+        assert lookup_translation("all users", after, db_path) == "SELECT * FROM users"
+        assert lookup_translation("all orders", after, db_path) is None
+    
+    def test_row_counts_do_not_invalidate(self, db_path):
+        """Test that loading more rows keeps translations"""
+        schema_info = schema(users=USERS)
+        record_translation("all users", schema_info, "SELECT * FROM users", db_path)
+        schema_info['tables']['users']['row_count'] = 5000
+        
+        assert lookup_translation("all users", schema_info, db_path) == "SELECT * FROM users"
+    
+    def test_dropped_table_invalidates(self, db_path):
+        """Test that a translation over a removed table is not used"""
+        record_translation("all users", schema(users=USERS), "SELECT * FROM users", db_path)
+        
+        assert lookup_translation("all users", schema(orders=ORDERS), db_path) is None
+    
+    def test_oldest_entries_are_pruned(self, db_path, monkeypatch):
+        """Test that the cache keeps only the newest entries"""
+        monkeypatch.setattr("core.translation_cache.TRANSLATION_CACHE_ENTRIES", 2)
+        schema_info = schema(users=USERS)
+        for i in range(3):
+            record_translation(f"question {i}", schema_info, f"SELECT {i} FROM users", db_path)
+        
+        assert lookup_translation("question 0", schema_info, db_path) is None
+        assert lookup_translation("question 2", schema_info, db_path) == "SELECT 2 FROM users"
+
+
+class TestSimilarQuestions:
+    
+    def test_reworded_question_reuses_sql(self, db_path):
+        """Test that a rewording of a stored question is answered from the cache"""
+        schema_info = schema(products={'name': 'TEXT', 'revenue': 'REAL'})
+        record_translation("top 5 products by revenue", schema_info, "SELECT 1 FROM products", db_path)
+        
+        assert lookup_translation("5 best products by revenue", schema_info, db_path) == "SELECT 1 FROM products"
+        assert lookup_translation("5 best products by revenue", schema_info, db_path, similar=False) is None
+    
+    def test_decisive_differences_are_not_reused(self, db_path):
+        """Test that similar questions asking for something else miss"""
+        schema_info = schema(products={'name': 'TEXT', 'revenue': 'REAL'})
+        record_translation("top 5 products by revenue", schema_info, "SELECT 1 FROM products", db_path)
+        
+        assert lookup_translation("top 3 products by revenue", schema_info, db_path) is None
+        assert lookup_translation("bottom 5 products by revenue", schema_info, db_path) is None
+        assert lookup_translation("top 5 customers by revenue", schema_info, db_path) is None
+    
+    def test_index_is_rebuilt_from_stored_questions(self, db_path, monkeypatch):
+        """Test that similar lookups work after a restart"""
+        schema_info = schema(users=USERS)
+        record_translation("show all users", schema_info, "SELECT * FROM users", db_path)
+        monkeypatch.setattr(translation_cache, "_indexes", {})
+        
+        assert lookup_translation("show me all the users", schema_info, db_path) == "SELECT * FROM users"
+
+
+class TestQuestionIndex:
+    
+    def test_most_similar_first(self):
+        """Test that matches are ranked by cosine similarity"""
+        index = QuestionIndex(["average order value per region", "show all orders", "total revenue"])
+        
+        matches = index.similar("average order value by region", threshold=0.0)
+        
+        assert matches[0][0] == "average order value per region"
+        assert matches[0][1] > 0.8
+    
+    def test_removed_questions_do_not_match(self):
+        """Test that removing a question drops it from results"""
+        index = QuestionIndex(["show all orders"])
+        index.remove("show all orders")
+        
+        assert index.similar("show all orders") == []
+    
+    def test_same_intent_guards(self):
+        """Test that numbers, negations, directions and content words must agree"""
+        assert same_intent("top 5 prodcts by revenue", "5 best products by revenue")
+        assert not same_intent("orders with a region", "orders without a region")
+        assert not same_intent("average order value per month", "average order value per region")
+
+
+class TestHelpers:
+    
+    def test_normalize_question(self):
+        """Test that case, spacing and trailing punctuation are ignored"""
+        assert normalize_question("  Top 5   Products?! ") == "top 5 products"
+    
+    def test_tables_in_sql(self):
+        """Test that bare and quoted table names are found case-insensitively"""
+        sql = 'SELECT * FROM Users u JOIN "order items" o ON o.user_id = u.id'
+        
+        assert set(tables_in_sql(sql, ['users', 'order items', 'products']).values()) == {'users', 'order items'}
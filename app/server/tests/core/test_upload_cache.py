@@ -0,0 +1,116 @@
+import io
+import sqlite3
+import pytest
+from core.upload_cache import HashingReader, hash_stream, has_cached_upload, upload_key, lookup_upload, record_upload, invalidate_table
+from core.file_processor import convert_csv_stream_to_sqlite, sanitize_table_name
+from core.sql_security import get_safe_table_list
+
+
+CSV_CONTENT = b"id,name\n1,John\n2,Jane\n"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "test.db")
+
+
+class TestUploadCache:
+
+    def test_hash_stream_rewinds(self):
+        """Test that hashing leaves the stream ready to be parsed"""
+        stream = io.BytesIO(CSV_CONTENT)
+        digest = hash_stream(stream, chunk_bytes=4)
+
+        assert len(digest) == 64
+        assert stream.read() == CSV_CONTENT
+        assert hash_stream(io.BytesIO(CSV_CONTENT)) == digest
+        assert hash_stream(io.BytesIO(CSV_CONTENT + b"3,Bob\n")) != digest
+
+    def test_hashing_reader_hashes_while_parsing(self, db_path):
+        """Test that the parse-time digest matches a separate hashing pass"""
+        hasher = HashingReader(io.BytesIO(CSV_CONTENT), chunk_bytes=4)
+        result = convert_csv_stream_to_sqlite(io.BufferedReader(hasher), "users", db_path)
+
+        assert result['row_count'] == 2
+        assert hasher.hexdigest() == hash_stream(io.BytesIO(CSV_CONTENT))
+
+    def test_hashing_reader_covers_unread_bytes(self):
+        """Test that bytes the parser never read are still part of the digest"""
+        hasher = HashingReader(io.BytesIO(CSV_CONTENT))
+        io.BufferedReader(hasher, buffer_size=4).read(4)
+
+        assert hasher.hexdigest() == hash_stream(io.BytesIO(CSV_CONTENT))
+
+    def test_append_is_not_cacheable(self):
+        """Test that only idempotent modes produce a cache key"""
+        assert upload_key("abc", "csv", "append") is None
+        assert upload_key("abc", "csv", "replace") != upload_key("abc", "jsonl", "replace")
+        assert upload_key("abc", "csv", "upsert", ["id"]) != upload_key("abc", "csv", "upsert", ["name"])
+        assert upload_key("abc", "jsonl", "replace", variant="json:5") != upload_key("abc", "jsonl", "replace", variant="flatten:5")
+
+    def test_record_and_lookup(self, db_path):
+        """Test that a recorded upload is returned for the same key and table"""
+        key = upload_key(hash_stream(io.BytesIO(CSV_CONTENT)), "csv", "replace")
+        result = convert_csv_stream_to_sqlite(io.BytesIO(CSV_CONTENT), "users", db_path, cache_key=lambda: key)
+
+        cached = lookup_upload("users", key, db_path)
+        assert cached['table_name'] == "users"
+        assert cached['row_count'] == 2
+        assert cached['schema'] == result['schema']
+        assert cached['sample_data'] == result['sample_data']
+        assert lookup_upload("users", "other", db_path) is None
+        assert lookup_upload("orders", key, db_path) is None
+        assert has_cached_upload("users", db_path)
+        assert not has_cached_upload("orders", db_path)
+
+    def test_entry_is_written_with_the_ingest(self, db_path):
+        """Test that the entry is part of the ingest transaction and rolls back with it"""
+        with pytest.raises(Exception):
+            convert_csv_stream_to_sqlite(
+                io.BytesIO(CSV_CONTENT), "users", db_path,
+                mode="upsert", key_columns=["missing"], cache_key=lambda: "key"
+            )
+        assert not has_cached_upload("users", db_path)
+
+        conn = sqlite3.connect(db_path)
+        record_upload(conn, "key", {'table_name': "users", 'schema': {}, 'row_count': 0, 'sample_data': []})
+        conn.rollback()
+        conn.close()
+        assert lookup_upload("users", "key", db_path) is None
+
+    def test_ingest_invalidates_entry(self, db_path):
+        """Test that writing to a table forgets its cached upload"""
+        key = upload_key(hash_stream(io.BytesIO(CSV_CONTENT)), "csv", "replace")
+        convert_csv_stream_to_sqlite(io.BytesIO(CSV_CONTENT), "users", db_path, cache_key=lambda: key)
+        assert lookup_upload("users", key, db_path) is not None
+
+        convert_csv_stream_to_sqlite(io.BytesIO(b"id,name\n3,Bob\n"), "users", db_path, mode="append")
+        assert lookup_upload("users", key, db_path) is None
+
+    def test_failed_ingest_keeps_entry(self, db_path):
+        """Test that a rolled-back ingest leaves the cache as it was"""
+        key = upload_key(hash_stream(io.BytesIO(CSV_CONTENT)), "csv", "replace")
+        convert_csv_stream_to_sqlite(io.BytesIO(CSV_CONTENT), "users", db_path, cache_key=lambda: key)
+
+        with pytest.raises(Exception):
+            convert_csv_stream_to_sqlite(io.BytesIO(b"id,name\n3,Bob\n"), "users", db_path, mode="upsert", key_columns=["missing"])
+        assert lookup_upload("users", key, db_path) is not None
+
+    def test_invalidate_table(self, db_path):
+        """Test explicit invalidation, as done when a table is deleted"""
+        convert_csv_stream_to_sqlite(io.BytesIO(CSV_CONTENT), "users", db_path, cache_key=lambda: "key")
+
+        conn = sqlite3.connect(db_path)
+        invalidate_table(conn, "users")
+        conn.commit()
+        conn.close()
+        assert lookup_upload("users", "key", db_path) is None
+
+    def test_cache_table_is_hidden(self, db_path):
+        """Test that the bookkeeping table is not listed or reachable by upload names"""
+        convert_csv_stream_to_sqlite(io.BytesIO(CSV_CONTENT), "users", db_path, cache_key=lambda: "key")
+
+        conn = sqlite3.connect(db_path)
+        assert get_safe_table_list(conn) == ["users"]
+        conn.close()
+        assert sanitize_table_name("_nlsql_upload_cache") == "t_nlsql_upload_cache"
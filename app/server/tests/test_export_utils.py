@@ -4,6 +4,7 @@ import pandas as pd
 import json
 from io import StringIO
 from core.export_utils import generate_csv_from_data, generate_csv_from_table, generate_json_from_data, generate_json_from_table
+from core.export_utils import CursorBatches, encode_arrow_ipc, encode_csv, encode_ndjson, fetch_batches, scan_column_types, stream_cursor
 
 
 class TestExportUtils:
@@ -430,4 +431,131 @@ class TestJsonExportUtils:
         assert len(json_data) == 1
         assert json_data[0]['data'] == 'test data'
 
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+@pytest.fixture
+def numbers_db():
+    """In-memory database with 5 rows of mixed column types"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE numbers (n INTEGER, label TEXT, mixed)")
+    conn.executemany(
+        "INSERT INTO numbers VALUES (?, ?, ?)",
+        [(i, f"row {i}" if i else None, "x" if i % 2 else i) for i in range(5)]
+    )
+    yield conn
+    conn.close()
+
+
+class TestStreamingExport:
+    
+    def test_fetch_batches_respects_max_rows(self, numbers_db):
+        """Test that batches stop at max_rows"""
+        cursor = numbers_db.execute("SELECT n FROM numbers")
+        
+        batches = list(fetch_batches(cursor, max_rows=3, batch_rows=2))
+        
+        assert [len(rows) for rows in batches] == [2, 1]
+    
+    def test_csv_stream_yields_header_first(self, numbers_db):
+        """Test that the header is its own chunk and NULL becomes an empty field"""
+        chunks = list(stream_cursor(numbers_db.execute("SELECT n, label FROM numbers"), encode_csv))
+        
+        assert chunks[0] == b"n,label\n"
+        assert b"".join(chunks).decode().splitlines()[1] == "0,"
+    
+    def test_ndjson_one_object_per_line(self, numbers_db):
+        """Test that every row becomes one JSON line"""
+        data = b"".join(stream_cursor(numbers_db.execute("SELECT n, label FROM numbers"), encode_ndjson))
+        
+        lines = [json.loads(line) for line in data.decode().splitlines()]
+        assert len(lines) == 5
+        assert lines[1] == {'n': 1, 'label': 'row 1'}
+    
+    def test_json_table_export_streams_valid_array(self, numbers_db):
+        """Test that the streamed JSON export parses as one array"""
+        data = json.loads(generate_json_from_table(numbers_db, 'numbers'))
+        
+        assert [row['n'] for row in data] == [0, 1, 2, 3, 4]
+    
+    def test_arrow_stream_round_trip(self, numbers_db):
+        """Test that record batches share the schema inferred from the first batch"""
+        pa = pytest.importorskip("pyarrow")
+        cursor = numbers_db.execute("SELECT * FROM numbers")
+        
+        chunks = list(encode_arrow_ipc(['n', 'label', 'mixed'], fetch_batches(cursor, batch_rows=2)))
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        
+        assert table.num_rows == 5
+        assert table.schema.field('n').type == pa.int64()
+        assert table.column('mixed').to_pylist() == ['0', 'x', '2', 'x', '4']
+    
+    def test_scan_column_types_covers_whole_result(self):
+        """Test that types reflect every row, widening where storage classes mix"""
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE TABLE t (a INTEGER, b INTEGER, c INTEGER, d, e)")
+        conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?, ?)", [
+            (1, 1, 1, None, b"x"),
+            (2, 1.5, "abc", None, b"y"),
+            (2 ** 60, 2, 3, None, b"z"),
+        ])
+        
+        types = scan_column_types(conn, "SELECT * FROM t -- trailing comment", 5)
+        
+        assert types == ["int64", "double", "string", "string", "binary"]
+        assert scan_column_types(conn, "SELECT a, b FROM t;", 2, max_rows=1) == ["int64", "int64"]
+        conn.close()
+    
+    def test_arrow_stream_never_truncates_later_values(self):
+        """Test that values after the first batch keep their exact value"""
+        pa = pytest.importorskip("pyarrow")
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE TABLE t (n INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,), (1.5,), ("abc",)])
+        sql = "SELECT n FROM t"
+        types = scan_column_types(conn, sql, 1)
+        
+        chunks = encode_arrow_ipc(['n'], fetch_batches(conn.execute(sql), batch_rows=2), column_types=types)
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        
+        assert table.column('n').to_pylist() == ['1', '2', '1.5', 'abc']
+        conn.close()
+    
+    def test_arrow_stream_without_types_ends_at_misfits(self):
+        """Test that a later value not fitting the first-batch schema ends the stream with a notice"""
+        pa = pytest.importorskip("pyarrow")
+        
+        reader = pa.ipc.open_stream(b"".join(encode_arrow_ipc(['n'], iter([[(1,), (2,)], [(1.5,)]]))))
+        
+        assert reader.read_next_batch().column(0).to_pylist() == [1, 2]
+        last = reader.read_next_batch_with_custom_metadata()
+        assert last.batch.num_rows == 0
+        assert last.custom_metadata[b"__truncated__"] == b"type_conflict"
+    
+    def test_cursor_batches_report_truncation(self, numbers_db):
+        """Test that a result cut at max_rows is told apart from one that just fits"""
+        cut = CursorBatches(numbers_db.execute("SELECT n FROM numbers"), max_rows=3, batch_rows=2)
+        whole = CursorBatches(numbers_db.execute("SELECT n FROM numbers"), max_rows=5)
+        
+        assert [len(rows) for rows in cut] == [2, 1]
+        assert list(whole)
+        assert cut.truncated and not whole.truncated
+    
+    def test_arrow_stream_notes_max_rows_cut(self, numbers_db):
+        """Test that an Arrow stream cut at max_rows ends with an empty batch saying so"""
+        pa = pytest.importorskip("pyarrow")
+        
+        data = b"".join(stream_cursor(numbers_db.execute("SELECT n FROM numbers"), encode_arrow_ipc, max_rows=2))
+        reader = pa.ipc.open_stream(data)
+        
+        assert reader.read_next_batch().num_rows == 2
+        assert reader.read_next_batch_with_custom_metadata().custom_metadata[b"__truncated__"] == b"max_rows"
+    
+    def test_arrow_stream_of_empty_result(self):
+        """Test that an empty result still carries its columns"""
+        pa = pytest.importorskip("pyarrow")
+        
+        table = pa.ipc.open_stream(b"".join(encode_arrow_ipc(['a'], iter([])))).read_all()
+        
+        assert table.column_names == ['a']
+        assert table.num_rows == 0
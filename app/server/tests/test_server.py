@@ -0,0 +1,64 @@
+import gzip
+import io
+import sqlite3
+import pytest
+import server
+from server import drop_user_table, ingest_upload
+
+
+EVENTS_JSONL = b'{"id": 1, "items": [{"sku": "x"}, {"sku": "y"}]}\n{"id": 2, "items": [{"sku": "z"}]}\n'
+
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch):
+    """Run the server helpers against db/database.db in a temporary directory"""
+    (tmp_path / "db").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "db" / "database.db")
+
+
+def table_names(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    conn.close()
+    return names
+
+
+class TestServerTables:
+
+    def test_drop_table_drops_child_tables(self, app_db):
+        """Test that deleting a table also deletes its child tables"""
+        ingest_upload(io.BytesIO(EVENTS_JSONL), "ev.jsonl", array_strategy="child_table")
+
+        drop_user_table("ev")
+
+        assert not {"ev", "ev__items"} & table_names(app_db)
+
+    def test_drop_child_then_reupload(self, app_db):
+        """Test that re-uploading the parent's file recreates a deleted child table"""
+        first = ingest_upload(io.BytesIO(EVENTS_JSONL), "ev.jsonl", array_strategy="child_table")
+        assert not first.cached
+
+        drop_user_table("ev__items")
+        again = ingest_upload(io.BytesIO(EVENTS_JSONL), "ev.jsonl", array_strategy="child_table")
+
+        assert not again.cached
+        assert "ev__items" in table_names(app_db)
+        assert ingest_upload(io.BytesIO(EVENTS_JSONL), "ev.jsonl", array_strategy="child_table").cached
+
+    def test_upload_wrappers_are_closed(self, app_db, monkeypatch):
+        """Test that the decompressing wrapper is closed after the ingest and the upload stream is not"""
+        opened = []
+        open_decompressed = server.open_decompressed
+
+        def recording_open(*args, **kwargs):
+            opened.append(open_decompressed(*args, **kwargs))
+            return opened[-1]
+
+        monkeypatch.setattr(server, "open_decompressed", recording_open)
+        upload = io.BytesIO(gzip.compress(EVENTS_JSONL))
+
+        ingest_upload(upload, "ev.jsonl.gz")
+
+        assert [stream.closed for stream in opened] == [True]
+        assert not upload.closed
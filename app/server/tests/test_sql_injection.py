@@ -199,8 +199,8 @@ class TestSQLSecurityModule:
 class TestSQLProcessorSecurity:
     """Test SQL processor with security enhancements"""
     
-    @patch('core.sql_processor.sqlite3.connect')
-    def test_execute_sql_safely_blocks_dangerous_queries(self, mock_connect):
+    @patch('core.sql_processor.read_connection')
+    def test_execute_sql_safely_blocks_dangerous_queries(self, mock_read_connection):
         """Test that dangerous SQL queries are blocked"""
         # Test DROP statement
         result = execute_sql_safely("DROP TABLE users")
@@ -217,12 +217,12 @@ class TestSQLProcessorSecurity:
         assert result['error'] is not None
         assert "Security error" in result['error']
     
-    @patch('core.sql_processor.sqlite3.connect')
-    def test_execute_sql_safely_allows_select(self, mock_connect):
+    @patch('core.sql_processor.read_connection')
+    def test_execute_sql_safely_allows_select(self, mock_read_connection):
         """Test that safe SELECT queries are allowed"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
+        mock_read_connection.return_value.__enter__.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
         mock_cursor.fetchall.return_value = []
         
@@ -257,19 +257,19 @@ class TestFileProcessorSecurity:
 class TestInsightsSecurity:
     """Test insights module with security enhancements"""
     
-    @patch('core.insights.sqlite3.connect')
-    def test_generate_insights_validates_table_name(self, mock_connect):
+    @patch('core.insights.read_connection')
+    def test_generate_insights_validates_table_name(self, mock_read_connection):
         """Test that table names are validated"""
         with pytest.raises(Exception) as exc_info:
             generate_insights("users'; DROP TABLE users; --")
         assert "Invalid" in str(exc_info.value)
     
-    @patch('core.insights.sqlite3.connect')
-    def test_generate_insights_validates_column_names(self, mock_connect):
+    @patch('core.insights.read_connection')
+    def test_generate_insights_validates_column_names(self, mock_read_connection):
         """Test that column names are validated"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
+        mock_read_connection.return_value.__enter__.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
         
         with pytest.raises(Exception) as exc_info: